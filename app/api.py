@@ -0,0 +1,370 @@
+# api.py
+# API HTTP local (JSON) com os mesmos números do app, para painéis, notebooks
+# e plug-ins que hoje só têm capturas de tela.
+#
+#   python app/api.py --port 8601                   # servidor avulso
+#   THESIS_API_PORT=8601 streamlit run app/thesis.py  # ou junto do app (thread lateral)
+#
+#   curl -s 'localhost:8601/v1/scenarios?control=Ta&setpoint=21&facade=ALT1'
+#   curl -s localhost:8601/v1/query -d '{"queries": [{"control": "Ta"}, {"facade": "ALT5", "zone": "A"}]}'
+#   curl -s localhost:8601/v1/meta                  # valores aceitos em cada filtro
+#
+# Os casos vêm das mesmas linhas do download (download.rows: tabelas da tese
+# + results/ store), agrupados por caso: métricas por subzona + energia. A
+# versão do conjunto (hash das tabelas + estado do store, conferido a cada
+# STATE_TTL_S) é a ETag: GET com If-None-Match igual recebe 304 sem corpo.
+# As respostas ficam prontas (JSON e gzip) por consulta normalizada, então
+# uma consulta repetida custa um dicionário. Filtros: source, climate,
+# control, facade, setpoint, zone (vírgula = vários valores). Só o modelo de
+# 3 subzonas (A, B, C) tem resultados numéricos. Só a biblioteca padrão.
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import model
+from download import COLUMNS, rows, thesis_rows
+from store import ResultStore, canonical_json
+
+PORT_ENV = "THESIS_API_PORT"    # porta da API junto do app (sem a variável: desligada)
+ADDRESS = "127.0.0.1"           # só local; --address 0.0.0.0 no servidor avulso para abrir na rede
+FORMAT_VERSION = "1"            # mude ao alterar o formato das respostas: muda a ETag
+FILTERS = ("source", "climate", "control", "facade", "setpoint", "zone")
+MAX_BATCH = 1000                # consultas por POST /v1/query
+MAX_BODY = 1 << 20              # bytes aceitos no corpo do POST
+GZIP_MIN_BYTES = 512            # respostas menores vão sem compressão
+GZIP_LEVEL = 6
+STATE_TTL_S = 2.0               # intervalo mínimo entre conferências do results/ store
+RESPONSE_CACHE = 4096           # consultas com resposta pronta (por versão)
+
+_lock = threading.Lock()
+_current = None                 # Dataset da versão atual
+_server = None                  # ThreadingHTTPServer, ou False se a porta estava ocupada
+
+
+class QueryError(ValueError):
+    pass
+
+
+# =========================
+# Casos (uma versão do conjunto de dados)
+# =========================
+
+_I = {c: i for i, c in enumerate(COLUMNS)}
+_CASE = ("source", "backend", "climate", "control", "facade", "shgc", "wwr", "shading", "orientation",
+         "deadband", "energy_kwh_m2")
+_PARAMS = ("shgc", "wwr", "shading", "orientation", "deadband")
+
+
+def _cases(it) -> list[dict]:
+    """download.rows (one per case and zone, zones consecutive) -> one dict per case."""
+    out, key = [], None
+    for r in it:
+        k = tuple(r[_I[c]] for c in _CASE)
+        zone = r[_I["zone"]]
+        if k != key or zone in (None, model.ZONES[0]):
+            case = {c: r[_I[c]] for c in ("source", "backend", "climate", "control", "facade")}
+            case.update(params={c: r[_I[c]] for c in _PARAMS}, setpoints={}, zones={},
+                        energy_kwh_m2=r[_I["energy_kwh_m2"]])
+            out.append(case)
+            key = k
+        case = out[-1]
+        if zone is None:
+            case["setpoint"] = r[_I["setpoint"]]
+            continue
+        case["setpoints"][zone] = r[_I["setpoint"]]
+        case["zones"][zone] = {m: r[_I[m]] for m in model.METRICS}
+    for case in out:
+        sps = case.pop("setpoints")
+        if sps:  # setpoint único, ou um por subzona (controle independente)
+            values = set(sps.values())
+            case["setpoint"] = values.pop() if len(values) == 1 else sps
+    return out
+
+
+def _thesis_digest() -> str:
+    return hashlib.sha256(canonical_json(list(thesis_rows())).encode("utf-8")).hexdigest()
+
+
+class Dataset:
+    """Scenario cases for one dataset version, with ready-made responses per query."""
+
+    def __init__(self, store: ResultStore, state: tuple, thesis: str):
+        self.state = state
+        self.thesis = thesis
+        self.checked = 0.0      # time.monotonic() da última conferência do store
+        self.version = hashlib.sha256(canonical_json(
+            {"format": FORMAT_VERSION, "thesis": thesis, "store": state}).encode("utf-8")).hexdigest()[:16]
+        self.etag = f'W/"{self.version}"'
+        self.cases = _cases(rows(store=store))
+        self._responses = {}    # consulta normalizada -> fragmento JSON (bytes)
+        self._lock = threading.Lock()
+
+    def meta(self) -> dict:
+        values = {f: set() for f in FILTERS}
+        for c in self.cases:
+            for f in ("source", "climate", "control", "facade"):
+                if c[f] is not None:
+                    values[f].add(c[f])
+            sp = c.get("setpoint")
+            values["setpoint"].update(sp.values() if isinstance(sp, dict) else [sp] if sp is not None else [])
+            values["zone"].update(c["zones"])
+        return {"version": self.version, "cases": len(self.cases), "metrics": list(model.METRICS),
+                "filters": {f: sorted(v) for f, v in values.items()}}
+
+    def _match(self, case: dict, q: dict) -> bool:
+        for f in ("source", "climate", "control", "facade"):
+            if f in q and not (case[f] is not None and (case[f] in q[f] or case[f].split("/")[0] in q[f])):
+                return False
+        if "setpoint" in q:
+            sp = case.get("setpoint")
+            sps = sp.values() if isinstance(sp, dict) else [sp]
+            if not any(s is not None and float(s) in q["setpoint"] for s in sps):
+                return False
+        return True
+
+    def _select(self, q: dict) -> list[dict]:
+        out = []
+        for case in self.cases:
+            if not self._match(case, q):
+                continue
+            if "zone" in q:
+                case = dict(case, zones={z: m for z, m in case["zones"].items() if z in q["zone"]})
+            out.append(case)
+        return out
+
+    def fragment(self, q: dict) -> bytes:
+        """JSON object {"query", "count", "results"} for a normalized query (cached)."""
+        key = canonical_json(q)
+        body = self._responses.get(key)
+        if body is None:
+            results = self._select(q)
+            body = json.dumps({"query": q, "count": len(results), "results": results},
+                              separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+            with self._lock:
+                if len(self._responses) >= RESPONSE_CACHE:
+                    self._responses.clear()
+                self._responses[key] = body
+        return body
+
+
+def dataset(store: ResultStore | None = None) -> Dataset:
+    """Current dataset version (rebuilt when the results/ store changes; checked every STATE_TTL_S)."""
+    global _current
+    now = time.monotonic()
+    current = _current
+    if current is not None and now - current.checked < STATE_TTL_S:
+        return current
+    with _lock:
+        current = _current
+        if current is None or now - current.checked >= STATE_TTL_S:
+            store = store or ResultStore()
+            state = store.state()
+            if current is None or current.state != state:
+                current = Dataset(store, state, current.thesis if current else _thesis_digest())
+                _current = current
+            current.checked = now
+    return current
+
+
+# =========================
+# Consultas
+# =========================
+
+def normalize(raw: dict) -> dict:
+    """{filter: value | [values] | "a,b"} -> {filter: sorted list}; unknown filters raise QueryError."""
+    q = {}
+    for f, v in raw.items():
+        if f not in FILTERS:
+            raise QueryError(f"unknown filter {f!r} (use {', '.join(FILTERS)})")
+        values = v if isinstance(v, list) else [v]
+        values = [p for x in values for p in (x.split(",") if isinstance(x, str) else [x])]
+        values = [x.strip() if isinstance(x, str) else x for x in values if x not in ("", None)]
+        if not values:
+            continue
+        if f == "setpoint":
+            try:
+                values = [float(x) for x in values]
+            except (TypeError, ValueError):
+                raise QueryError(f"setpoint must be a number, got {v!r}") from None
+        else:
+            values = [str(x) for x in values]
+        q[f] = sorted(set(values))
+    return q
+
+
+def query(raw: dict, ds: Dataset | None = None) -> dict:
+    """One query (the same dict the HTTP API takes) -> {"query", "count", "results"}."""
+    return json.loads((ds or dataset()).fragment(normalize(raw)))
+
+
+def batch_body(queries: list, ds: Dataset) -> bytes:
+    if not isinstance(queries, list) or not all(isinstance(q, dict) for q in queries):
+        raise QueryError('body must be {"queries": [{filter: value, ...}, ...]} or a list of queries')
+    if len(queries) > MAX_BATCH:
+        raise QueryError(f"at most {MAX_BATCH} queries per request")
+    parts = [ds.fragment(normalize(q)) for q in queries]
+    return b'{"version":"' + ds.version.encode() + b'","results":[' + b",".join(parts) + b"]}"
+
+
+def single_body(raw: dict, ds: Dataset) -> bytes:
+    return b'{"version":"' + ds.version.encode() + b'",' + ds.fragment(normalize(raw))[1:]
+
+
+# =========================
+# Servidor HTTP
+# =========================
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"       # keep-alive: clientes em lote reaproveitam a conexão
+    server_version = "thesis-sim-api"
+    disable_nagle_algorithm = True      # cabeçalho e corpo saem em writes separados (sem 40 ms de ACK atrasado)
+
+    def _send(self, status: int, body: bytes = b"", etag: str | None = None):
+        gz = (len(body) >= GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", ""))
+        if gz:
+            body = _gzip(body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Vary", "Accept-Encoding")
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")    # guarda, mas revalida pela ETag
+        if gz:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _error(self, status: int, message: str):
+        self._send(status, json.dumps({"error": message}).encode("utf-8"))
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        ds = dataset()
+        if url.path in ("/v1/scenarios", "/v1/meta", "/v1/version"):
+            if ds.etag in self.headers.get("If-None-Match", "") or self.headers.get("If-None-Match") == "*":
+                self.send_response(304)
+                self.send_header("ETag", ds.etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+        try:
+            if url.path == "/v1/scenarios":
+                body = single_body({k: v for k, v in parse_qs(url.query).items()}, ds)
+            elif url.path == "/v1/meta":
+                body = json.dumps(ds.meta(), separators=(",", ":")).encode("utf-8")
+            elif url.path == "/v1/version":
+                body = json.dumps({"version": ds.version, "cases": len(ds.cases)}).encode("utf-8")
+            else:
+                self._error(404, "use /v1/scenarios, /v1/query (POST), /v1/meta or /v1/version")
+                return
+        except QueryError as e:
+            self._error(400, str(e))
+            return
+        self._send(200, body, ds.etag)
+
+    do_HEAD = do_GET
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/v1/query":
+            self._error(404, "POST /v1/query")
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._error(400, "invalid Content-Length")
+            return
+        if length > MAX_BODY:
+            self._error(413, f"body larger than {MAX_BODY} bytes")
+            return
+        raw = self.rfile.read(length)
+        if self.headers.get("Content-Encoding") == "gzip":
+            try:    # o limite vale também para o corpo descomprimido
+                with gzip.GzipFile(fileobj=io.BytesIO(raw)) as f:
+                    raw = f.read(MAX_BODY + 1)
+            except (OSError, EOFError) as e:
+                self._error(400, f"invalid gzip body: {e}")
+                return
+            if len(raw) > MAX_BODY:
+                self._error(413, f"body larger than {MAX_BODY} bytes")
+                return
+        ds = dataset()
+        try:
+            payload = json.loads(raw or b"null")
+            body = batch_body(payload["queries"] if isinstance(payload, dict) else payload, ds)
+        except (ValueError, KeyError, TypeError) as e:
+            self._error(400, str(e) if isinstance(e, QueryError) else f"invalid JSON body: {e}")
+            return
+        self._send(200, body, ds.etag)
+
+    def do_OPTIONS(self):   # pré-voo do navegador (painéis em outra origem)
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type, If-None-Match")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+_gz_cache = {}              # corpo -> gzip (respostas repetidas não recomprimem)
+
+
+def _gzip(body: bytes) -> bytes:
+    out = _gz_cache.get(body)
+    if out is None:
+        out = gzip.compress(body, GZIP_LEVEL, mtime=0)
+        if len(_gz_cache) >= RESPONSE_CACHE:
+            _gz_cache.clear()
+        _gz_cache[body] = out
+    return out
+
+
+def make_server(port: int, address: str = ADDRESS) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((address, port), _Handler)
+    server.daemon_threads = True
+    return server
+
+
+def enabled() -> bool:
+    return bool(os.environ.get(PORT_ENV))
+
+
+def serve(port: int | None = None):
+    """Start the API once per process next to the app (no-op if already running or not configured)."""
+    global _server
+    port = port or int(os.environ.get(PORT_ENV) or 0)
+    if not port:
+        return None
+    with _lock:
+        if _server is None:
+            try:
+                _server = make_server(port)
+            except OSError:  # porta ocupada (ex.: outro processo do app): não tenta de novo
+                _server = False
+                return None
+            threading.Thread(target=_server.serve_forever, name="thesis-api", daemon=True).start()
+        return _server or None
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Local JSON API for the scenario results the app shows.")
+    ap.add_argument("--port", type=int, default=int(os.environ.get(PORT_ENV) or 8601))
+    ap.add_argument("--address", default=ADDRESS)
+    args = ap.parse_args()
+    ds = dataset()
+    print(f"serving {len(ds.cases)} cases (version {ds.version}) on http://{args.address}:{args.port}/v1/")
+    make_server(args.port, args.address).serve_forever()
@@ -0,0 +1,317 @@
+# content.py
+# Textos longos (Resumo, Conclusões) e imagens inline do app.
+#
+# Os textos ficam em assets/text/<nome>.md e são compilados para fragmentos
+# HTML (títulos, parágrafos, marcadores de referência [1,2] com link) uma
+# vez por versão do conteúdo: o fragmento é guardado no processo pelo hash
+# do texto (+ versão do compilador) e, se existir, lido de
+# assets/text/build/<nome>.<hash>.html, gerado com:
+#
+#   python app/content.py            # compila todos os textos
+#
+# No rerun, fragment("summary") custa um stat + um dicionário.
+#
+# Imagens: b64_file() para <img> inline; com static serving, asset_url()
+# publica a imagem uma vez em app/static/assets/<nome>.<hash>.<ext> e o
+# navegador a guarda em cache (img_src() escolhe entre os dois).
+import base64
+import functools
+import hashlib
+import html
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+import perf
+import theme
+
+ROOT_DIR = Path(__file__).resolve().parent.parent  # .../thesis_sim
+TEXT_DIR = ROOT_DIR / "assets" / "text"
+BUILD_DIR = TEXT_DIR / "build"
+STATIC_ASSET_DIR = theme.STATIC_DIR / "assets"       # imagens publicadas com hash (static serving)
+STATIC_ASSET_URL = f"{theme.STATIC_URL}/assets"
+
+ASSET_CACHE_SIZE = 32       # imagens base64 mantidas em memória (por processo)
+COMPILER_VERSION = "3"      # mude ao alterar md_to_html: invalida os fragmentos
+REFERENCES_URL = ""         # artigo com a lista de referências, âncoras #ref-N (vazio = marcadores sem link)
+
+# [1,2] · [7–10] · [38,39,40–46]
+_REF_GROUP = re.compile(r"\[(\d+(?:\s*[–-]\s*\d+)?(?:\s*,\s*\d+(?:\s*[–-]\s*\d+)?)*)\]")
+_REF_NUMBER = re.compile(r"\d+")
+
+_fragments = {}             # hash -> HTML (processo)
+
+
+# =========================
+# Textos curtos (compartilhados com o site estático, static_site.py)
+# =========================
+
+TITLE = "THERMAL CAUSES AND ENERGY IMPACTS OF OCCUPANTS ADAPTIVE RESPONSES IN GLASS CURTAIN-WALL OFFICE BUILDINGS IN THE TROPICS"
+AUTHOR = "Dr. Arq. Alexandre Oliveira"
+TAB_LABELS = ["Summary", "Thermal Zoning", "Thermal Environment Control", "Facade Design Alternatives", "Conclusions & Contribution"]
+AI_NOTE = "Note: This section was generated with AI assistance from the author’s original draft and then edited for clarity and structure."
+FOOTER = [
+    "Results from building simulations conducted as part of a doctoral thesis at the Graduate Program in Architecture and Urbanism (PPGAU/UFRN - Brazil), under the supervision of Senior Lecturer PhD Aldomar Pedrini (Aug/2024).",
+    "www.greensim.com.br     | 2026",
+]
+
+# Tab 3 — modelo do caso base (bloco abaixo da planta)
+BASE_CASE_LINES = [
+    "Room dimensions: 4.00 m (Width), 7.50 m (Depth), 2.80 m (Ceiling height)",
+    "Typical Brazilian office workspace routine (Occupied period: 08:00–18:00)",
+    "Shoe-box model: adiabatic floor, ceiling, and walls, except for the façade wall",
+    "Fully glazed façade: curtain wall (WWR 100%)",
+    "Laminated glass: SHGC of 0.29 and no external shading",
+    "Window orientation: East",
+    "HVAC system: unitary split AC no fresh air",
+    "Climate: city of Fortaleza, Brazil (03°46´ S; 38´ W) / ASHRAE climate 0A",
+]
+
+# Tab 2 — modelo do zoneamento (bloco inferior esquerdo)
+ZONING_LINES = [
+    "Room dimensions: 12.0 m (Width), 7.50 m (Depth), 2.80 m (Ceiling height)",
+    "Typical Brazilian office workspace routine (Occupied period: 08:00–18:00)",
+    "Shoe-box model: adiabatic floor, ceiling, and walls, except for the façade wall",
+    "Fully glazed façade: curtain wall (WWR 100%)",
+    "Window orientation: East",
+    "Laminated glass: SHGC of 0.29 and no external shading",
+    "HVAC system: unitary split AC no fresh air",
+    "Setpoint and thermostat control: 23°C air-temperature cooling setpoint",
+    "Climate: city of Fortaleza, Brazil (03°46´ S; 38´ W) / ASHRAE climate 0A",
+]
+
+# Tab 2 — imagens (assets/img) e textos de cada modelo de zoneamento
+ZONE_MODELS = {
+        "Zone Model 1": {
+            "iso": "iso_1zone.png",
+            "plan": "plan_1zone.png",
+            "to": "plot_1zone_to.png",
+            "pmv": "plot_1zone_pmv.png",
+            "desc": [
+                "One single-zone",
+                "To and PMV calculated to the area´s geometric centre",
+                "Goal: to define the baseline",
+            ],
+            "outcomes": [
+                "Predominantly uncomfortable thermal performance, with 75.3% of occupied hours presenting To > 26°C.",
+                "Operative temperature ranged from 25°C to 28°C, indicating high thermal instability.",
+                "Thermal sensation followed the same trend, with 74.5% of PMV > +0.5, reaching values up to +1.5.",
+                "Results indicate that a single-zone model masks spatial thermal variability and overgeneralizes discomfort.",
+            ],
+        },
+        "Zone Model 2": {
+            "iso": "iso_2zone.png",
+            "plan": "plan_2zone.png",
+            "to": "plot_2zone_to.png",
+            "pmv": "plot_2zone_pmv.png",
+            "desc": [
+                "Two subzones: perimeter (A) and core (D) zones",
+                "Perimeter subzone is 1/3 of the workspace length",
+                "Goal: to compare perimeter and core subzone performance",
+            ],
+            "outcomes": [
+                "Clear thermal differentiation between subzones, confirming the importance of spatial zoning.",
+                "Perimeter subzone (A) showed severe discomfort: 84.6% of To > 26°C and 83.4% of PMV > +0.5, with 48.7% of To exceeding 27°C.",
+                "Core subzone (D) was significantly more stable, with only 33.9% of To > 26°C and 35.6% of PMV > +0.5, and negligible extreme overheating.",
+                "This model highlights the dominant impact of façade proximity on thermal discomfort.",
+            ],
+        },
+        "Zone Model 3": {
+            "iso": "iso_3zone.png",
+            "plan": "plan_3zone.png",
+            "to": "plot_3zone_to.png",
+            "pmv": "plot_3zone_pmv.png",
+            "desc": [
+                "Three subzones parallel to the facade with the same area: A: adjacent to the facade; B: in the middle; C: deepest zone",
+                "Goal: to check an intermediate thermal zone between the perimeter and core subzones",
+            ],
+            "outcomes": [
+                "Introduced an intermediate subzone (B) with moderate discomfort levels (31.9% of To > 26°C and PMV > +0.5).",
+                "Perimeter subzone (A) remained highly uncomfortable, with 81.9% of To > 26°C and 80.7% of PMV > +0.5, similar to Zone Model 2.",
+                "Core subzone (C) was predominantly comfortable and thermally stable, with only 3.2% of To > 26°C and 7.9% of PMV > +0.5.",
+                "This configuration captures a thermal gradient from façade to core, improving representativeness without unnecessary complexity.",
+            ],
+        },
+        "Zone Model 9": {
+            "iso": "iso_9zone.png",  # conforme seu naming
+            "plan": "plan_9zone.png",
+            "to": "plot_9zone_to.png",
+            "pmv": "plot_9zone_pmv.png",
+            "desc": [
+                "Nine subzones with the same area: A1, A2, A3, B1, B2, B3, C1, C2, C3",
+                "Goal: To assess the influence of side walls on the thermal zones",
+            ],
+            "outcomes": [
+                "Zones located on the same row showed very similar thermal behavior (A1 ≈ A2 ≈ A3; B1 ≈ B2 ≈ B3; C1 ≈ C2 ≈ C3).",
+                "Side walls had no expressive influence on thermal comfort distribution.",
+                "Effect size analysis confirmed this redundancy: Cohen’s d < 0.2 for all paired zones, and high overlap coefficients (OVL) for both To and PMV.",
+                "Results demonstrate that additional lateral subdivisions do not add analytical value.",
+            ],
+        },
+    }
+
+
+
+# =========================
+# Compilação (Markdown simples -> HTML)
+# =========================
+
+def _link_refs(text: str) -> str:
+    """
+    [1,2] / [7–10] -> cite span; each number links to REFERENCES_URL#ref-N
+    when set (the page itself has no reference list to point at).
+    """
+    def number(m):
+        n = m.group(0)
+        return f'<a href="{REFERENCES_URL}#ref-{n}">{n}</a>'
+
+    def group(m):
+        refs = _REF_NUMBER.sub(number, m.group(1)) if REFERENCES_URL else m.group(1)
+        return f'<span class="cite">[{refs}]</span>'
+
+    return _REF_GROUP.sub(group, text)
+
+
+def md_to_html(md: str) -> str:
+    """Simple Markdown (### / #### headings + paragraphs + [n] references) -> HTML fragment."""
+    out = []
+    paragraph = []
+
+    def flush_paragraph():
+        nonlocal paragraph
+        if paragraph:
+            # colapsa espaços múltiplos
+            txt = re.sub(r"\s{2,}", " ", " ".join(paragraph).strip())
+            out.append(f"<p>{_link_refs(html.escape(txt, quote=False))}</p>")
+            paragraph = []
+
+    for raw in md.splitlines():
+        line = raw.strip()
+        if not line:
+            flush_paragraph()
+            continue
+
+        if line.startswith("### "):
+            flush_paragraph()
+            out.append(f"<h3>{html.escape(line[4:].strip(), quote=False)}</h3>")
+            continue
+
+        if line.startswith("#### "):
+            flush_paragraph()
+            out.append(f"<h4>{html.escape(line[5:].strip(), quote=False)}</h4>")
+            continue
+
+        paragraph.append(line)
+
+    flush_paragraph()
+    return "\n".join(out)
+
+
+def content_hash(md: str) -> str:
+    return hashlib.sha256(f"{COMPILER_VERSION}\n{md}".encode("utf-8")).hexdigest()[:16]
+
+
+# =========================
+# Fragmentos (cache por hash)
+# =========================
+
+@functools.lru_cache(maxsize=16)
+def _source(path: str, size: int, mtime_ns: int) -> tuple[str, str]:
+    md = Path(path).read_text(encoding="utf-8")
+    return md, content_hash(md)
+
+
+@perf.timed()
+def fragment(name: str) -> str:
+    """HTML for assets/text/<name>.md, compiled once per content hash (prebuilt file if present)."""
+    path = TEXT_DIR / f"{name}.md"
+    st = path.stat()
+    md, digest = _source(str(path), st.st_size, st.st_mtime_ns)
+    out = _fragments.get(digest)
+    if out is None:
+        built = BUILD_DIR / f"{name}.{digest}.html"
+        out = built.read_text(encoding="utf-8") if built.exists() else md_to_html(md)
+        _fragments[digest] = out
+    return out
+
+
+def build(names=None) -> list[Path]:
+    """Compile assets/text/*.md into build/<name>.<hash>.html, removing stale versions."""
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    written = []
+    for src in sorted(TEXT_DIR.glob("*.md")):
+        name = src.stem
+        if names and name not in names:
+            continue
+        md = src.read_text(encoding="utf-8")
+        target = BUILD_DIR / f"{name}.{content_hash(md)}.html"
+        for old in BUILD_DIR.glob(f"{name}.*.html"):
+            if old != target:
+                old.unlink()
+        target.write_text(md_to_html(md) + "\n", encoding="utf-8")
+        written.append(target)
+    return written
+
+
+# =========================
+# Imagens inline
+# =========================
+
+@functools.lru_cache(maxsize=ASSET_CACHE_SIZE)
+def _b64_cached(path: str, size: int, mtime_ns: int) -> str:
+    return base64.b64encode(Path(path).read_bytes()).decode("utf-8")
+
+
+@perf.timed("asset_b64")
+def b64_file(path) -> str:
+    """Image file -> base64 text for inline <img> tags (one encode per file version and process)."""
+    st = Path(path).stat()
+    return _b64_cached(str(path), st.st_size, st.st_mtime_ns)
+
+
+# =========================
+# Imagens estáticas (com hash, cache do navegador)
+# =========================
+
+@functools.lru_cache(maxsize=ASSET_CACHE_SIZE)
+def _published(path: str, size: int, mtime_ns: int) -> str | None:
+    # Versões antigas ficam (como em theme.publish): num deploy gradual, páginas
+    # servidas por workers ainda no código anterior apontam para elas.
+    src = Path(path)
+    data = src.read_bytes()
+    name = f"{src.stem}.{hashlib.sha256(data).hexdigest()[:12]}{src.suffix}"
+    target = STATIC_ASSET_DIR / name
+    try:
+        if not target.exists():
+            STATIC_ASSET_DIR.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=STATIC_ASSET_DIR, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, target)
+    except OSError:
+        return None
+    return f"{STATIC_ASSET_URL}/{name}"
+
+
+def asset_url(path) -> str | None:
+    """Publish an image as app/static/assets/<stem>.<hash><ext> (once per file version); URL or None."""
+    if not theme.static_serving():
+        return None
+    st = Path(path).stat()
+    return _published(str(path), st.st_size, st.st_mtime_ns)
+
+
+def img_src(path) -> str:
+    """<img src> for an asset: the static URL when possible, else an inline data URI."""
+    url = asset_url(path)
+    if url is not None:
+        return url
+    mime = "jpeg" if Path(path).suffix.lower() in (".jpg", ".jpeg") else Path(path).suffix.lstrip(".").lower()
+    return f"data:image/{mime};base64,{b64_file(path)}"
+
+
+if __name__ == "__main__":
+    for p in build(sys.argv[1:]):
+        print(p.relative_to(ROOT_DIR))
@@ -0,0 +1,249 @@
+# dataset.py
+# Tabelas de resultados da tese (conforto + energia), compartilhadas entre o
+# app (thesis.py), o modelo reduzido (model.py) e o sweep paramétrico (sweep.py).
+import functools
+from pathlib import Path
+from types import MappingProxyType
+
+import numpy as np
+
+APP_DIR = Path(__file__).resolve().parent          # .../app
+ROOT_DIR = APP_DIR.parent                          # .../thesis_sim
+ASSETS_DIR = ROOT_DIR / "assets" / "img"
+
+# =========================
+# 1) DATA (editável)
+# =========================
+
+# Conforto — controle por Ta (19–24)
+COMFORT_TA = {
+    "A": {
+        24: {"To_gt_26": 97.0, "To_lt_23": 0.0, "PMV_gt_p05": 92.6, "PMV_lt_m05": 0.0},
+        23: {"To_gt_26": 71.3, "To_lt_23": 0.0, "PMV_gt_p05": 53.9, "PMV_lt_m05": 0.0},
+        22: {"To_gt_26": 27.5, "To_lt_23": 0.0, "PMV_gt_p05": 20.1, "PMV_lt_m05": 0.0},
+        21: {"To_gt_26": 14.0, "To_lt_23": 0.0, "PMV_gt_p05": 8.0,  "PMV_lt_m05": 0.0},
+        20: {"To_gt_26": 5.4,  "To_lt_23": 8.0, "PMV_gt_p05": 3.4,  "PMV_lt_m05": 6.0},
+        19: {"To_gt_26": 2.1,  "To_lt_23": 38.0, "PMV_gt_p05": 2.0,  "PMV_lt_m05": 35.0},
+    },
+    "B": {
+        24: {"To_gt_26": 95.0, "To_lt_23": 0.0, "PMV_gt_p05": 85.9, "PMV_lt_m05": 0.0},
+        23: {"To_gt_26": 16.0, "To_lt_23": 0.0, "PMV_gt_p05": 8.5,  "PMV_lt_m05": 0.0},
+        22: {"To_gt_26": 2.2,  "To_lt_23": 0.0, "PMV_gt_p05": 2.1,  "PMV_lt_m05": 0.0},
+        21: {"To_gt_26": 1.1,  "To_lt_23": 0.0, "PMV_gt_p05": 1.7,  "PMV_lt_m05": 0.0},
+        20: {"To_gt_26": 0.5,  "To_lt_23": 49.0, "PMV_gt_p05": 1.7,  "PMV_lt_m05": 41.0},
+        19: {"To_gt_26": 0.1,  "To_lt_23": 92.0, "PMV_gt_p05": 1.7,  "PMV_lt_m05": 91.0},
+    },
+    "C": {
+        24: {"To_gt_26": 58.6, "To_lt_23": 0.0, "PMV_gt_p05": 32.0, "PMV_lt_m05": 0.0},
+        23: {"To_gt_26": 2.5,  "To_lt_23": 0.0, "PMV_gt_p05": 2.2,  "PMV_lt_m05": 0.0},
+        22: {"To_gt_26": 0.6,  "To_lt_23": 0.0, "PMV_gt_p05": 1.7,  "PMV_lt_m05": 0.0},
+        21: {"To_gt_26": 0.2,  "To_lt_23": 0.0, "PMV_gt_p05": 0.7,  "PMV_lt_m05": 0.0},
+        20: {"To_gt_26": 0.0,  "To_lt_23": 88.0, "PMV_gt_p05": 1.7,  "PMV_lt_m05": 85.0},
+        19: {"To_gt_26": 0.0,  "To_lt_23": 98.0, "PMV_gt_p05": 1.7,  "PMV_lt_m05": 97.0},
+    }
+}
+
+# Conforto — controle por To (22–27)
+COMFORT_TO = {
+    "A": {
+        27: {"To_gt_26": 100.0, "To_lt_23": 0.0, "PMV_gt_p05": 96.9, "PMV_lt_m05": 0.0},
+        26: {"To_gt_26": 2.6,  "To_lt_23": 0.0, "PMV_gt_p05": 1.7,  "PMV_lt_m05": 0.0},
+        25: {"To_gt_26": 0.3,  "To_lt_23": 0.0, "PMV_gt_p05": 1.7,  "PMV_lt_m05": 0.0},
+        24: {"To_gt_26": 0.1,  "To_lt_23": 0.0, "PMV_gt_p05": 1.7,  "PMV_lt_m05": 2.0},
+        23: {"To_gt_26": 0.1,  "To_lt_23": 25.0, "PMV_gt_p05": 1.7,  "PMV_lt_m05": 49.0},
+        22: {"To_gt_26": 0.0,  "To_lt_23": 99.0, "PMV_gt_p05": 1.7,  "PMV_lt_m05": 98.0},
+    },
+    "B": {
+        27: {"To_gt_26": 100.0, "To_lt_23": 0.0, "PMV_gt_p05": 98.6, "PMV_lt_m05": 0.0},
+        26: {"To_gt_26": 2.5,  "To_lt_23": 0.0, "PMV_gt_p05": 1.7,  "PMV_lt_m05": 0.9},
+        25: {"To_gt_26": 0.0,  "To_lt_23": 0.0, "PMV_gt_p05": 1.7,  "PMV_lt_m05": 0.0},
+        24: {"To_gt_26": 0.0,  "To_lt_23": 0.0, "PMV_gt_p05": 1.7,  "PMV_lt_m05": 1.0},
+        23: {"To_gt_26": 0.0,  "To_lt_23": 2.0,  "PMV_gt_p05": 1.7,  "PMV_lt_m05": 3.0},
+        22: {"To_gt_26": 0.0,  "To_lt_23": 100.0, "PMV_gt_p05": 1.7, "PMV_lt_m05": 98.0},
+    },
+    "C": {
+        27: {"To_gt_26": 100.0, "To_lt_23": 0.0, "PMV_gt_p05": 99.9, "PMV_lt_m05": 0.0},
+        26: {"To_gt_26": 1.6,  "To_lt_23": 0.0, "PMV_gt_p05": 1.7,  "PMV_lt_m05": 0.9},
+        25: {"To_gt_26": 0.0,  "To_lt_23": 0.0, "PMV_gt_p05": 1.7,  "PMV_lt_m05": 0.0},
+        24: {"To_gt_26": 0.0,  "To_lt_23": 0.0, "PMV_gt_p05": 1.7,  "PMV_lt_m05": 0.0},
+        23: {"To_gt_26": 0.0,  "To_lt_23": 2.0,  "PMV_gt_p05": 1.7,  "PMV_lt_m05": 2.0},
+        22: {"To_gt_26": 0.0,  "To_lt_23": 100.0, "PMV_gt_p05": 1.7, "PMV_lt_m05": 98.0},
+    }
+}
+
+ENERGY_TA = {19: 321, 20: 306, 21: 291, 22: 276, 23: 262, 24: 249}
+ENERGY_TO = {22: 341, 23: 322, 24: 300, 25: 280, 26: 262, 27: 245}
+
+# =========================
+# TAB 4 — FACADE DESIGN DATA (editável)
+# =========================
+
+FACADE_ALTS = [
+    {
+        "id": "ALT1",
+        "label": "SHGC .16\nNo Shading",
+        "img": str(ASSETS_DIR / "001_shgc16noshading.jpg"),
+        "meta": {"SHGC": ".16", "WWR": "100%", "Type": "Double Low-E", "Shading": "No"},
+    },
+    {
+        "id": "ALT2",
+        "label": "SHGC .29\nNo Shading (BC)",
+        "img": str(ASSETS_DIR / "002_shgc29noshading.jpg"),
+        "meta": {"SHGC": ".29", "WWR": "100%", "Type": "Laminated", "Shading": "No"},
+    },
+    {
+        "id": "ALT3",
+        "label": "SHGC .41\nNo Shading",
+        "img": str(ASSETS_DIR / "003_shgc41noshading.jpg"),
+        "meta": {"SHGC": ".41", "WWR": "100%", "Type": "Laminated", "Shading": "No"},
+    },
+    {
+        "id": "ALT4",
+        "label": "SHGC .29\nNo Shading\n*WWR 50%",
+        "img": str(ASSETS_DIR / "004_shgc29noshadingwwr50.jpg"),
+        "meta": {"SHGC": ".29", "WWR": "50%", "Type": "Laminated", "Shading": "No"},
+    },
+    {
+        "id": "ALT5",
+        "label": "SHGC .29\nShaded",
+        "img": str(ASSETS_DIR / "005_shgc29shaded.jpg"),
+        "meta": {"SHGC": ".29", "WWR": "100%", "Type": "Laminated", "Shading": "100%"},
+    },
+]
+
+# --- Comfort (Ta thermostat), extracted from your charts (21°C and 23°C)
+# keys inside each zone:
+#   To_gt_26, To_lt_23, PMV_gt_p05, PMV_lt_m05
+
+COMFORT_FACADE_TA = {
+    21: {
+        # Zone A
+        "A": {
+            "ALT1": {"To_gt_26": 2.3,  "To_lt_23": 0.0, "PMV_gt_p05": 2.1,  "PMV_lt_m05": 0.0},
+            "ALT2": {"To_gt_26": 14.0, "To_lt_23": 0.0, "PMV_gt_p05": 8.0,  "PMV_lt_m05": 0.0},
+            "ALT3": {"To_gt_26": 25.4, "To_lt_23": 0.0, "PMV_gt_p05": 18.1, "PMV_lt_m05": 0.0},
+            "ALT4": {"To_gt_26": 1.1,  "To_lt_23": 0.0, "PMV_gt_p05": 1.8,  "PMV_lt_m05": 0.0},
+            "ALT5": {"To_gt_26": 0.6,  "To_lt_23": 0.0, "PMV_gt_p05": 1.7,  "PMV_lt_m05": 0.0},
+        },
+        # Zone B
+        "B": {
+            "ALT1": {"To_gt_26": 0.4, "To_lt_23": 0.0, "PMV_gt_p05": 1.7, "PMV_lt_m05": 0.0},
+            "ALT2": {"To_gt_26": 1.1, "To_lt_23": 0.0, "PMV_gt_p05": 1.7, "PMV_lt_m05": 0.0},
+            "ALT3": {"To_gt_26": 2.5, "To_lt_23": 0.0, "PMV_gt_p05": 2.3, "PMV_lt_m05": 0.0},
+            "ALT4": {"To_gt_26": 0.1, "To_lt_23": 0.0, "PMV_gt_p05": 1.7, "PMV_lt_m05": 0.0},
+            "ALT5": {"To_gt_26": 0.1, "To_lt_23": 0.0, "PMV_gt_p05": 1.7, "PMV_lt_m05": 0.0},
+        },
+        # Zone C (note: some To<23 exists at 21°C in your chart)
+        "C": {
+            "ALT1": {"To_gt_26": 0.0, "To_lt_23": 1.0, "PMV_gt_p05": 1.7, "PMV_lt_m05": 0.0},
+            "ALT2": {"To_gt_26": 0.2, "To_lt_23": 0.0, "PMV_gt_p05": 1.7, "PMV_lt_m05": 0.0},
+            "ALT3": {"To_gt_26": 0.7, "To_lt_23": 0.0, "PMV_gt_p05": 1.7, "PMV_lt_m05": 0.0},
+            "ALT4": {"To_gt_26": 0.0, "To_lt_23": 7.0, "PMV_gt_p05": 1.7, "PMV_lt_m05": 0.0},
+            "ALT5": {"To_gt_26": 0.0, "To_lt_23": 3.0, "PMV_gt_p05": 1.7, "PMV_lt_m05": 0.0},
+        },
+    },
+
+    23: {
+        "A": {
+            "ALT1": {"To_gt_26": 33.5, "To_lt_23": 0.0, "PMV_gt_p05": 22.0, "PMV_lt_m05": 0.0},
+            "ALT2": {"To_gt_26": 71.3, "To_lt_23": 0.0, "PMV_gt_p05": 53.9, "PMV_lt_m05": 0.0},
+            "ALT3": {"To_gt_26": 84.0, "To_lt_23": 0.0, "PMV_gt_p05": 76.6, "PMV_lt_m05": 0.0},
+            "ALT4": {"To_gt_26": 22.5, "To_lt_23": 0.0, "PMV_gt_p05": 14.0, "PMV_lt_m05": 0.0},
+            "ALT5": {"To_gt_26": 24.5, "To_lt_23": 0.0, "PMV_gt_p05": 4.6,  "PMV_lt_m05": 0.0},
+        },
+        "B": {
+            "ALT1": {"To_gt_26": 5.8,  "To_lt_23": 0.0, "PMV_gt_p05": 3.2,  "PMV_lt_m05": 0.0},
+            "ALT2": {"To_gt_26": 16.0, "To_lt_23": 0.0, "PMV_gt_p05": 8.5,  "PMV_lt_m05": 0.0},
+            "ALT3": {"To_gt_26": 46.4, "To_lt_23": 0.0, "PMV_gt_p05": 30.2, "PMV_lt_m05": 0.0},
+            "ALT4": {"To_gt_26": 2.1,  "To_lt_23": 0.0, "PMV_gt_p05": 1.9,  "PMV_lt_m05": 0.0},
+            "ALT5": {"To_gt_26": 1.5,  "To_lt_23": 0.0, "PMV_gt_p05": 1.7,  "PMV_lt_m05": 0.0},
+        },
+        "C": {
+            "ALT1": {"To_gt_26": 1.6, "To_lt_23": 0.0, "PMV_gt_p05": 1.9, "PMV_lt_m05": 0.0},
+            "ALT2": {"To_gt_26": 2.5, "To_lt_23": 0.0, "PMV_gt_p05": 2.2, "PMV_lt_m05": 0.0},
+            "ALT3": {"To_gt_26": 8.3, "To_lt_23": 0.0, "PMV_gt_p05": 4.9, "PMV_lt_m05": 0.0},
+            "ALT4": {"To_gt_26": 0.7, "To_lt_23": 0.0, "PMV_gt_p05": 1.7, "PMV_lt_m05": 0.0},
+            "ALT5": {"To_gt_26": 0.6, "To_lt_23": 0.0, "PMV_gt_p05": 1.7, "PMV_lt_m05": 0.0},
+        },
+    },
+}
+
+# --- Energy (kWh/m²·year) extracted from your two energy charts
+ENERGY_FACADE_TA = {
+    21: {"ALT1": 266, "ALT2": 291, "ALT3": 317, "ALT4": 259, "ALT5": 260},
+    # 23°C not provided in the images you sent (leave as placeholders; fill later)
+    23: {"ALT1": None, "ALT2": None, "ALT3": None, "ALT4": None, "ALT5": None},
+}
+
+ENERGY_FACADE_TO26 = {"ALT1": 238, "ALT2": 262, "ALT3": 295, "ALT4": 228, "ALT5": 224}
+
+
+# =========================
+# 2) VISTAS SOMENTE LEITURA (uma vez por processo)
+# =========================
+# As tabelas acima são editadas no código, mas o app só lê. As vistas abaixo
+# são montadas no import (uma vez por processo) e entregues por referência a
+# todas as sessões: arrays NumPy só leitura com eixos rotulados e mapeamentos
+# imutáveis. Nenhum rerun copia dados; quando as tabelas virarem séries
+# horárias, o eixo extra entra no mesmo Cube.
+
+ZONES = ("A", "B", "C")
+METRICS = ("To_gt_26", "To_lt_23", "PMV_gt_p05", "PMV_lt_m05")
+HOT_COLD = {"To": ("To_gt_26", "To_lt_23"), "PMV": ("PMV_gt_p05", "PMV_lt_m05")}   # parâmetro -> (calor, frio)
+
+
+class Cube:
+    """Read-only float array with labelled axes (missing values are NaN)."""
+    __slots__ = ("values", "axes", "_pos")
+
+    def __init__(self, values: np.ndarray, axes: dict):
+        values.setflags(write=False)
+        self.values = values
+        self.axes = MappingProxyType({name: tuple(labels) for name, labels in axes.items()})
+        self._pos = MappingProxyType({name: {label: i for i, label in enumerate(labels)}
+                                      for name, labels in self.axes.items()})
+
+    @classmethod
+    def from_nested(cls, table: dict, axes: dict) -> "Cube":
+        """Nested dicts in axis order ({zone: {setpoint: {metric: value}}}) -> Cube."""
+        shape = tuple(len(labels) for labels in axes.values())
+        values = np.full(shape, np.nan)
+        for idx in np.ndindex(*shape):
+            node = table
+            for labels, i in zip(axes.values(), idx):
+                node = node.get(labels[i]) if node is not None else None
+            if node is not None:
+                values[idx] = node
+        return cls(values, axes)
+
+    def take(self, **labels) -> np.ndarray:
+        """View with the named axes fixed (e.g. take(zone="A", setpoint=21) -> per-metric values)."""
+        index = tuple(self._pos[name][labels[name]] if name in labels else slice(None) for name in self.axes)
+        return self.values[index]
+
+
+ALT_IDS = tuple(a["id"] for a in FACADE_ALTS)
+ALT_BY_ID = MappingProxyType({a["id"]: MappingProxyType(a) for a in FACADE_ALTS})
+
+COMFORT_CUBES = MappingProxyType({
+    kind: Cube.from_nested(table, {"zone": ZONES, "setpoint": sorted(table["A"]), "metric": METRICS})
+    for kind, table in (("Ta", COMFORT_TA), ("To", COMFORT_TO))
+})
+COMFORT_FACADE_CUBE = Cube.from_nested(
+    COMFORT_FACADE_TA, {"setpoint": sorted(COMFORT_FACADE_TA), "zone": ZONES, "alt": ALT_IDS, "metric": METRICS})
+
+
+@functools.lru_cache(maxsize=None)
+def zone_discomfort(control: str, setpoint: int, mode: str, alt: str | None = None) -> tuple:
+    """
+    (zone_hot, zone_cold) for the plan, from the thesis tables: Tab 3 without
+    `alt`, Tab 4 (Ta only) with it. Read-only mappings, one per input for the
+    whole process.
+    """
+    if alt is None:
+        values = COMFORT_CUBES[control].take(setpoint=setpoint)          # zona x métrica
+    else:
+        values = COMFORT_FACADE_CUBE.take(setpoint=setpoint, alt=alt)   # zona x métrica
+    hot, cold = (METRICS.index(m) for m in HOT_COLD[mode])
+    return (MappingProxyType({z: float(values[i, hot]) for i, z in enumerate(ZONES)}),
+            MappingProxyType({z: float(values[i, cold]) for i, z in enumerate(ZONES)}))
@@ -0,0 +1,347 @@
+# download.py
+# "Os dados por trás dos gráficos": o cubo de resultados (tabelas da tese +
+# casos do results/ store) em formato longo — uma linha por caso x subzona —
+# exportado como CSV ou Parquet, gerado em blocos de CHUNK_ROWS linhas.
+#
+# Uso (linha de comando):
+#   python app/download.py --format csv --control Ta --zone A B > ta.csv
+#   python app/download.py --format parquet --source store --out cubo.parquet
+#   python app/download.py --check          # confere com o que o app desenha
+#
+# No app, publish() grava o arquivo bloco a bloco em app/static/downloads/
+# (nome = hash dos filtros + estado do store, então um pedido repetido não
+# gera de novo) e o servidor do Streamlit o entrega em streaming. A memória
+# fica limitada a um bloco, nos dois lados.
+#
+# Filtros: origem (thesis / store), clima, tipo de controle e subzona. Só
+# o modelo de 3 subzonas (A, B, C) tem resultados numéricos; os modelos de
+# zoneamento da Tab 2 existem apenas como imagens. O store guarda métricas
+# anuais por caso — não há séries horárias a exportar.
+import argparse
+import csv
+import functools
+import hashlib
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import model
+from dataset import (
+    COMFORT_TA, COMFORT_TO, ENERGY_TA, ENERGY_TO,
+    FACADE_ALTS, COMFORT_FACADE_TA, ENERGY_FACADE_TA, ENERGY_FACADE_TO26,
+    ALT_IDS, HOT_COLD, zone_discomfort,
+)
+from solar import WEATHER_DIR
+from store import APP_DIR, ResultStore, canonical_json
+
+CHUNK_ROWS = 5000           # linhas por bloco (CSV) / row group (Parquet)
+DOWNLOAD_DIR = APP_DIR / "static" / "downloads"
+DOWNLOAD_URL = "app/static/downloads"
+DOWNLOAD_KEEP = 16          # arquivos mantidos em DOWNLOAD_DIR (os mais antigos saem)
+THESIS_CLIMATE = "Fortaleza"    # clima das simulações da tese (e da calibração do modelo reduzido)
+BASE_CASE_ALT = "ALT2"          # fachada do caso base (Tab 3)
+FORMATS = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+COLUMNS = (
+    "source", "backend", "climate", "control", "facade", "shgc", "wwr", "shading", "orientation",
+    "deadband", "zone", "setpoint", *model.METRICS, "energy_kwh_m2",
+)
+_TEXT = {"source", "backend", "climate", "control", "facade", "zone"}
+
+
+# =========================
+# Linhas (geradores, uma de cada vez)
+# =========================
+
+def _row(source, backend, climate, control, facade, params, zone, setpoint, metrics, energy) -> tuple:
+    m = metrics or {}
+    return (source, backend, climate, control, facade, params.get("shgc"), params.get("wwr"),
+            params.get("shading"), params.get("orientation"), params.get("deadband"), zone, setpoint,
+            *(m.get(k) for k in model.METRICS), energy)
+
+
+def thesis_rows():
+    """The thesis tables the app draws (Tab 3 base case, Tab 4 facade alternatives)."""
+    alts = {a["id"]: dict(model.facade_params(a), orientation=model.BC_ORIENTATION) for a in FACADE_ALTS}
+    for control, comfort, energy in (("Ta", COMFORT_TA, ENERGY_TA), ("To", COMFORT_TO, ENERGY_TO)):
+        for sp in sorted(energy):
+            for z in model.ZONES:
+                yield _row("thesis/base_case", "energyplus", THESIS_CLIMATE, control, BASE_CASE_ALT,
+                           alts[BASE_CASE_ALT], z, sp, comfort[z].get(sp), energy[sp])
+    for sp in sorted(COMFORT_FACADE_TA):
+        for alt in alts:
+            for z in model.ZONES:
+                yield _row("thesis/facade", "energyplus", THESIS_CLIMATE, "Ta", alt, alts[alt], z, sp,
+                           COMFORT_FACADE_TA[sp][z].get(alt), ENERGY_FACADE_TA[sp].get(alt))
+    for alt in alts:  # To 26 °C: só energia (sem planta de conforto)
+        yield _row("thesis/facade", "energyplus", THESIS_CLIMATE, "To", alt, alts[alt], None, 26,
+                   None, ENERGY_FACADE_TO26.get(alt))
+
+
+@functools.lru_cache(maxsize=1)
+def _weather_by_hash(listing: tuple) -> dict:
+    out = {}
+    for path in listing:
+        out[hashlib.sha256(Path(path).read_bytes()).hexdigest()[:16]] = Path(path).stem
+    return out
+
+
+def climate_of(backend: str) -> str:
+    """Backend fingerprint -> climate: EPW stem for the RC model, thesis climate for the reduced model."""
+    name, _, rest = backend.partition(":")
+    if name == "reduced":
+        return THESIS_CLIMATE
+    digest = rest.rsplit(":", 1)[-1]
+    listing = tuple(str(p) for p in sorted(WEATHER_DIR.glob("*.epw")))
+    return _weather_by_hash(listing).get(digest, f"epw:{digest}")
+
+
+def store_rows(store: ResultStore | None = None):
+    """One row per stored case and zone (sweeps, batch simulations, orientation studies)."""
+    for rec in (store or ResultStore()).records():
+        backend = rec.get("backend", "")
+        p, res = rec["params"], rec["result"]
+        climate = climate_of(backend)
+        for z in model.ZONES:
+            yield _row(f"store/{backend.partition(':')[0]}", backend, climate, p.get("control"), p.get("facade"),
+                       p, z, p.get(f"setpoint_{z}", p.get("setpoint")), res["comfort"].get(z), res.get("energy"))
+
+
+def rows(source=None, climate=None, control=None, zone=None, store: ResultStore | None = None):
+    """Filtered rows (tuples in COLUMNS order). Each filter is a list of accepted values (None = all)."""
+    sources = []
+    if not source or "thesis" in source:
+        sources.append(thesis_rows())
+    if not source or "store" in source:
+        sources.append(store_rows(store))
+    i_climate, i_control, i_zone = COLUMNS.index("climate"), COLUMNS.index("control"), COLUMNS.index("zone")
+    for it in sources:
+        for r in it:
+            if climate and r[i_climate] not in climate:
+                continue
+            if control and r[i_control] not in control:
+                continue
+            if zone and r[i_zone] not in zone:
+                continue
+            yield r
+
+
+def _chunks(it, size: int = CHUNK_ROWS):
+    chunk = []
+    for r in it:
+        chunk.append(r)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# =========================
+# Formatos (bytes em blocos)
+# =========================
+
+def iter_csv(it):
+    """Row iterator -> CSV bytes, one block per CHUNK_ROWS rows (header first)."""
+    buf = io.StringIO()
+    w = csv.writer(buf, lineterminator="\n")
+    w.writerow(COLUMNS)
+    for chunk in _chunks(it):
+        w.writerows(chunk)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+class _Sink(io.RawIOBase):
+    """Write-only file that hands its bytes back to the generator after each row group."""
+    def __init__(self):
+        self.parts = []
+        self.pos = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.parts.append(bytes(b))
+        self.pos += len(b)
+        return len(b)
+
+    def tell(self):
+        return self.pos
+
+    def drain(self) -> bytes:
+        out, self.parts = b"".join(self.parts), []
+        return out
+
+
+def iter_parquet(it):
+    """Row iterator -> Parquet bytes, one row group per CHUNK_ROWS rows. Needs pyarrow."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(c, pa.string() if c in _TEXT else pa.float64()) for c in COLUMNS])
+    sink = _Sink()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for chunk in _chunks(it):
+            cols = list(zip(*chunk))
+            writer.write_table(pa.table([pa.array(col, type=f.type) for col, f in zip(cols, schema)], schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def stream(fmt: str = "csv", **filters):
+    """File contents as an iterator of byte blocks (bounded memory)."""
+    it = rows(**filters)
+    return iter_parquet(it) if fmt == "parquet" else iter_csv(it)
+
+
+def write(path, fmt: str = "csv", **filters) -> Path:
+    """Stream into `path` (atomic: temp file + rename)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for block in stream(fmt, **filters):
+                f.write(block)
+        os.replace(tmp, path)
+    finally:
+        Path(tmp).unlink(missing_ok=True)
+    return path
+
+
+# =========================
+# Publicação (app)
+# =========================
+
+def climates() -> list[str]:
+    """Climate filter options: the thesis climate + weather files in assets/weather."""
+    return [THESIS_CLIMATE, *(p.stem for p in sorted(WEATHER_DIR.glob("*.epw")))]
+
+
+def file_name(fmt: str, **filters) -> str:
+    parts = ["thesis_sim"] + ["-".join(map(str, v)) for k, v in sorted(filters.items()) if v]
+    return "_".join(parts) + f".{fmt}"
+
+
+def publish(fmt: str = "csv", store: ResultStore | None = None, **filters) -> tuple[str, Path]:
+    """
+    Write the filtered cube into app/static/downloads (skipped if the same
+    filters + store state were already written). Returns (url, path).
+    """
+    store = store or ResultStore()
+    key = hashlib.sha256(canonical_json({"fmt": fmt, "filters": filters, "columns": COLUMNS,
+                                         "store": store.state()}).encode("utf-8")).hexdigest()[:16]
+    path = DOWNLOAD_DIR / f"{key}.{fmt}"
+    if not path.exists():
+        write(path, fmt, store=store, **filters)
+        old = sorted(DOWNLOAD_DIR.glob("*.*"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for p in old[DOWNLOAD_KEEP:]:
+            p.unlink(missing_ok=True)
+    return f"{DOWNLOAD_URL}/{path.name}", path
+
+
+# =========================
+# Conferência com os números do app
+# =========================
+
+# Setpoints que o app oferece (sliders da Tab 3, rádio Ta da Tab 4) — o To da
+# Tab 4 é fixo em 26 °C e só tem energia.
+APP_SETPOINTS = {"Ta": range(19, 25), "To": range(22, 28)}
+TAB4_TA_SETPOINTS = (21, 23)
+
+
+def app_expected() -> dict:
+    """
+    {(source, control, facade, zone, setpoint): {column: value}} rebuilt from
+    what the app draws, not from thesis_rows(): the plan colours through
+    zone_discomfort (Tab 3/4 hot/cold mapping) and the bars of the energy
+    charts.
+    """
+    from figures import make_energy_chart, make_energy_chart_facade   # plotly só aqui
+
+    out = {}
+
+    def put(source, control, facade, zone, sp, **cells):
+        out.setdefault((source, control, facade, zone, str(sp)), {}).update(cells)
+
+    fig, _ = make_energy_chart(active_kind="Ta", active_sp=19, ref_sp=None)
+    bars = {tr.name: dict(zip(tr.x, tr.y)) for tr in fig.data}
+    for control, sps in APP_SETPOINTS.items():
+        for sp in sps:
+            for z in model.ZONES:
+                put("thesis/base_case", control, BASE_CASE_ALT, z, sp, energy_kwh_m2=bars[control][str(sp)])
+            for mode in HOT_COLD:
+                for m, values in zip(HOT_COLD[mode], zone_discomfort(control, sp, mode)):
+                    for z, v in values.items():
+                        put("thesis/base_case", control, BASE_CASE_ALT, z, sp, **{m: v})
+
+    for sp in TAB4_TA_SETPOINTS:
+        y = make_energy_chart_facade("Ta", sp, ALT_IDS[0]).data[0].y
+        for alt, e in zip(ALT_IDS, y):
+            for z in model.ZONES:
+                put("thesis/facade", "Ta", alt, z, sp, energy_kwh_m2=e)
+            for mode in HOT_COLD:
+                for m, values in zip(HOT_COLD[mode], zone_discomfort("Ta", sp, mode, alt=alt)):
+                    for z, v in values.items():
+                        put("thesis/facade", "Ta", alt, z, sp, **{m: v})
+    y = make_energy_chart_facade("To", 26, ALT_IDS[0]).data[0].y
+    for alt, e in zip(ALT_IDS, y):
+        put("thesis/facade", "To", alt, "", 26, energy_kwh_m2=e)
+    return out
+
+
+def check(path) -> list[str]:
+    """Compare the thesis rows of an exported CSV with the values the app draws (app_expected). [] = all match."""
+    expected = app_expected()
+    seen, problems = set(), []
+    with open(path, newline="", encoding="utf-8") as f:
+        for rec in csv.DictReader(f):
+            if not rec["source"].startswith("thesis/"):
+                continue
+            key = tuple(rec[c] for c in ("source", "control", "facade", "zone", "setpoint"))
+            if key not in expected:
+                problems.append(f"unexpected row: {key}")
+                continue
+            seen.add(key)
+            for c, want in expected[key].items():
+                got = rec[c]
+                if (want is None and got != "") or (want is not None and (got == "" or float(got) != float(want))):
+                    problems.append(f"{key}: {c} = {got!r}, app shows {want!r}")
+    for key in expected.keys() - seen:
+        problems.append(f"missing row: {key}")
+    return problems
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Export the results cube (thesis tables + results store).")
+    ap.add_argument("--format", default="csv", choices=list(FORMATS))
+    ap.add_argument("--out", default="-", help="file path, or - for stdout")
+    ap.add_argument("--source", nargs="+", choices=["thesis", "store"])
+    ap.add_argument("--climate", nargs="+")
+    ap.add_argument("--control", nargs="+", choices=["Ta", "To"])
+    ap.add_argument("--zone", nargs="+", choices=list(model.ZONES))
+    ap.add_argument("--check", action="store_true", help="export the thesis rows as CSV and compare with what the app draws")
+    args = ap.parse_args(argv)
+
+    if args.check:
+        with tempfile.TemporaryDirectory() as tmp:
+            problems = check(write(Path(tmp) / "cube.csv", "csv", source=["thesis"]))
+        print("\n".join(problems) or "thesis rows match what the app draws")
+        raise SystemExit(1 if problems else 0)
+
+    filters = {"source": args.source, "climate": args.climate, "control": args.control, "zone": args.zone}
+    if args.out == "-":
+        for block in stream(args.format, **filters):
+            sys.stdout.buffer.write(block)
+    else:
+        write(args.out, args.format, **filters)
+
+
+if __name__ == "__main__":
+    main()
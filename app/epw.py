@@ -0,0 +1,174 @@
+# epw.py
+# Leitor de arquivos climáticos EPW em colunas NumPy.
+#
+# O arquivo é lido de uma vez (sem split por linha/campo em Python) para uma
+# matriz (colunas x 8760) float32. A matriz é gravada num sidecar binário
+# (.npy) em results/weather/ e, nas cargas seguintes, aberta com mmap —
+# sem parse e sem cópia. Cada coluna é uma view contígua.
+import functools
+import hashlib
+import io
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+
+APP_DIR = Path(__file__).resolve().parent          # .../app
+ROOT_DIR = APP_DIR.parent                          # .../thesis_sim
+CACHE_DIR = ROOT_DIR / "results" / "weather"
+
+FORMAT_VERSION = 1
+HEADER_LINES = 8
+TIMESTEP_MIN = 10       # mesmo passo das simulações da tese
+HOURS_PER_YEAR = 8760   # EPW típico (sem 29/fev)
+
+# (nome, índice do campo no EPW)
+COLUMNS = (
+    ("month", 1),
+    ("day", 2),
+    ("hour", 3),
+    ("dry_bulb", 6),      # °C
+    ("dew_point", 7),     # °C
+    ("rh", 8),            # %
+    ("pressure", 9),      # Pa
+    ("ghi", 13),          # Wh/m² (global horizontal)
+    ("dni", 14),          # Wh/m² (direta normal)
+    ("dhi", 15),          # Wh/m² (difusa horizontal)
+    ("wind_dir", 20),     # graus
+    ("wind_speed", 21),   # m/s
+)
+COLUMN_INDEX = {name: i for i, (name, _) in enumerate(COLUMNS)}
+
+
+@dataclass(frozen=True)
+class Site:
+    name: str
+    latitude: float     # graus, + Norte
+    longitude: float    # graus, + Leste (EPW: Oeste negativo)
+    tz: float           # horas em relação a UTC
+    elevation: float = 0.0
+
+
+def steps_per_year(timestep_min: int = TIMESTEP_MIN) -> int:
+    return HOURS_PER_YEAR * 60 // timestep_min
+
+
+def upsample(hourly, timestep_min: int = TIMESTEP_MIN) -> np.ndarray:
+    """
+    Hourly EPW series (value = average over the hour ENDING at the stamp)
+    -> timestep series, by linear interpolation between hour midpoints.
+    """
+    hourly = np.asarray(hourly, dtype=float)
+    t_hourly = np.arange(len(hourly)) + 0.5
+    t_step = (np.arange(len(hourly) * 60 // timestep_min) + 0.5) * timestep_min / 60.0
+    return np.interp(t_step, t_hourly, hourly, period=float(len(hourly)))
+
+
+class Weather:
+    """Site + hourly columns (read-only, possibly memory-mapped)."""
+
+    def __init__(self, site: Site, data: np.ndarray, source: str = ""):
+        self.site = site
+        self.data = data            # (len(COLUMNS), horas)
+        self.source = source
+        self._steps = {}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.data[COLUMN_INDEX[name]]
+
+    def __len__(self) -> int:
+        return self.data.shape[1]
+
+    def series(self, name: str, timestep_min: int = TIMESTEP_MIN) -> np.ndarray:
+        """Column upsampled to the simulation timestep (computed once per column/step)."""
+        key = (name, timestep_min)
+        if key not in self._steps:
+            s = upsample(self[name], timestep_min)
+            s.setflags(write=False)
+            self._steps[key] = s
+        return self._steps[key]
+
+
+def parse_epw(path) -> tuple[Site, np.ndarray]:
+    """One pass over the file: LOCATION header + numeric columns as float32."""
+    raw = Path(path).read_bytes()
+    text = raw.decode("latin-1")
+
+    first = text[:text.index("\n")].split(",")
+    site = Site(name=first[1].strip(), latitude=float(first[6]), longitude=float(first[7]),
+                tz=float(first[8]), elevation=float(first[9]))
+
+    data = np.loadtxt(
+        io.StringIO(text),
+        delimiter=",",
+        skiprows=HEADER_LINES,
+        usecols=[idx for _, idx in COLUMNS],
+        dtype=np.float32,
+        ndmin=2,
+    )
+    return site, np.ascontiguousarray(data.T)
+
+
+def _sidecar_key(path: Path) -> str:
+    st = path.stat()
+    ident = f"{FORMAT_VERSION}|{path.resolve()}|{st.st_size}|{st.st_mtime_ns}"
+    return hashlib.sha256(ident.encode("utf-8")).hexdigest()[:24]
+
+
+def _write_atomic(path: Path, write):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def read_epw(path, cache_dir: Path | str | None = CACHE_DIR) -> Weather:
+    """
+    Weather columns for `path`. With cache_dir, the parsed columns are kept in
+    a binary sidecar and memory-mapped on later loads (invalidated when the
+    EPW size/mtime changes). cache_dir=None always parses.
+    """
+    path = Path(path)
+    if cache_dir is None:
+        site, data = parse_epw(path)
+        data.setflags(write=False)
+        return Weather(site, data, str(path))
+
+    cache_dir = Path(cache_dir)
+    key = _sidecar_key(path)
+    npy = cache_dir / f"{key}.npy"
+    meta = cache_dir / f"{key}.json"
+
+    if npy.exists() and meta.exists():
+        site = Site(**json.loads(meta.read_text(encoding="utf-8")))
+        return Weather(site, np.load(npy, mmap_mode="r"), str(path))
+
+    site, data = parse_epw(path)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    _write_atomic(npy, lambda f: np.save(f, data))
+    _write_atomic(meta, lambda f: f.write(json.dumps(asdict(site)).encode("utf-8")))
+    data.setflags(write=False)
+    return Weather(site, data, str(path))
+
+
+@functools.lru_cache(maxsize=128)
+def _load_cached(path: str, size: int, mtime_ns: int) -> Weather:
+    return read_epw(path)
+
+
+def load_weather(path) -> Weather:
+    """Process-wide cached read_epw (one Weather object per file version)."""
+    p = Path(path).resolve()
+    st = p.stat()
+    return _load_cached(str(p), st.st_size, st.st_mtime_ns)
+
+
+def load_many(paths) -> dict[str, Weather]:
+    return {str(p): load_weather(p) for p in paths}
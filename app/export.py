@@ -0,0 +1,227 @@
+# export.py
+# Exportação em lote das figuras (planta e energia) de todos os cenários
+# para PNG/SVG/PDF, para artigos e revisões.
+#
+# Uso (linha de comando):
+#   python app/export.py --format png svg pdf --workers 4
+#   python app/export.py -k tab4 --format pdf --out figs/
+#
+# Cenários: Tab 3 (controle Ta/To x setpoint x parâmetro de conforto; energia
+# x referência) e Tab 4 (setpoint Ta x alternativa de fachada). Cada figura
+# tem um hash das entradas (construtor, argumentos, formato, tamanho e o
+# código de figures.py/dataset.py); figuras com o hash já registrado em
+# <out>/manifest.json são puladas. O render usa o Kaleido (pip install
+# kaleido; ele usa um Chrome local) num pool de processos, com um
+# renderizador persistente por worker.
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import figures
+from dataset import COMFORT_TA, COMFORT_TO, ENERGY_TA, ENERGY_TO, FACADE_ALTS, COMFORT_FACADE_TA, ENERGY_FACADE_TA
+from store import APP_DIR, RESULTS_DIR, canonical_json
+
+EXPORT_DIR = RESULTS_DIR / "figures"
+FORMATS = ("png", "svg", "pdf")
+PNG_SCALE = 2               # resolução do PNG (2x = ~200 dpi na largura padrão)
+CHUNK_SIZE = 8              # figuras por tarefa enviada ao pool
+MANIFEST = "manifest.json"
+
+# Entradas do hash além dos argumentos: o código que desenha e os dados
+CODE_FILES = ("figures.py", "dataset.py")
+
+
+# =========================
+# Cenários
+# =========================
+
+def _hot_cold(metrics_by_zone: dict, mode: str) -> tuple[dict, dict]:
+    """{zone: metrics} -> (zone_hot, zone_cold) for the plan, as Tabs 3/4 do."""
+    if mode == "To":
+        return ({z: m["To_gt_26"] for z, m in metrics_by_zone.items()},
+                {z: m["To_lt_23"] for z, m in metrics_by_zone.items()})
+    return ({z: m["PMV_gt_p05"] for z, m in metrics_by_zone.items()},
+            {z: m["PMV_lt_m05"] for z, m in metrics_by_zone.items()})
+
+
+def scenarios() -> list[dict]:
+    """Every figure the app can show from the thesis tables: {"name", "builder", "kwargs"}."""
+    out = []
+    for kind, table, energy in (("Ta", COMFORT_TA, ENERGY_TA), ("To", COMFORT_TO, ENERGY_TO)):
+        sps = sorted(table["A"])
+        for sp in sps:
+            for mode in ("To", "PMV"):
+                hot, cold = _hot_cold({z: table[z][sp] for z in "ABC"}, mode)
+                out.append({"name": f"tab3/plan_{kind}{sp}_{mode}", "builder": "make_plan_figure",
+                            "kwargs": {"zone_hot": hot, "zone_cold": cold}})
+        for sp in sorted(energy):
+            for ref in sorted(energy):
+                out.append({"name": f"tab3/energy_{kind}{sp}_ref{ref}", "builder": "make_energy_chart",
+                            "kwargs": {"active_kind": kind, "active_sp": sp, "ref_sp": ref}})
+
+    alt_ids = [a["id"] for a in FACADE_ALTS]
+    for sp in sorted(COMFORT_FACADE_TA):
+        for alt in alt_ids:
+            for mode in ("To", "PMV"):
+                metrics = {z: COMFORT_FACADE_TA[sp][z][alt] for z in "ABC"}
+                if any(m is None for m in metrics.values()):
+                    continue
+                hot, cold = _hot_cold(metrics, mode)
+                out.append({"name": f"tab4/plan_Ta{sp}_{alt}_{mode}", "builder": "make_plan_figure",
+                            "kwargs": {"zone_hot": hot, "zone_cold": cold}})
+        if all(v is None for v in ENERGY_FACADE_TA[sp].values()):
+            continue
+        for alt in alt_ids:
+            out.append({"name": f"tab4/energy_Ta{sp}_{alt}", "builder": "make_energy_chart_facade",
+                        "kwargs": {"control_kind": "Ta", "ta_setpoint": sp, "active_alt_id": alt}})
+    for alt in alt_ids:
+        out.append({"name": f"tab4/energy_To26_{alt}", "builder": "make_energy_chart_facade",
+                    "kwargs": {"control_kind": "To", "ta_setpoint": 0, "active_alt_id": alt}})
+    return out
+
+
+def code_fingerprint() -> str:
+    h = hashlib.sha256()
+    for name in CODE_FILES:
+        h.update((APP_DIR / name).read_bytes())
+    return h.hexdigest()[:16]
+
+
+def task_key(spec: dict, fmt: str, width, height, scale, code: str) -> str:
+    payload = canonical_json({"builder": spec["builder"], "kwargs": spec["kwargs"], "format": fmt,
+                              "width": width, "height": height, "scale": scale, "code": code})
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# =========================
+# Render (workers)
+# =========================
+
+def _init_worker():
+    """One persistent Kaleido/Chrome per worker instead of one per figure."""
+    try:
+        import kaleido
+        if hasattr(kaleido, "start_sync_server"):  # kaleido >= 1.0
+            kaleido.start_sync_server(silence_warnings=True)
+    except Exception:  # sem servidor persistente: write_image abre um por chamada
+        pass
+
+
+def build_figure(spec: dict):
+    """Scenario spec -> go.Figure (also used by static_site.py)."""
+    fig = getattr(figures, spec["builder"])(**spec["kwargs"])
+    return fig[0] if isinstance(fig, tuple) else fig  # make_energy_chart -> (fig, delta)
+
+
+def _render_chunk(tasks: list[tuple[dict, list]]) -> list[tuple[str, str]]:
+    """[(spec, [(path, key, image options), ...])] -> [(path, key)] written; one build per figure."""
+    done = []
+    for spec, outputs in tasks:
+        fig = build_figure(spec)
+        for path, key, opts in outputs:
+            target = Path(path)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=f".{opts['format']}")
+            os.close(fd)
+            try:
+                fig.write_image(tmp, **opts)
+                os.replace(tmp, target)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+            done.append((path, key))
+    return done
+
+
+# =========================
+# Exportação
+# =========================
+
+def _load_manifest(out: Path) -> dict:
+    path = out / MANIFEST
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+
+def _save_manifest(out: Path, manifest: dict):
+    out.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=out, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, out / MANIFEST)
+
+
+def export(out: Path = EXPORT_DIR, formats=("png",), pattern: str = "", width=None, height=None,
+           workers: int | None = None, force: bool = False, progress=None) -> dict:
+    """
+    Render every scenario figure in `formats` under `out`, skipping files whose
+    inputs hash matches the manifest. Returns {"written", "skipped", "seconds"}.
+    """
+    t0 = time.perf_counter()
+    out = Path(out)
+    manifest = {} if force else _load_manifest(out)
+    code = code_fingerprint()
+
+    todo, skipped, total = [], 0, 0
+    for spec in scenarios():
+        if pattern not in spec["name"]:
+            continue
+        outputs = []
+        for fmt in formats:
+            scale = PNG_SCALE if fmt == "png" else 1
+            rel = f"{spec['name']}.{fmt}"
+            key = task_key(spec, fmt, width, height, scale, code)
+            if manifest.get(rel) == key and (out / rel).exists():
+                skipped += 1
+                continue
+            outputs.append((str(out / rel), key, {"format": fmt, "width": width, "height": height, "scale": scale}))
+        if outputs:
+            todo.append((spec, outputs))
+            total += len(outputs)
+
+    written = 0
+    if todo:
+        chunks = [todo[i:i + CHUNK_SIZE] for i in range(0, len(todo), CHUNK_SIZE)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(_render_chunk, ch) for ch in chunks]
+            for fut in as_completed(futures):
+                for path, key in fut.result():
+                    manifest[Path(path).relative_to(out).as_posix()] = key
+                    written += 1
+                if progress:
+                    progress(written, total)
+                _save_manifest(out, manifest)  # progresso sobrevive a interrupções
+
+    return {"written": written, "skipped": skipped, "seconds": time.perf_counter() - t0}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Export every plan/energy figure to static images.")
+    ap.add_argument("--out", default=str(EXPORT_DIR))
+    ap.add_argument("--format", nargs="+", default=["png"], choices=FORMATS)
+    ap.add_argument("-k", dest="pattern", default="", help="only figures whose name contains this text")
+    ap.add_argument("--width", type=int, help="image width in px (default: figure layout)")
+    ap.add_argument("--height", type=int)
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    ap.add_argument("--force", action="store_true", help="ignore the manifest and render everything")
+    args = ap.parse_args(argv)
+
+    try:
+        import kaleido  # noqa: F401
+    except ImportError:
+        raise SystemExit("Static export needs Kaleido: pip install kaleido (it also needs Chrome: plotly_get_chrome)")
+
+    def report(done, total):
+        print(f"{done}/{total}", flush=True)
+
+    res = export(Path(args.out), args.format, args.pattern, args.width, args.height,
+                 workers=args.workers, force=args.force, progress=report)
+    print(f"{res['written']} written, {res['skipped']} unchanged in {args.out} ({res['seconds']:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,525 @@
+# figures.py
+# Figuras Plotly do app (planta com cores por subzona, gráficos de energia e
+# de sensibilidade) e as escalas de cor. Funções puras: recebem os valores e
+# devolvem go.Figure — usadas pelo thesis.py e pelos benchmarks (bench/).
+import plotly.graph_objects as go
+
+import perf
+from dataset import ENERGY_TA, ENERGY_TO, FACADE_ALTS, ENERGY_FACADE_TA, ENERGY_FACADE_TO26
+from sensitivity import ranking
+
+# =========================
+# STYLE (editável)
+# =========================
+
+# -------------------------------------------------
+# 0) PLANTA (Plotly) — usado nas abas Tab3 e Tab4
+# -------------------------------------------------
+PLANT_HEIGHT = 520 # Altura total (px) do gráfico Plotly da planta (Floor Plan).
+ZONE_TITLE_SIZE = 21 # Tamanho do texto "Zone A/B/C" acima da planta.
+ZONE_VALUE_SIZE = 14 # Tamanho do texto percentual (ex.: "25.4%") abaixo da planta.
+WINDOW_TEXT_SIZE = 17 # Tamanho do texto "Window" na lateral direita (fachada envidraçada).
+WALL_LINE_WIDTH = 9 # Espessura (px) da borda externa da planta (contorno do ambiente).
+ZONE_LINE_WIDTH = 1.2 # Espessura (px) das linhas das subzonas (retângulos internos).
+WINDOW_LINE_WIDTH = 10 # Espessura (px) da linha da fachada/janela (lado direito).
+WINDOW_COLOR = "#9a9a9a" # Cor da linha e do texto "Window" (cinza mais claro que dimgray).
+ZONE_SETPOINT_SIZE = 15 # Tamanho do setpoint recomendado (controle por subzona) no centro de cada zona.
+PLAN_PLACEHOLDER_TO = "No results for Operative-temperature thermostat (To)" # Texto da planta vazia (Tab4, controle por To).
+
+# -------------------------------------------------
+# 1) LEGENDA VERTICAL (Hot/Cold) — dentro da planta (Plotly)
+# -------------------------------------------------
+LEGEND_LABEL_SIZE = 10 # Tamanho dos números da legenda (0%, 20%, ... 100%).
+LEGEND_TITLE_SIZE = 14 # Tamanho dos títulos "Cold" e "Hot" acima das barras.
+LEGEND_GAP = 0.25 # Espaço horizontal entre as duas barras verticais (Cold e Hot).
+LEGEND_BAR_W = 0.22 # Largura de cada barra vertical (Cold e Hot) em unidades do eixo Plotly.
+LEGEND_RIGHT_X = -0.62 # Posição X do limite direito do conjunto de legendas.
+
+# -------------------------------------------------
+# 2) Cores das séries extras no gráfico de energia — Tab3 e Tab4
+# -------------------------------------------------
+STUDY_COLORS = {"N": "#31a354", "E": "#636363", "S": "#756bb1", "W": "#e6550d"} # Cor de cada orientação no gráfico de energia.
+BATCH_COLOR = "#de2d26" # Cor da linha "Batch simulation" no gráfico de energia.
+
+# -------------------------------------------------
+# 3) Gráfico de sensibilidade — Tab4
+# -------------------------------------------------
+SENSITIVITY_LABELS = {"shgc": "SHGC", "wwr": "WWR", "shading": "Shading", "orientation": "Orientation",
+                      "setpoint": "Setpoint", "control": "Control (Ta/To)"} # Rótulos dos fatores no gráfico.
+SENSITIVITY_COLORS = ("#1f77b4", "#9ecae1") # (índice total / mu*, índice de 1ª ordem / sigma)
+
+
+def discomfort_value(metrics: dict, mode: str) -> float:
+    """mode: 'To' or 'PMV'"""
+    if mode == "To":
+        return max(metrics["To_gt_26"], metrics["To_lt_23"])
+    return max(metrics["PMV_gt_p05"], metrics["PMV_lt_m05"])
+
+
+def hot_color(p: float) -> str:
+    """
+    Hot scale: white -> dark red
+    White for <10%
+    """
+    if p < 10:
+        return "#ffffff"
+    palette = [
+        "#fee5d9",
+        "#fcbba1",
+        "#fc9272",
+        "#fb6a4a",
+        "#ef3b2c",
+        "#cb181d",
+        "#a50f15",
+        "#7f0000",
+        "#5a0000",
+        "#3b0000",
+    ]
+    p = max(0.0, min(100.0, p))
+    idx = int(p // 10)
+    if idx >= 10:
+        idx = 9
+    return palette[idx]
+
+
+def cold_color(p: float) -> str:
+    """
+    Cold scale: white -> dark blue
+    White for <10%
+    """
+    if p < 10:
+        return "#ffffff"
+    palette = [
+        "#deebf7",
+        "#c6dbef",
+        "#9ecae1",
+        "#6baed6",
+        "#4292c6",
+        "#2171b5",
+        "#08519c",
+        "#08306b",
+        "#062450",
+        "#041633",
+    ]
+    p = max(0.0, min(100.0, p))
+    idx = int(p // 10)
+    if idx >= 10:
+        idx = 9
+    return palette[idx]
+
+@perf.timed()
+def make_plan_figure(zone_hot: dict, zone_cold: dict, zone_labels: dict | None = None) -> go.Figure:
+    """
+    Dominant rule:
+    - if hot <10 and cold <10 -> white + show 0-10 bin (as 0.x etc)
+    - if hot >= cold -> use HOT palette, show hot value
+    - else -> use COLD palette, show cold value
+    zone_labels (optional): text drawn inside each zone (e.g. per-zone setpoint).
+    """
+    W, H = 7.5, 4.0
+    zW = 2.5
+    fig = go.Figure()
+
+    zones = [
+        ("C", 0.0, zW),
+        ("B", zW, 2*zW),
+        ("A", 2*zW, 3*zW),
+    ]
+
+    def dominant_fill(zname: str) -> str:
+        h = zone_hot[zname]
+        c = zone_cold[zname]
+        if h < 10 and c < 10:
+            return "#ffffff"
+        return hot_color(h) if h >= c else cold_color(c)
+
+    def dominant_value(zname: str) -> float:
+        h = zone_hot[zname]
+        c = zone_cold[zname]
+        # dominante (sem H/C no texto, como você pediu)
+        return h if h >= c else c
+
+    # --- zones
+    for name, x0, x1 in zones:
+        fig.add_shape(
+            type="rect",
+            x0=x0, y0=0, x1=x1, y1=H,
+            line=dict(color="black", width=ZONE_LINE_WIDTH),
+            fillcolor=dominant_fill(name),
+            layer="below"
+        )
+
+        # Zone label ABOVE the plan (always legible)
+        fig.add_annotation(
+            x=(x0 + x1) / 2, y=H + 0.22,
+            text=f"Zone {name}",
+            showarrow=False,
+            font=dict(size=ZONE_TITLE_SIZE, color="black")
+        )
+
+        # Dominant value BELOW the plan
+        fig.add_annotation(
+            x=(x0 + x1) / 2, y=-0.22,
+            text=f"{dominant_value(name):.1f}%",
+            showarrow=False,
+            font=dict(size=ZONE_VALUE_SIZE, color="black")
+        )
+
+        if zone_labels and name in zone_labels:
+            fig.add_annotation(
+                x=(x0 + x1) / 2, y=H / 2,
+                text=zone_labels[name],
+                showarrow=False,
+                bgcolor="rgba(255,255,255,0.85)",
+                bordercolor="black",
+                borderwidth=1,
+                font=dict(size=ZONE_SETPOINT_SIZE, color="black")
+            )
+
+    # separators
+    fig.add_shape(type="line", x0=zW, y0=0, x1=zW, y1=H, line=dict(color="gray", width=1, dash="dash"))
+    fig.add_shape(type="line", x0=2*zW, y0=0, x1=2*zW, y1=H, line=dict(color="gray", width=1, dash="dash"))
+
+    # thick border (editable)
+    fig.add_shape(
+        type="rect", x0=0, y0=0, x1=W, y1=H,
+        line=dict(color="black", width=WALL_LINE_WIDTH),
+        fillcolor="rgba(0,0,0,0)"
+    )
+
+    # window facade (right) — lighter gray (editable)
+    fig.add_shape(
+        type="line", x0=W, y0=0, x1=W, y1=H,
+        line=dict(color=WINDOW_COLOR, width=WINDOW_LINE_WIDTH)
+    )
+    fig.add_annotation(
+        x=W + 0.28, y=H / 2,
+        text="Window",
+        textangle=-90,
+        showarrow=False,
+        font=dict(size=WINDOW_TEXT_SIZE, color=WINDOW_COLOR)
+    )
+
+    # --- Two vertical legends on LEFT (parametrized)
+    hot_x1 = LEGEND_RIGHT_X
+    hot_x0 = hot_x1 - LEGEND_BAR_W
+
+    cold_x1 = hot_x0 - LEGEND_GAP
+    cold_x0 = cold_x1 - LEGEND_BAR_W
+
+
+    bins = list(range(0, 100, 10))  # 0..90
+    for i, b in enumerate(bins):
+        y0 = (H * i) / 10.0
+        y1 = (H * (i + 1)) / 10.0
+        mid = b + 5
+
+        fig.add_shape(
+            type="rect",
+            x0=cold_x0, y0=y0, x1=cold_x1, y1=y1,
+            line=dict(color="black", width=0.5),
+            fillcolor=cold_color(mid),
+            layer="below"
+        )
+        fig.add_shape(
+            type="rect",
+            x0=hot_x0, y0=y0, x1=hot_x1, y1=y1,
+            line=dict(color="black", width=0.5),
+            fillcolor=hot_color(mid),
+            layer="below"
+        )
+
+        if b % 20 == 0:
+            fig.add_annotation(
+                x=cold_x0 - 0.08, y=y0,
+                text=f"{b}%",
+                showarrow=False,
+                xanchor="right",
+                font=dict(size=LEGEND_LABEL_SIZE, color="black")
+            )
+
+    fig.add_annotation(
+        x=cold_x0 - 0.08, y=H,
+        text="100%",
+        showarrow=False,
+        xanchor="right",
+        font=dict(size=LEGEND_LABEL_SIZE)
+    )
+
+    fig.add_annotation(x=(cold_x0+cold_x1)/2, y=H+0.15, text="Cold", showarrow=False, font=dict(size=LEGEND_TITLE_SIZE))
+    fig.add_annotation(x=(hot_x0+hot_x1)/2, y=H+0.15, text="Hot",  showarrow=False, font=dict(size=LEGEND_TITLE_SIZE))
+
+    # Required textual legend under the bars (two lines)
+    fig.add_annotation(
+        x=(cold_x0 + hot_x1)/2, y=-0.50,
+        text="Cold: To < 23°C / PMV < −0.5",
+        showarrow=False,
+        font=dict(size=10, color="black"),
+        xanchor="center"
+    )
+    fig.add_annotation(
+        x=(cold_x0 + hot_x1)/2, y=-0.72,
+        text="Hot: To > 26°C / PMV > +0.5",
+        showarrow=False,
+        font=dict(size=10, color="black"),
+        xanchor="center"
+    )
+
+    # North arrow moved to TOP-RIGHT (as you requested)
+    fig.add_annotation(x=W+0.55, y=H-0.08, text="↑", showarrow=False, font=dict(size=26, color="black"))
+    fig.add_annotation(x=W+0.55, y=H-0.35, text="N", showarrow=False, font=dict(size=12, color="black"))
+
+    # enlarge ranges to fit labels above/below
+    fig.update_xaxes(visible=False, range=[-1.35, W + 0.95])
+    fig.update_yaxes(visible=False, range=[-0.95, H + 0.45], scaleanchor="x", scaleratio=1)
+
+    fig.update_layout(
+        margin=dict(l=0, r=0, t=0, b=0),
+        height=PLANT_HEIGHT,
+    )
+    return fig
+
+@perf.timed()
+def make_energy_chart(active_kind: str, active_sp: int, ref_sp: int | None,
+                      overlay: dict | None = None) -> tuple[go.Figure, float | None]:
+    """
+    overlay (optional): {series_name: {setpoint: kWh/m²·year}} drawn as lines
+    over the bars (e.g. reduced-model orientation study, streamed while it runs).
+    """
+    fig = go.Figure()
+
+    # 1) Eixo X comum (19..27) como categorias (centraliza os ticks)
+    x_all = list(range(19, 28))
+    x_labels = [str(i) for i in x_all]
+
+    # 2) Séries alinhadas no mesmo eixo (None onde não existe dado)
+    ta_y = [ENERGY_TA.get(x, None) for x in x_all]  # Ta só tem 19..24
+    to_y = [ENERGY_TO.get(x, None) for x in x_all]  # To só tem 22..27
+
+    # 3) Cores (destaca o setpoint ativo em vermelho, e "some" onde não há dado)
+    ta_base = "#1f77b4"   # azul escuro
+    to_base = "#9ecae1"   # azul claro
+    active_red = "#de2d26"
+
+    ta_colors = []
+    for x in x_all:
+        if x not in ENERGY_TA:
+            ta_colors.append("rgba(0,0,0,0)")  # sem barra
+        elif active_kind == "Ta" and x == active_sp:
+            ta_colors.append(active_red)
+        else:
+            ta_colors.append(ta_base)
+
+    to_colors = []
+    for x in x_all:
+        if x not in ENERGY_TO:
+            to_colors.append("rgba(0,0,0,0)")  # sem barra
+        elif active_kind == "To" and x == active_sp:
+            to_colors.append(active_red)
+        else:
+            to_colors.append(to_base)
+
+    # garante que o quadradinho da legenda não “herde” transparente
+    to_colors[0] = to_base
+    ta_colors[0] = ta_base  # opcional (segurança)
+
+    # 4) Barras (mesmo X para as duas séries)
+    fig.add_bar(
+        x=x_labels,
+        y=ta_y,
+        name="Ta",
+        marker=dict(color=ta_colors, line=dict(width=0)),
+    )
+
+    fig.add_bar(
+        x=x_labels,
+        y=to_y,
+        name="To",
+        marker=dict(color=to_colors, line=dict(width=0)),
+    )
+
+    for name, series in (overlay or {}).items():
+        xs = [x for x in x_all if x in series]
+        fig.add_scatter(
+            x=[str(x) for x in xs],
+            y=[series[x] for x in xs],
+            name=name,
+            mode="lines+markers",
+            line=dict(color=STUDY_COLORS.get(name.split()[-1], BATCH_COLOR), width=1.5, dash="dot"),
+            marker=dict(size=5),
+        )
+
+    # 5) Delta vs referência (como antes)
+    delta = None
+    if ref_sp is not None:
+        if active_kind == "Ta" and (active_sp in ENERGY_TA and ref_sp in ENERGY_TA):
+            Ea, Er = ENERGY_TA[active_sp], ENERGY_TA[ref_sp]
+            delta = (Ea - Er) / Er * 100.0
+        elif active_kind == "To" and (active_sp in ENERGY_TO and ref_sp in ENERGY_TO):
+            Ea, Er = ENERGY_TO[active_sp], ENERGY_TO[ref_sp]
+            delta = (Ea - Er) / Er * 100.0
+
+    # 6) Layout (x categórico -> ticks alinhados com as barras)
+    fig.update_layout(
+        barmode="group",
+        height=230,
+        margin=dict(l=10, r=10, t=10, b=10),
+        yaxis_title="kWh/m²·year",
+        xaxis=dict(
+            title="Temperature (°C)",
+            type="category",
+            categoryorder="array",
+            categoryarray=x_labels,  # garante ordem 19..27
+        ),
+        legend=dict(
+            orientation="h",
+            x=0.5, xanchor="center",
+            y=1.05, yanchor="bottom"
+        ),
+    )
+
+    return fig, delta
+
+
+@perf.timed()
+def make_energy_chart_facade(control_kind: str, ta_setpoint: int, active_alt_id: str,
+                             overlay: dict | None = None) -> go.Figure:
+    """
+    control_kind:
+      - "Ta" -> uses ENERGY_FACADE_TA[ta_setpoint]
+      - "To" -> uses ENERGY_FACADE_TO26 (fixed)
+    overlay (optional): {series_name: {alt_id: kWh/m²·year}} drawn as markers.
+    """
+    fig = go.Figure()
+
+    alt_ids = [a["id"] for a in FACADE_ALTS]
+    x_labels = [a["label"].replace("\n", "<br>") for a in FACADE_ALTS]  # multiline x tick
+
+    # series values
+    if control_kind == "Ta":
+        y = [ENERGY_FACADE_TA[ta_setpoint].get(i, None) for i in alt_ids]
+        name = f"Ta ({ta_setpoint}°C)"
+    else:
+        y = [ENERGY_FACADE_TO26.get(i, None) for i in alt_ids]
+        name = "To (26°C)"
+
+    base_gray = "#c7c7c7"
+    active_red = "#de2d26"
+
+    colors = []
+    for alt_id, v in zip(alt_ids, y):
+        if v is None:
+            colors.append("rgba(0,0,0,0)")
+        elif alt_id == active_alt_id:
+            colors.append(active_red)
+        else:
+            colors.append(base_gray)
+
+    fig.add_bar(
+        x=x_labels,
+        y=y,
+        name=name,
+        marker=dict(color=colors, line=dict(width=0)),
+    )
+
+    for sname, series in (overlay or {}).items():
+        fig.add_scatter(
+            x=[lab for i, lab in zip(alt_ids, x_labels) if i in series],
+            y=[series[i] for i in alt_ids if i in series],
+            name=sname,
+            mode="markers",
+            marker=dict(color=STUDY_COLORS.get(sname.split()[-1], "#333"), size=8, symbol="diamond"),
+        )
+
+    fig.update_layout(
+        height=260,
+        margin=dict(l=10, r=10, t=10, b=10),
+        yaxis_title="kWh/m²·year",
+        xaxis_title="Facade Designs",
+        xaxis=dict(type="category"),
+        legend=dict(orientation="h", x=0.5, xanchor="center", y=1.05, yanchor="bottom"),
+    )
+
+    return fig
+
+@perf.timed()
+def make_sensitivity_chart(result: dict, output: str) -> go.Figure:
+    """
+    Ranked horizontal bars for one output ('energy' or a zone), most important
+    factor on top. Sobol: total + first-order indices; Morris: mu* + sigma.
+    Error bars are the bootstrap intervals.
+    """
+    rows = ranking(result, output)[::-1]
+    labels = [SENSITIVITY_LABELS.get(r["factor"], r["factor"]) for r in rows]
+    main, second = ("ST", "S1") if result["method"] == "sobol" else ("mu_star", "sigma")
+    names = {"ST": "Total (ST)", "S1": "First order (S1)", "mu_star": "μ*", "sigma": "σ"}
+
+    def err(key):
+        ci = "ci" if key == main else f"{key}_ci"
+        if ci not in rows[0]:
+            return None
+        return dict(type="data", symmetric=False,
+                    array=[r[ci][1] - r[key] for r in rows],
+                    arrayminus=[r[key] - r[ci][0] for r in rows],
+                    thickness=1, width=3)
+
+    fig = go.Figure()
+    for key, color in zip((main, second), SENSITIVITY_COLORS):
+        fig.add_bar(y=labels, x=[r[key] for r in rows], name=names[key], orientation="h",
+                    marker=dict(color=color, line=dict(width=0)), error_x=err(key))
+
+    fig.update_layout(
+        barmode="group",
+        height=260,
+        margin=dict(l=10, r=10, t=10, b=10),
+        xaxis_title="Sensitivity index" if result["method"] == "sobol" else "Elementary effect (per full range)",
+        legend=dict(orientation="h", x=0.5, xanchor="center", y=1.05, yanchor="bottom"),
+    )
+    return fig
+
+@perf.timed()
+def make_plan_placeholder(message: str) -> go.Figure:
+    """
+    Placeholder plotly figure to replace the plan when no results exist
+    (e.g., Operative-temperature thermostat mode in Tab 4).
+    """
+    W, H = 7.5, 4.0
+    fig = go.Figure()
+
+    # Base white rectangle (plan area)
+    fig.add_shape(
+        type="rect",
+        x0=0, y0=0, x1=W, y1=H,
+        line=dict(color="black", width=WALL_LINE_WIDTH),
+        fillcolor="#ffffff",
+        layer="below"
+    )
+
+    # Translucent overlay mask (to "hide" the plan)
+    fig.add_shape(
+        type="rect",
+        x0=-1.35, y0=-0.95, x1=W + 0.95, y1=H + 0.45,
+        line=dict(color="rgba(0,0,0,0)", width=0),
+        fillcolor="rgba(255,255,255,0.75)",
+        layer="above"
+    )
+
+    # Center message
+    fig.add_annotation(
+        x=W/2, y=H/2,
+        text=message,
+        showarrow=False,
+        font=dict(size=18, color="#444"),
+        xanchor="center",
+        yanchor="middle"
+    )
+
+    # Keep same viewbox as your normal plan
+    fig.update_xaxes(visible=False, range=[-1.35, W + 0.95])
+    fig.update_yaxes(visible=False, range=[-0.95, H + 0.45], scaleanchor="x", scaleratio=1)
+
+    fig.update_layout(
+        margin=dict(l=0, r=0, t=0, b=0),
+        height=PLANT_HEIGHT,
+    )
+    return fig
@@ -0,0 +1,215 @@
+# jobs.py
+# Fila de tarefas em background (local, sem serviços externos).
+#
+# - pool limitado de threads (não bloqueia a thread do script do Streamlit)
+# - cada tarefa tem um id, progresso, resultados parciais e cancelamento
+# - tarefas idênticas (mesma `key`) em andamento são COMPARTILHADAS entre
+#   sessões: o segundo usuário recebe o mesmo Job em vez de duplicar o trabalho
+# - quem acompanha uma tarefa se registra (watch); "Cancel" de uma sessão só
+#   para a tarefa quando nenhuma outra sessão a acompanhou nos últimos WATCH_TTL_S
+# - tarefas com arquivo de saída (output=) são refeitas se o arquivo sumir
+# - tarefas que falharam continuam na chave (sem refazer a cada rerun) até
+#   alguém pedir retry(key); as canceladas saem da chave
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+MAX_WORKERS = 2      # tarefas pesadas simultâneas por processo
+MAX_FINISHED = 64    # tarefas concluídas mantidas para reaproveitamento
+WATCH_TTL_S = 10.0   # sessão sem sinal há mais que isso não segura mais a tarefa
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    """
+    Handle shared by the worker and every session watching it.
+    The worker calls report()/check_cancelled(); readers call partial().
+    """
+
+    def __init__(self, job_id: str, key: str, label: str = "", output=None):
+        self.id = job_id
+        self.key = key
+        self.label = label
+        self.output = output   # arquivo produzido (Path) — se sumir, a tarefa é refeita
+        self.status = QUEUED
+        self.done = 0
+        self.total = 0
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.finished = None
+        self._partial = []
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._future = None
+        self._watchers = {}    # sessão -> último sinal (time.monotonic)
+
+    # ---- lado do worker
+    def report(self, done: int, total: int, item=None):
+        with self._lock:
+            self.done, self.total = done, total
+            if item is not None:
+                self._partial.append(item)
+
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+
+    # ---- lado do leitor
+    @property
+    def active(self) -> bool:
+        return self.status in (QUEUED, RUNNING)
+
+    @property
+    def fraction(self) -> float:
+        return self.done / self.total if self.total else 0.0
+
+    def watch(self, watcher: str):
+        """Mark `watcher` (a session id) as following this job."""
+        with self._lock:
+            self._watchers[watcher] = time.monotonic()
+
+    def watchers(self) -> int:
+        """Sessions that signalled interest in the last WATCH_TTL_S seconds."""
+        now = time.monotonic()
+        with self._lock:
+            return sum(now - t <= WATCH_TTL_S for t in self._watchers.values())
+
+    def stale(self) -> bool:
+        """Finished OK but its output file is gone."""
+        return self.status == DONE and self.output is not None and not os.path.exists(self.output)
+
+    def partial(self) -> list:
+        """Copy of the partial results streamed so far."""
+        with self._lock:
+            return list(self._partial)
+
+    def cancel(self):
+        self._cancel.set()
+        if self._future is not None and self._future.cancel():
+            self.status = CANCELLED
+            self.finished = time.time()
+
+
+class JobQueue:
+    def __init__(self, max_workers: int = MAX_WORKERS, max_finished: int = MAX_FINISHED):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thesis-job")
+        self._lock = threading.Lock()
+        self._jobs = {}        # id -> Job
+        self._by_key = {}      # key -> Job (em andamento, concluído ou com falha)
+        self._ids = itertools.count(1)
+        self.max_finished = max_finished
+
+    def submit(self, key: str, fn, *args, label: str = "", output=None, **kwargs) -> Job:
+        """
+        Run fn(job, *args, **kwargs) in the background.
+        If a job with the same key is in flight, failed (see retry) or
+        finished OK with its `output` file still on disk, return it instead.
+        """
+        with self._lock:
+            job = self._by_key.get(key)
+            if job is not None and job.status != CANCELLED and not job.stale():
+                return job
+
+            job = Job(f"job-{next(self._ids)}", key, label, output)
+            self._jobs[job.id] = job
+            self._by_key[key] = job
+            job._future = self._pool.submit(self._run, job, fn, args, kwargs)
+            self._evict()
+            return job
+
+    def _run(self, job: Job, fn, args, kwargs):
+        if job.cancelled():
+            job.status = CANCELLED
+            job.finished = time.time()
+            return
+        job.status = RUNNING
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.status = CANCELLED if job.cancelled() else DONE
+        except JobCancelled:
+            job.status = CANCELLED
+        except Exception as e:  # noqa: BLE001 — erro fica no Job para a UI mostrar
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = FAILED
+        finally:
+            job.finished = time.time()
+            if job.status == CANCELLED:
+                with self._lock:
+                    if self._by_key.get(job.key) is job:
+                        del self._by_key[job.key]
+
+    def _evict(self):
+        finished = [j for j in self._jobs.values() if not j.active]
+        finished.sort(key=lambda j: j.finished or 0)
+        for j in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[j.id]
+            if self._by_key.get(j.key) is j:
+                del self._by_key[j.key]
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def find(self, key: str) -> Job | None:
+        job = self._by_key.get(key)
+        return None if job is None or job.stale() else job
+
+    def retry(self, key: str) -> bool:
+        """Forget a FAILED job under `key`, so the next submit() runs it again. True if there was one."""
+        with self._lock:
+            job = self._by_key.get(key)
+            if job is None or job.status != FAILED:
+                return False
+            del self._by_key[key]
+            return True
+
+    def cancel(self, job_id: str, watcher: str | None = None) -> bool:
+        """
+        Cancel a job. With `watcher`, only that session detaches: the job stops
+        only if no other session watched it recently. True if it was cancelled.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        if watcher is not None:
+            with job._lock:
+                job._watchers.pop(watcher, None)
+            if job.watchers():
+                return False
+        job.cancel()
+        with self._lock:
+            if self._by_key.get(job.key) is job:
+                del self._by_key[job.key]
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return {
+            "queued": sum(j.status == QUEUED for j in jobs),
+            "running": sum(j.status == RUNNING for j in jobs),
+            "finished": sum(not j.active for j in jobs),
+        }
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue() -> JobQueue:
+    """Process-wide queue shared by all sessions."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
@@ -0,0 +1,276 @@
+# metrics.py
+# Métricas do processo no formato texto do Prometheus, numa porta lateral.
+#
+#   THESIS_METRICS_PORT=9108 streamlit run app/thesis.py
+#   curl -s localhost:9108/metrics
+#
+# Só local (127.0.0.1): o endpoint expõe dados de sessões e do processo.
+# Para um Prometheus em outra máquina, THESIS_METRICS_ADDRESS=0.0.0.0.
+#
+# Reruns: um gancho leve no início/fim do script (rerun_start/rerun_end,
+# sem os spans do perf.py) mede a duração e atribui cada rerun à aba do
+# widget que o disparou: o widget cujo valor mudou desde o fim do rerun
+# anterior da sessão, mapeado para a aba pelo nome da chave (TAB_KEYS).
+# Caches: os lru_cache do processo (CACHES), com hits/misses/evictions de
+# cache_info(), e o cache em disco compartilhado entre workers (shared.py).
+# Também sessões ativas, fila de tarefas (jobs.py) e memória/CPU do processo.
+# Só a biblioteca padrão; nada externo.
+import bisect
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PORT_ENV = "THESIS_METRICS_PORT"    # porta do endpoint (sem a variável: desligado)
+ADDRESS_ENV = "THESIS_METRICS_ADDRESS"   # interface de escuta (opcional, para abrir na rede)
+ADDRESS = "127.0.0.1"               # só local, como api.py
+PREFIX = "thesis"
+BUCKETS_S = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)   # histograma de duração
+ACTIVE_WINDOW_S = 300               # sessão "ativa" = rerun nos últimos N s (sem runtime)
+
+# trecho da chave do widget -> aba (a primeira regra que casa); sem widget
+# alterado: "load" (primeiro rerun da sessão) ou "none" (st.rerun, reconexão)
+TAB_KEYS = (
+    ("tz_", "tab2 zoning"),
+    ("tab3", "tab3 control"),
+    ("tab4", "tab4 facade"),
+    ("dot_", "tab4 facade"),
+    ("dl_", "download"),
+    ("perf_scope", "debug"),
+    ("debug_", "debug"),
+)
+SNAPSHOT_KEY = "_metrics_widgets"   # valores dos widgets no fim do rerun anterior (session_state)
+
+# nome -> (módulo, função com lru_cache); só entram os módulos já carregados
+CACHES = {
+    "asset": ("content", "_b64_cached"),
+    "weather": ("epw", "_load_cached"),
+    "irradiance": ("solar", "_irradiance_cached"),
+    "view_factors": ("radiant", "_cached_factors"),
+}
+
+_START = time.time()
+_lock = threading.Lock()
+_server = None              # ThreadingHTTPServer, ou False se a porta estava ocupada
+
+
+def enabled() -> bool:
+    return bool(os.environ.get(PORT_ENV))
+
+
+class Histogram:
+    """Cumulative-bucket histogram (seconds)."""
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_S) + 1)   # último = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKETS_S, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def lines(self, name: str, labels: str = "") -> list[str]:
+        sep = "," if labels else ""
+        out, acc = [], 0
+        for le, n in zip((*BUCKETS_S, "+Inf"), self.counts):
+            acc += n
+            out.append(f'{name}_bucket{{{labels}{sep}le="{le}"}} {acc}')
+        braces = f"{{{labels}}}" if labels else ""
+        out += [f"{name}_sum{braces} {self.sum:.6f}", f"{name}_count{braces} {self.count}"]
+        return out
+
+
+_reruns = {}                # aba que disparou -> Histogram
+_sessions = {}              # id -> último rerun (time.time)
+
+
+def tab_of(key) -> str | None:
+    if isinstance(key, str):
+        for part, tab in TAB_KEYS:
+            if part in key:
+                return tab
+    return None
+
+
+def widget_values(state) -> dict:
+    return {k: repr(v) for k, v in state.items() if tab_of(k)}
+
+
+def trigger(state) -> str:
+    """
+    Tab whose widget triggered this rerun: diff of the widget values in
+    `state` (st.session_state) against the end of the session's previous
+    rerun. A button is True only in the rerun it triggered, so changes to a
+    non-False value win over True -> False ones (a button resetting).
+    """
+    before = state.get(SNAPSHOT_KEY)
+    if before is None:
+        return "load"
+    now = widget_values(state)
+    changed = [k for k in now if k in before and now[k] != before[k]]
+    if not changed:
+        return "none"
+    pressed = [k for k in changed if now[k] != "False"]
+    return tab_of((pressed or changed)[0])
+
+
+def rerun_start(state, session_id: str):
+    """Script start: token for rerun_end(), or None when metrics are off."""
+    if not enabled():
+        return None
+    return time.perf_counter(), session_id, trigger(state), state
+
+
+def rerun_end(token):
+    """Script end: one rerun for the token's tab (with its duration); remembers the widget values."""
+    if token is None:
+        return
+    t0, session_id, tab, state = token
+    with _lock:
+        _reruns.setdefault(tab, Histogram()).observe(time.perf_counter() - t0)
+        _sessions[session_id] = time.time()
+    state[SNAPSHOT_KEY] = widget_values(state)
+
+
+# =========================
+# Coletores
+# =========================
+
+def _active_sessions() -> int:
+    try:
+        from streamlit import runtime
+        return runtime.get_instance()._session_mgr.num_active_sessions()
+    except Exception:  # fora do servidor (AppTest) ou API interna mudou
+        now = time.time()
+        with _lock:
+            return sum(now - t < ACTIVE_WINDOW_S for t in _sessions.values())
+
+
+def _memory_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, AttributeError):  # sem /proc: pico (ru_maxrss, bytes no macOS)
+        try:
+            import resource
+        except ImportError:  # Windows
+            return 0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _cache_lines() -> list[str]:
+    rows = []
+    for name, (module, attr) in CACHES.items():
+        fn = getattr(sys.modules.get(module), attr, None)
+        if fn is None or not hasattr(fn, "cache_info"):
+            continue
+        info = fn.cache_info()
+        evictions = max(0, info.misses - info.currsize) if info.maxsize is not None else 0
+        rows.append((name, info.hits, info.misses, evictions, info.currsize))
+    out = []
+    for metric, idx, kind, text in (("cache_hits_total", 1, "counter", "Cache hits"),
+                                    ("cache_misses_total", 2, "counter", "Cache misses"),
+                                    ("cache_evictions_total", 3, "counter", "Entries evicted (LRU)"),
+                                    ("cache_entries", 4, "gauge", "Entries currently cached")):
+        out += [f"# HELP {PREFIX}_{metric} {text}.", f"# TYPE {PREFIX}_{metric} {kind}"]
+        out += [f'{PREFIX}_{metric}{{cache="{row[0]}"}} {row[idx]}' for row in rows]
+    return out
+
+
+def _shared_lines() -> list[str]:
+    shared = sys.modules.get("shared")
+    if shared is None:
+        return []
+    stats, (files, size) = shared.stats(), shared.usage()
+    out = [f"# HELP {PREFIX}_shared_cache_requests_total Shared disk cache lookups by this process.",
+           f"# TYPE {PREFIX}_shared_cache_requests_total counter",
+           f'{PREFIX}_shared_cache_requests_total{{result="hit"}} {stats["hits"]}',
+           f'{PREFIX}_shared_cache_requests_total{{result="miss"}} {stats["misses"]}']
+    for metric, kind, text, value in (
+            ("shared_cache_writes_total", "counter", "Files written to the shared cache by this process", stats["writes"]),
+            ("shared_cache_evictions_total", "counter", "Files evicted from the shared cache by this process", stats["evicted"]),
+            ("shared_cache_files", "gauge", "Files in the shared cache (all workers)", files),
+            ("shared_cache_bytes", "gauge", "Size of the shared cache (all workers)", size)):
+        out += [f"# HELP {PREFIX}_{metric} {text}.", f"# TYPE {PREFIX}_{metric} {kind}", f"{PREFIX}_{metric} {value}"]
+    return out
+
+
+def _job_lines() -> list[str]:
+    jobs = sys.modules.get("jobs")
+    stats = jobs.get_queue().stats() if jobs is not None else {}
+    out = [f"# HELP {PREFIX}_jobs Background jobs by state.", f"# TYPE {PREFIX}_jobs gauge"]
+    out += [f'{PREFIX}_jobs{{state="{state}"}} {n}' for state, n in stats.items()]
+    return out
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format (0.0.4)."""
+    with _lock:
+        hists = sorted(_reruns.items())
+        reruns = [line for tab, h in hists for line in h.lines(f"{PREFIX}_rerun_duration_seconds", f'tab="{tab}"')]
+        counts = [f'{PREFIX}_reruns_total{{tab="{tab}"}} {h.count}' for tab, h in hists]
+    cpu = os.times()
+    out = [
+        f"# HELP {PREFIX}_reruns_total Full script reruns by the tab whose widget triggered them.",
+        f"# TYPE {PREFIX}_reruns_total counter", *counts,
+        f"# HELP {PREFIX}_rerun_duration_seconds Full script rerun duration, by triggering tab.",
+        f"# TYPE {PREFIX}_rerun_duration_seconds histogram", *reruns,
+        *_cache_lines(),
+        *_shared_lines(),
+        f"# HELP {PREFIX}_active_sessions Connected sessions.",
+        f"# TYPE {PREFIX}_active_sessions gauge",
+        f"{PREFIX}_active_sessions {_active_sessions()}",
+        *_job_lines(),
+        "# HELP process_resident_memory_bytes Resident memory size in bytes.",
+        "# TYPE process_resident_memory_bytes gauge",
+        f"process_resident_memory_bytes {_memory_bytes()}",
+        "# HELP process_cpu_seconds_total User and system CPU time in seconds.",
+        "# TYPE process_cpu_seconds_total counter",
+        f"process_cpu_seconds_total {cpu.user + cpu.system:.3f}",
+        "# HELP process_start_time_seconds Start time of the process (unix seconds).",
+        "# TYPE process_start_time_seconds gauge",
+        f"process_start_time_seconds {_START:.3f}",
+    ]
+    return "\n".join(out) + "\n"
+
+
+# =========================
+# Servidor HTTP (thread daemon, uma vez por processo)
+# =========================
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port: int | None = None):
+    """Start the metrics endpoint once per process (no-op if already running or not configured)."""
+    global _server
+    port = port or int(os.environ.get(PORT_ENV) or 0)
+    if not port:
+        return None
+    with _lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((os.environ.get(ADDRESS_ENV) or ADDRESS, port), _Handler)
+            except OSError:  # porta ocupada (ex.: outro processo do app): não tenta de novo
+                _server = False
+                return None
+            threading.Thread(target=_server.serve_forever, name="thesis-metrics", daemon=True).start()
+        return _server or None
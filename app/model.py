@@ -0,0 +1,218 @@
+# model.py
+# Modelo reduzido (surrogate) calibrado nas tabelas da tese (dataset.py).
+#
+# Não substitui o EnergyPlus: interpola as curvas de conforto/energia por
+# setpoint (Zone Model 3, subzonas A/B/C) e desloca essas curvas pela
+# exposição solar relativa da fachada (SHGC x WWR x sombreamento x orientação),
+# com coeficientes ajustados por mínimos quadrados nas alternativas da Tab 4.
+import functools
+
+import numpy as np
+
+from dataset import (
+    COMFORT_TA, COMFORT_TO, ENERGY_TA, ENERGY_TO,
+    FACADE_ALTS, COMFORT_FACADE_TA, ENERGY_FACADE_TA, ENERGY_FACADE_TO26,
+)
+
+MODEL_VERSION = "reduced-2"
+
+ZONES = ("A", "B", "C")
+METRICS = ("To_gt_26", "To_lt_23", "PMV_gt_p05", "PMV_lt_m05")
+HOT_METRICS = ("To_gt_26", "PMV_gt_p05")
+
+# Caso base (BC): SHGC .29, WWR 100%, sem sombreamento, fachada Leste
+BC_SHGC = 0.29
+BC_WWR = 1.0
+BC_ORIENTATION = 90.0  # graus a partir do Norte (90 = Leste)
+
+# Fração do ganho solar que passa pelo sombreamento externo "100%".
+# ALT5 (sombreada) tem energia ~ ALT4 (WWR 50%) na Tab 4 -> ~0.5.
+SHADING_TRANSMITTANCE = 0.5
+
+# Fração da carga de resfriamento de cada subzona (Zone Model 3) quando as
+# subzonas têm controle independente. A perimetral (A) recebe a maior parte
+# do ganho solar da fachada. Soma = 1 -> setpoint único reproduz ENERGY_TA/TO.
+# ATENÇÃO: divisão ASSUMIDA, não calibrada (as tabelas da tese só têm a
+# energia da sala inteira). A recomendação da Tab 3 e o "% vs Ta 23°C" com
+# setpoints diferentes por subzona dependem dela — a UI avisa (ZONE_SPLIT_NOTE).
+ZONE_LOAD_SHARE = {"A": 0.50, "B": 0.28, "C": 0.22}
+ZONE_SPLIT_NOTE = (
+    "Energy with per-zone setpoints rests on an assumed split of the cooling load between subzones ("
+    + " / ".join(f"{z} {v:.0%}" for z, v in ZONE_LOAD_SHARE.items())
+    + "), not calibrated on the thesis tables."
+)
+
+# Irradiação anual relativa à fachada Leste, interpolada em azimute.
+# ATENÇÃO: valores ASSUMIDOS para Fortaleza (lat. ~3.8° S), sem fonte nem
+# cálculo. Com um clima (EPW) em assets/weather, o estudo de orientação usa
+# os fatores calculados dele (solar.orientation_factors, passados como
+# `factors`); sem EPW, usa esta tabela e a UI avisa (ORIENTATION_NOTE).
+ORIENTATION_FACTOR = {0: 0.78, 45: 0.90, 90: 1.00, 135: 0.88, 180: 0.74, 225: 0.90, 270: 1.00, 315: 0.90, 360: 0.78}
+ORIENTATION_NOTE = (
+    "Orientation effects use assumed facade irradiation factors relative to East ("
+    + ", ".join(f"{n} {ORIENTATION_FACTOR[a]:.2f}" for n, a in (("N", 0), ("E", 90), ("S", 180), ("W", 270)))
+    + "), not computed from a weather file."
+)
+
+
+def parse_fraction(value) -> float:
+    """'.29' -> 0.29 | '100%' -> 1.0 | 'No' -> 0.0 | 0.5 -> 0.5"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    s = str(value).strip()
+    if s.lower() in ("no", "none", ""):
+        return 0.0
+    if s.endswith("%"):
+        return float(s[:-1]) / 100.0
+    return float(s)
+
+
+def facade_params(alt: dict) -> dict:
+    """FACADE_ALTS entry -> numeric model inputs."""
+    m = alt["meta"]
+    return {
+        "shgc": parse_fraction(m["SHGC"]),
+        "wwr": parse_fraction(m["WWR"]),
+        "shading": parse_fraction(m["Shading"]),
+    }
+
+
+def orientation_factor(azimuth_deg, factors: dict | None = None):
+    """Facade irradiation relative to East; `factors` like ORIENTATION_FACTOR (default: the assumed table)."""
+    factors = factors or ORIENTATION_FACTOR
+    az = np.mod(np.asarray(azimuth_deg, dtype=float), 360.0)
+    keys = np.array(sorted(factors))
+    vals = np.array([factors[k] for k in keys])
+    return np.interp(az, keys, vals)
+
+
+def solar_exposure(shgc, wwr, shading, orientation=BC_ORIENTATION, factors: dict | None = None):
+    """Solar gain through the facade relative to the base case (BC = 1.0)."""
+    shgc = np.asarray(shgc, dtype=float)
+    wwr = np.asarray(wwr, dtype=float)
+    shading = np.asarray(shading, dtype=float)
+    g = shgc * wwr * (1.0 - shading * (1.0 - SHADING_TRANSMITTANCE))
+    return (g / (BC_SHGC * BC_WWR) * orientation_factor(orientation, factors)
+            / orientation_factor(BC_ORIENTATION, factors))
+
+
+# =========================
+# Curvas por setpoint
+# =========================
+
+def _curve(table: dict) -> tuple[np.ndarray, dict]:
+    """COMFORT_xx[zone][sp][metric] -> (setpoints, {(zone, metric): values})"""
+    sps = np.array(sorted(table[ZONES[0]]), dtype=float)
+    vals = {(z, m): np.array([table[z][int(sp)][m] for sp in sps]) for z in ZONES for m in METRICS}
+    return sps, vals
+
+
+@functools.lru_cache(maxsize=None)
+def _curves():
+    return {"Ta": _curve(COMFORT_TA), "To": _curve(COMFORT_TO)}
+
+
+def _energy_curve(kind: str) -> tuple[np.ndarray, np.ndarray]:
+    table = ENERGY_TA if kind == "Ta" else ENERGY_TO
+    sps = np.array(sorted(table), dtype=float)
+    return sps, np.array([table[int(s)] for s in sps], dtype=float)
+
+
+def energy_curve(kind: str, setpoint) -> np.ndarray:
+    """Room cooling energy vs setpoint (ENERGY_TA/TO), linearly extrapolated outside the table."""
+    e_sps, e_vals = _energy_curve(kind)
+    sp = np.asarray(setpoint, dtype=float)
+    energy = np.interp(sp, e_sps, e_vals)
+    # extrapolação linear fora da faixa tabelada (a curva é quase linear)
+    slope = (e_vals[-1] - e_vals[0]) / (e_sps[-1] - e_sps[0])
+    energy = np.where(sp < e_sps[0], e_vals[0] + slope * (sp - e_sps[0]), energy)
+    return np.where(sp > e_sps[-1], e_vals[-1] + slope * (sp - e_sps[-1]), energy)
+
+
+# =========================
+# Calibração (uma vez por processo)
+# =========================
+
+@functools.lru_cache(maxsize=None)
+def calibration() -> dict:
+    """
+    beta[zone]: setpoint shift (°C) per unit of relative exposure above BC,
+                fitted on COMFORT_FACADE_TA hot metrics (grid search, SSE).
+    gamma[kind]: relative energy change per unit of relative exposure,
+                 fitted on ENERGY_FACADE_TA / ENERGY_FACADE_TO26 (closed form).
+    """
+    sps, vals = _curves()["Ta"]
+    betas = np.linspace(0.0, 8.0, 161)
+
+    beta = {}
+    for z in ZONES:
+        sse = np.zeros_like(betas)
+        for sp, by_zone in COMFORT_FACADE_TA.items():
+            for alt in FACADE_ALTS:
+                g = float(solar_exposure(**facade_params(alt)))
+                sp_eff = sp + betas * (g - 1.0)
+                for m in HOT_METRICS:
+                    pred = np.interp(sp_eff, sps, vals[(z, m)])
+                    sse += (pred - by_zone[z][alt["id"]][m]) ** 2
+        beta[z] = float(betas[np.argmin(sse)])
+
+    gamma = {}
+    for kind, table, ref in (("Ta", ENERGY_FACADE_TA[21], "ALT2"), ("To", ENERGY_FACADE_TO26, "ALT2")):
+        x, y = [], []
+        for alt in FACADE_ALTS:
+            v = table.get(alt["id"])
+            if v is None:
+                continue
+            x.append(float(solar_exposure(**facade_params(alt))) - 1.0)
+            y.append(v / table[ref] - 1.0)
+        x, y = np.array(x), np.array(y)
+        gamma[kind] = float((x @ y) / (x @ x)) if (x @ x) > 0 else 0.0
+
+    return {"beta": beta, "gamma": gamma}
+
+
+# =========================
+# Avaliação
+# =========================
+
+def evaluate(control: str, setpoint, shgc=BC_SHGC, wwr=BC_WWR, shading=0.0, orientation=BC_ORIENTATION,
+             factors: dict | None = None) -> dict:
+    """
+    Reduced-model estimate for one case (or broadcast arrays of cases).
+
+    control: 'Ta' or 'To'; setpoint: °C (scalar, array, or {zone: sp} for
+    independent subzone control); factors: orientation factors from a
+    weather file (default: ORIENTATION_FACTOR). Returns a record shaped like the app data:
+      {"comfort": {zone: {metric: %}}, "energy": kWh/m²·year, "exposure": g}
+    """
+    sps, vals = _curves()[control]
+    cal = calibration()
+    g = solar_exposure(shgc, wwr, shading, orientation, factors)
+
+    per_zone = setpoint if isinstance(setpoint, dict) else {z: setpoint for z in ZONES}
+
+    comfort = {}
+    for z in ZONES:
+        sp = np.asarray(per_zone[z], dtype=float)
+        sp_hot = sp + cal["beta"][z] * (g - 1.0)
+        comfort[z] = {}
+        for m in METRICS:
+            # Calor acompanha a exposição; frio segue só o setpoint
+            x = sp_hot if m in HOT_METRICS else sp
+            comfort[z][m] = np.clip(np.interp(x, sps, vals[(z, m)]), 0.0, 100.0)
+
+    # energia: cada subzona segue a curva da sala com o seu setpoint,
+    # ponderada pela sua fração da carga
+    energy = sum(ZONE_LOAD_SHARE[z] * energy_curve(control, per_zone[z]) for z in ZONES)
+    energy = energy * (1.0 + cal["gamma"][control] * (g - 1.0))
+
+    return {"comfort": comfort, "energy": energy, "exposure": g}
+
+
+def to_record(result: dict) -> dict:
+    """Scalar evaluate() output -> plain JSON-able dict (rounded like the tables)."""
+    return {
+        "comfort": {z: {m: round(float(v), 1) for m, v in ms.items()} for z, ms in result["comfort"].items()},
+        "energy": round(float(result["energy"]), 1),
+        "exposure": round(float(result["exposure"]), 4),
+    }
@@ -0,0 +1,157 @@
+# occupancy.py
+# Agendas de ocupação como bitsets compactos (1 bit por timestep de 10 min).
+#
+# O ano tem 52.560 passos -> 6.570 bytes por agenda. Interseção, união e
+# diferença são operações bit a bit sobre esses bytes, e "% de horas
+# ocupadas" vira popcount(flags & agenda) / popcount(agenda) — sem criar
+# um array booleano por consulta. Flags de desconforto por passo (ver
+# simulate.py, flags=True) usam o mesmo formato, então trocar o expediente
+# recalcula todas as porcentagens sem simular de novo.
+import numpy as np
+
+from epw import TIMESTEP_MIN, steps_per_year
+from solar import step_times
+
+OFFICE_HOURS = (8, 18)          # expediente (08:00–18:00)
+WEEKDAYS = (0, 1, 2, 3, 4)      # segunda..sexta
+START_WEEKDAY = 0               # dia da semana de 1º de janeiro (0 = segunda)
+
+# Feriados nacionais de data fixa (mês, dia)
+BR_HOLIDAYS = ((1, 1), (4, 21), (5, 1), (9, 7), (10, 12), (11, 2), (11, 15), (12, 25))
+
+_MONTH_START = np.cumsum([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30])  # ano sem 29/fev
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(bits: np.ndarray) -> np.ndarray:
+    """Number of set bits along the last axis of a packed uint8 array."""
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return np.bitwise_count(bits).sum(axis=-1, dtype=np.int64)
+    return _POPCOUNT[bits].sum(axis=-1, dtype=np.int64)
+
+
+def pack(mask) -> np.ndarray:
+    """Boolean array (..., steps) -> packed uint8 (..., ceil(steps / 8))."""
+    return np.packbits(np.asarray(mask, dtype=bool), axis=-1)
+
+
+class Schedule:
+    """Immutable set of timesteps of the year, stored as a packed bitset."""
+    __slots__ = ("bits", "n")
+
+    def __init__(self, bits: np.ndarray, n: int):
+        bits = np.array(bits, dtype=np.uint8)
+        bits.setflags(write=False)
+        self.bits = bits
+        self.n = n
+
+    @classmethod
+    def from_mask(cls, mask) -> "Schedule":
+        mask = np.asarray(mask, dtype=bool)
+        return cls(pack(mask), len(mask))
+
+    @classmethod
+    def empty(cls, timestep_min: int = TIMESTEP_MIN) -> "Schedule":
+        n = steps_per_year(timestep_min)
+        return cls(np.zeros(-(-n // 8), dtype=np.uint8), n)
+
+    def mask(self) -> np.ndarray:
+        return np.unpackbits(self.bits, count=self.n).astype(bool)
+
+    def _same(self, other: "Schedule"):
+        if self.n != other.n:
+            raise ValueError(f"Schedules have different lengths ({self.n} vs {other.n} steps)")
+
+    def __and__(self, other):
+        self._same(other)
+        return Schedule(self.bits & other.bits, self.n)
+
+    def __or__(self, other):
+        self._same(other)
+        return Schedule(self.bits | other.bits, self.n)
+
+    def __sub__(self, other):
+        self._same(other)
+        return Schedule(self.bits & ~other.bits, self.n)
+
+    def __invert__(self):
+        bits = ~self.bits
+        if self.n % 8:
+            bits[-1] &= np.uint8((0xFF << (8 - self.n % 8)) & 0xFF)  # zera o padding
+        return Schedule(bits, self.n)
+
+    def __eq__(self, other):
+        return isinstance(other, Schedule) and self.n == other.n and self.bits.tobytes() == other.bits.tobytes()
+
+    def __hash__(self):
+        return hash((self.n, self.bits.tobytes()))
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def count(self) -> int:
+        return int(popcount(self.bits))
+
+    def hours(self, timestep_min: int = TIMESTEP_MIN) -> float:
+        return self.count() * timestep_min / 60.0
+
+    # ---- reduções mascaradas
+    def percent(self, flags: np.ndarray) -> np.ndarray:
+        """
+        Packed per-step flags (..., nbytes) -> % of this schedule's steps where
+        the flag is set, for every leading index at once.
+        """
+        total = self.count()
+        if total == 0:
+            return np.zeros(flags.shape[:-1])
+        return popcount(flags & self.bits) * (100.0 / total)
+
+    def mean(self, series: np.ndarray) -> np.ndarray:
+        """Mean of a per-step float series (..., steps) over this schedule's steps."""
+        return np.asarray(series)[..., self.mask()].mean(axis=-1)
+
+
+# =========================
+# Construtores
+# =========================
+
+def _calendar(timestep_min: int, start_weekday: int):
+    doy, clock_h = step_times(timestep_min)
+    return doy, clock_h, (doy - 1 + start_weekday) % 7
+
+
+def hours(start: float, end: float, weekdays=WEEKDAYS, timestep_min: int = TIMESTEP_MIN,
+          start_weekday: int = START_WEEKDAY) -> Schedule:
+    """Clock hours [start, end) on the given weekdays; end < start = overnight shift."""
+    _, clock_h, weekday = _calendar(timestep_min, start_weekday)
+    if end >= start:
+        in_hours = (clock_h >= start) & (clock_h < end)
+    else:
+        in_hours = (clock_h >= start) | (clock_h < end)
+    return Schedule.from_mask(in_hours & np.isin(weekday, weekdays))
+
+
+def days(dates, timestep_min: int = TIMESTEP_MIN) -> Schedule:
+    """Whole days, given as (month, day) pairs."""
+    doy, _, _ = _calendar(timestep_min, START_WEEKDAY)
+    wanted = [int(_MONTH_START[m - 1]) + d for m, d in dates]
+    return Schedule.from_mask(np.isin(doy, wanted))
+
+
+def holidays(dates=BR_HOLIDAYS, timestep_min: int = TIMESTEP_MIN) -> Schedule:
+    return days(dates, timestep_min)
+
+
+def office(start: float = OFFICE_HOURS[0], end: float = OFFICE_HOURS[1], weekdays=WEEKDAYS,
+           exclude_holidays: bool = False, shifts=(), timestep_min: int = TIMESTEP_MIN,
+           start_weekday: int = START_WEEKDAY) -> Schedule:
+    """
+    Office schedule: [start, end) on weekdays, plus custom shifts given as
+    (start, end, weekdays) tuples, minus fixed-date national holidays if asked.
+    """
+    s = hours(start, end, weekdays, timestep_min, start_weekday)
+    for sh_start, sh_end, sh_days in shifts:
+        s = s | hours(sh_start, sh_end, sh_days, timestep_min, start_weekday)
+    if exclude_holidays:
+        s = s - holidays(timestep_min=timestep_min)
+    return s
@@ -0,0 +1,77 @@
+# optimizer.py
+# Otimizador de setpoints por subzona (controle térmico independente).
+#
+# Busca a combinação (A, B, C) que minimiza a energia de resfriamento com
+# desconforto <= cap em CADA subzona. A grade inteira é avaliada de forma
+# vetorizada (modelo reduzido, model.py); antes disso, setpoints que já
+# violam o cap na própria subzona são podados de cada eixo.
+import numpy as np
+
+import model
+from dataset import ENERGY_TA
+
+# Faixas de setpoint disponíveis nas tabelas da tese (°C)
+SETPOINT_RANGE = {"Ta": (19.0, 24.0), "To": (22.0, 27.0)}
+
+# Referência de energia: prática brasileira, Ta = 23°C (Tab 3)
+REFERENCE_ENERGY = ENERGY_TA[23]
+
+
+def zone_discomfort(comfort: dict, mode: str) -> dict:
+    """evaluate()['comfort'] -> {zone: max(hot, cold)} for mode 'To' or 'PMV' (as discomfort_value)."""
+    if mode == "To":
+        return {z: np.maximum(m["To_gt_26"], m["To_lt_23"]) for z, m in comfort.items()}
+    return {z: np.maximum(m["PMV_gt_p05"], m["PMV_lt_m05"]) for z, m in comfort.items()}
+
+
+def optimize_setpoints(control: str, mode: str = "To", cap: float = 10.0, step: float = 0.5,
+                       facade: dict | None = None, sp_range: tuple | None = None) -> dict:
+    """
+    control: 'Ta' or 'To' thermostat; mode: discomfort metric ('To' or 'PMV');
+    cap: max % of occupied hours in discomfort per zone; step: resolution (°C).
+    facade: model inputs (shgc/wwr/shading/orientation), default BC.
+
+    Returns {"setpoints": {zone: sp}, "energy", "delta_ref" (% vs ENERGY_TA[23]),
+             "discomfort": {zone: %}, "feasible", "candidates", "evaluated"}.
+    """
+    facade = facade or {}
+    lo, hi = sp_range or SETPOINT_RANGE[control]
+    axis = np.round(np.arange(lo, hi + step / 2, step), 4)
+
+    # 1) poda: desconforto de cada subzona no seu próprio eixo
+    per_axis = model.evaluate(control, {z: axis for z in model.ZONES}, **facade)
+    disc_axis = zone_discomfort(per_axis["comfort"], mode)
+    keep = {z: axis[disc_axis[z] <= cap] for z in model.ZONES}
+    feasible = all(len(v) for v in keep.values())
+    if not feasible:
+        # sem solução: mantém o melhor setpoint de cada subzona (menor desconforto)
+        keep = {z: v if len(v) else axis[[int(np.argmin(disc_axis[z]))]] for z, v in keep.items()}
+
+    # 2) grade restante (A x B x C), avaliada de uma vez
+    grids = np.meshgrid(*(keep[z] for z in model.ZONES), indexing="ij")
+    cand = {z: g.ravel() for z, g in zip(model.ZONES, grids)}
+    res = model.evaluate(control, cand, **facade)
+    disc = zone_discomfort(res["comfort"], mode)
+
+    ok = np.ones(len(cand[model.ZONES[0]]), dtype=bool)
+    for z in model.ZONES:
+        ok &= disc[z] <= cap
+    energy = np.broadcast_to(res["energy"], ok.shape)
+    if ok.any():
+        i = int(np.argmin(np.where(ok, energy, np.inf)))
+    else:
+        feasible = False
+        worst = np.max([disc[z] for z in model.ZONES], axis=0)
+        i = int(np.lexsort((energy, worst))[0])
+
+    e = float(energy[i])
+    return {
+        "setpoints": {z: float(cand[z][i]) for z in model.ZONES},
+        "energy": e,
+        "delta_ref": (e - REFERENCE_ENERGY) / REFERENCE_ENERGY * 100.0,
+        "discomfort": {z: float(disc[z][i]) for z in model.ZONES},
+        "comfort": {z: {m: float(v[i]) for m, v in res["comfort"][z].items()} for z in model.ZONES},
+        "feasible": feasible,
+        "candidates": len(axis) ** len(model.ZONES),
+        "evaluated": int(ok.size),
+    }
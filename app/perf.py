@@ -0,0 +1,457 @@
+# perf.py
+# Spans de tempo por rerun (instrumentação leve do app).
+#
+#   with perf.span("make_plan_figure"): ...     # bloco
+#   @perf.timed("md_to_html")                   # função
+#   perf.section("tab3")                        # trechos sequenciais do script
+#
+# Cada rerun grava numa lista própria (uma thread de script por sessão ->
+# threading.local). No fim do rerun os spans são agregados por sessão e por
+# processo (p50/p95/max sobre as últimas WINDOW amostras) e podem ser
+# exportados em JSON lines. Desligado, span() devolve um contexto nulo e
+# timed() só faz um getattr antes de chamar a função.
+#
+# Payload: ligado, cada ForwardMsg enviado pelo script tem o tamanho
+# serializado registrado com o trecho (aba), o tipo de elemento e a linha
+# do app que o emitiu — ranking dos elementos mais pesados no websocket.
+#
+# Profiler: com THESIS_PROFILE=1 no ambiente, ?debug=profile roda o rerun
+# sob cProfile (determinístico) + amostragem de pilhas, grava o .prof e um
+# arquivo de pilhas "collapsed" (flame graph) em results/profiles/ e lista
+# as funções mais caras no painel. No máximo uma captura por
+# PROFILE_INTERVAL_S no processo. As capturas abertas ficam num registro do
+# processo (não na thread): um rerun interrompido troca de thread de script,
+# então a captura órfã é encerrada no próximo begin()/profile_start() da
+# sessão, quando a thread dona morre, ou no atexit.
+import atexit
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+
+import numpy as np
+
+from store import RESULTS_DIR
+
+ENV_FLAG = "THESIS_PERF"            # THESIS_PERF=1 liga para todas as sessões
+QUERY_PARAM = ("debug", "perf")     # ?debug=perf liga só para a sessão
+WINDOW = 512                        # amostras por span usadas nos percentis
+LOG_LIMIT = 5000                    # registros guardados por sessão (export JSONL)
+PASS_THROUGH = ("plotly_chart",)    # helpers repassadores: o payload vai para a linha que os chamou
+
+PROFILE_FLAG = "THESIS_PROFILE"     # THESIS_PROFILE=1 permite ?debug=profile (desligado por padrão)
+PROFILE_PARAM = ("debug", "profile")
+PROFILE_INTERVAL_S = 60             # intervalo mínimo entre capturas (processo)
+PROFILE_SAMPLE_S = 0.002            # período da amostragem de pilhas
+PROFILE_TOP = 30                    # funções listadas no painel
+PROFILE_DIR = RESULTS_DIR / "profiles"
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_local = threading.local()
+_NOOP = contextlib.nullcontext()
+
+
+class Stats:
+    """Rolling duration samples (ms) for one span name."""
+    __slots__ = ("samples", "count", "total", "max")
+
+    def __init__(self):
+        self.samples = deque(maxlen=WINDOW)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms: float):
+        self.samples.append(ms)
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def summary(self) -> dict:
+        p50, p95 = np.percentile(self.samples, [50, 95]) if self.samples else (0.0, 0.0)
+        return {"count": self.count, "p50_ms": float(p50), "p95_ms": float(p95),
+                "max_ms": self.max, "total_ms": self.total}
+
+
+class Payload:
+    """Bytes sent by one (section, source line, element) across reruns."""
+    __slots__ = ("runs", "count", "total", "last", "max")
+
+    def __init__(self):
+        self.runs = 0
+        self.count = 0
+        self.total = 0
+        self.last = 0
+        self.max = 0
+
+    def add(self, nbytes: int, count: int):
+        self.runs += 1
+        self.count += count
+        self.total += nbytes
+        self.last = nbytes
+        self.max = max(self.max, nbytes)
+
+    def summary(self) -> dict:
+        return {"runs": self.runs, "elements": self.count, "avg_kib": self.total / self.runs / 1024,
+                "last_kib": self.last / 1024, "max_kib": self.max / 1024, "total_kib": self.total / 1024}
+
+
+class Session:
+    """Per-session aggregate (kept in st.session_state): stats per span + recent records."""
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex[:12]
+        self.stats = {}
+        self.log = deque(maxlen=LOG_LIMIT)
+        self.payload = {}                       # (trecho, linha, elemento) -> Payload
+        self.payload_log = deque(maxlen=LOG_LIMIT)
+        self.profile = None                     # resultado da última captura (profile_stop)
+
+
+class _Run:
+    def __init__(self, session_id: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.session_id = session_id
+        self.ts = time.time()
+        self.t0 = time.perf_counter_ns()
+        self.records = []
+        self.payload = []
+        self.stack = []
+        self.section = None         # (nome, início) do trecho sequencial aberto
+
+
+class _Span:
+    __slots__ = ("run", "name", "t0", "ts")
+
+    def __init__(self, run: _Run, name: str):
+        self.run = run
+        self.name = name
+
+    def __enter__(self):
+        self.run.stack.append(self.name)
+        self.ts = time.time()
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        ms = (time.perf_counter_ns() - self.t0) / 1e6
+        path = "/".join(self.run.stack)
+        self.run.stack.pop()
+        self.run.records.append({"run": self.run.id, "session": self.run.session_id,
+                                 "ts": round(self.ts, 3), "span": path, "ms": round(ms, 3)})
+        return False
+
+
+_process_stats = {}
+_process_payload = {}
+_process_lock = threading.Lock()
+
+
+# =========================
+# Payload (tamanho dos ForwardMsg)
+# =========================
+
+def _source():
+    """(file:line, function) of the first app frame that is not perf.py or a pass-through helper."""
+    f = sys._getframe(2)
+    while f is not None:
+        code = f.f_code
+        if (code.co_filename.startswith(APP_DIR) and code.co_filename != __file__
+                and code.co_name not in PASS_THROUGH):
+            return f"{os.path.basename(code.co_filename)}:{f.f_lineno}", code.co_name
+        f = f.f_back
+    return "?", ""
+
+
+def _element(msg) -> str:
+    kind = msg.WhichOneof("type")
+    if kind != "delta":
+        return kind
+    delta = msg.delta.WhichOneof("type")
+    if delta == "new_element":
+        return msg.delta.new_element.WhichOneof("type")
+    return delta
+
+
+def _hook_enqueue():
+    """Wrap the script context's enqueue once so every ForwardMsg is measured while a run is active."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return
+    ctx = get_script_run_ctx()
+    if ctx is None or getattr(ctx._enqueue, "_perf_payload", False):
+        return
+    inner = ctx._enqueue
+
+    def enqueue(msg):
+        run = getattr(_local, "run", None)
+        if run is not None:
+            where, func = _source()
+            run.payload.append({"run": run.id, "session": run.session_id,
+                                "section": run.section.name if run.section else "",
+                                "where": where, "function": func, "element": _element(msg),
+                                "bytes": msg.ByteSize()})
+        inner(msg)
+
+    enqueue._perf_payload = True
+    ctx._enqueue = enqueue
+
+
+def _payload_by_key(records) -> dict:
+    """This run's payload records -> {(section, where, element): (bytes, count)}."""
+    out = {}
+    for r in records:
+        key = (r["section"], r["where"], r["element"])
+        nbytes, count = out.get(key, (0, 0))
+        out[key] = (nbytes + r["bytes"], count + 1)
+    return out
+
+
+def enabled(query_flag: bool = False) -> bool:
+    return query_flag or os.environ.get(ENV_FLAG) == "1"
+
+
+def begin(on: bool, session_id: str = ""):
+    """Start a rerun. With on=False every span is a no-op until the next begin()."""
+    _local.run = _Run(session_id) if on else None
+    _drop_capture(session_id)
+    if on:
+        _hook_enqueue()
+
+
+def active() -> bool:
+    return getattr(_local, "run", None) is not None
+
+
+def span(name: str):
+    run = getattr(_local, "run", None)
+    if run is None:
+        return _NOOP
+    return _Span(run, name)
+
+
+def timed(name: str | None = None):
+    """Decorator: time every call of the function as a span (default: function name)."""
+    def deco(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            run = getattr(_local, "run", None)
+            if run is None:
+                return fn(*args, **kwargs)
+            with _Span(run, label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def section(name: str | None):
+    """Close the open top-level section (if any) and open `name` (None = just close)."""
+    run = getattr(_local, "run", None)
+    if run is None:
+        return
+    if run.section is not None:
+        run.section.__exit__(None, None, None)
+        run.section = None
+    if name is not None:
+        run.section = _Span(run, name).__enter__()
+
+
+def end(session: Session | None = None) -> list[dict]:
+    """
+    Finish the rerun: close the open section, add 'rerun' (ms) and payload
+    totals and aggregate into `session` and the process stats. Returns this
+    rerun's span records.
+    """
+    run = getattr(_local, "run", None)
+    if run is None:
+        return []
+    section(None)
+    _local.run = None
+    run.records.append({"run": run.id, "session": run.session_id, "ts": round(run.ts, 3), "span": "rerun",
+                        "ms": round((time.perf_counter_ns() - run.t0) / 1e6, 3)})
+    payload = _payload_by_key(run.payload)
+
+    if session is not None:
+        for r in run.records:
+            session.stats.setdefault(r["span"], Stats()).add(r["ms"])
+        session.log.extend(run.records)
+        for key, (nbytes, count) in payload.items():
+            session.payload.setdefault(key, Payload()).add(nbytes, count)
+        session.payload_log.extend(run.payload)
+    with _process_lock:
+        for r in run.records:
+            _process_stats.setdefault(r["span"], Stats()).add(r["ms"])
+        for key, (nbytes, count) in payload.items():
+            _process_payload.setdefault(key, Payload()).add(nbytes, count)
+    return run.records
+
+
+def table(stats: dict) -> list[dict]:
+    """{span: Stats} -> rows sorted by total time."""
+    rows = [dict(span=name, **s.summary()) for name, s in list(stats.items())]
+    return sorted(rows, key=lambda r: -r["total_ms"])
+
+
+def process_table() -> list[dict]:
+    with _process_lock:
+        return table(dict(_process_stats))
+
+
+def payload_table(payload: dict) -> list[dict]:
+    """{(section, where, element): Payload} -> rows sorted by average KiB per rerun."""
+    rows = [dict(section=sec, where=where, element=el, **p.summary())
+            for (sec, where, el), p in list(payload.items())]
+    return sorted(rows, key=lambda r: -r["avg_kib"])
+
+
+def process_payload_table() -> list[dict]:
+    with _process_lock:
+        return payload_table(dict(_process_payload))
+
+
+def payload_totals(rows: list[dict], by: str) -> list[dict]:
+    """Average KiB per rerun grouped by 'section' or 'element' (from payload_table rows)."""
+    out = {}
+    for r in rows:
+        out[r[by]] = out.get(r[by], 0.0) + r["avg_kib"]
+    return [{by: k, "avg_kib": v} for k, v in sorted(out.items(), key=lambda kv: -kv[1])]
+
+
+def to_jsonl(records) -> str:
+    return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+
+
+# =========================
+# Profiler (uma captura por rerun, sob demanda)
+# =========================
+
+_profile_lock = threading.Lock()
+_profile_last = 0.0
+_captures = {}                      # id(Capture) -> Capture ainda aberta (processo)
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class _StackSampler(threading.Thread):
+    """Samples one thread's stack every PROFILE_SAMPLE_S (app frames and below) into folded counts."""
+
+    def __init__(self, thread_id: int):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.stacks = Counter()
+        self.halt = threading.Event()
+
+    def run(self):
+        while not self.halt.wait(PROFILE_SAMPLE_S):
+            f = sys._current_frames().get(self.thread_id)
+            if f is None:  # a thread amostrada terminou
+                break
+            stack = []
+            while f is not None:
+                stack.append(f.f_code)
+                f = f.f_back
+            stack.reverse()
+            start = next((i for i, c in enumerate(stack) if c.co_filename.startswith(APP_DIR)), None)
+            if start is not None:
+                self.stacks[";".join(_frame_label(c) for c in stack[start:])] += 1
+
+
+class Capture:
+    """Profiler + stack sampler attached to the current script thread."""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.ts = time.time()
+        self.t0 = time.perf_counter()
+        self.profiler = cProfile.Profile()
+        self.thread = threading.current_thread()
+        self.sampler = _StackSampler(self.thread.ident)
+
+    def close(self):
+        self.profiler.disable()
+        self.sampler.halt.set()
+
+
+def profile_allowed(query_flag: bool) -> bool:
+    return query_flag and os.environ.get(PROFILE_FLAG) == "1"
+
+
+def profile_start(requested: bool, session_id: str = "") -> Capture | None:
+    """Start profiling this rerun if requested, allowed and not rate-limited; else None."""
+    global _profile_last
+    _drop_capture(session_id)
+    if not profile_allowed(requested):
+        return None
+    with _profile_lock:
+        if time.time() - _profile_last < PROFILE_INTERVAL_S:
+            return None
+        _profile_last = time.time()
+    cap = Capture(session_id)
+    try:
+        cap.profiler.enable()
+    except ValueError:  # outro profiler ativo no processo
+        return None
+    cap.sampler.start()
+    with _profile_lock:
+        _captures[id(cap)] = cap
+    return cap
+
+
+def _drop_capture(session_id: str | None = None, cap: Capture | None = None):
+    """
+    Stop captures left open by reruns that ended early (st.rerun / st.stop /
+    exception, often on another script thread): `cap`, every capture of
+    `session_id`, and any whose thread is gone. None, None at exit = all.
+    """
+    with _profile_lock:
+        stale = [c for c in _captures.values()
+                 if c is cap or (session_id is not None and c.session_id == session_id)
+                 or not c.thread.is_alive() or (session_id is None and cap is None)]
+        for c in stale:
+            del _captures[id(c)]
+    for c in stale:
+        c.close()
+
+
+atexit.register(_drop_capture)
+
+
+def profile_top(stats: pstats.Stats, n: int = PROFILE_TOP) -> list[dict]:
+    """Functions sorted by own time, with calls and cumulative time."""
+    rows = []
+    for (file, line, func), (_, calls, tt, ct, _) in stats.stats.items():
+        rows.append({"function": func, "where": f"{os.path.basename(file)}:{line}", "calls": calls,
+                     "own_ms": tt * 1e3, "cum_ms": ct * 1e3})
+    return sorted(rows, key=lambda r: -r["own_ms"])[:n]
+
+
+def profile_stop(cap: Capture | None) -> dict | None:
+    """Stop the capture, write <id>.prof and <id>.collapsed and return a summary for the panel."""
+    if cap is None:
+        return None
+    _drop_capture(cap=cap)
+    cap.sampler.join()
+    ms = (time.perf_counter() - cap.t0) * 1e3
+
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    name = time.strftime("%Y%m%d-%H%M%S", time.localtime(cap.ts)) + f"-{cap.session_id or 'app'}"
+    prof_path = PROFILE_DIR / f"{name}.prof"
+    folded_path = PROFILE_DIR / f"{name}.collapsed"
+    cap.profiler.dump_stats(prof_path)
+    folded = "".join(f"{stack} {count}\n" for stack, count in cap.sampler.stacks.most_common())
+    folded_path.write_text(folded, encoding="utf-8")
+    return {"ts": cap.ts, "ms": ms, "prof": str(prof_path), "collapsed": str(folded_path),
+            "samples": sum(cap.sampler.stacks.values()), "top": profile_top(pstats.Stats(cap.profiler))}
@@ -0,0 +1,183 @@
+# radiant.py
+# Temperatura radiante média (Tr) em pontos arbitrários do shoebox.
+#
+# Os fatores de ângulo (ponto -> superfície) dependem só da geometria, então
+# são calculados UMA vez por geometria/conjunto de pontos e ficam em cache.
+# Com eles, Tr de todos os pontos em todos os timesteps vira um único
+# produto de matrizes: F (pontos x superfícies) @ Ts (superfícies x timesteps).
+import functools
+from dataclasses import dataclass
+
+import numpy as np
+
+# Ordem fixa das superfícies (linhas de Ts / colunas de F)
+SURFACES = ("glazing", "facade_wall", "rear_wall", "north_wall", "south_wall", "floor", "ceiling")
+
+KELVIN = 273.15
+
+
+@dataclass(frozen=True)
+class Shoebox:
+    """
+    Room geometry in the same axes as the Tab 3 plan (make_plan_figure):
+      x = depth (0 = rear wall, depth = East facade), y = width, z = height.
+    Glazing is a full-width band on the facade, centred on `sill_m` upwards.
+    """
+    depth: float = 7.50
+    width: float = 4.00
+    height: float = 2.80
+    wwr: float = 1.00
+    sill_m: float = 0.0
+
+    def glazing_band(self) -> tuple[float, float]:
+        gh = max(0.0, min(1.0, self.wwr)) * self.height
+        z0 = max(0.0, min(self.sill_m, self.height - gh))
+        return z0, z0 + gh
+
+
+# Geometria do caso base (BC) — Tab 3
+BASE_CASE = Shoebox()
+
+
+def _rect(p0, p1, p2, p3) -> np.ndarray:
+    return np.array([p0, p1, p2, p3], dtype=float)
+
+
+def surface_rects(geom: Shoebox) -> dict[str, list[np.ndarray]]:
+    """Each surface as a list of planar quads (4 x 3 vertices, in order)."""
+    D, W, H = geom.depth, geom.width, geom.height
+    gz0, gz1 = geom.glazing_band()
+
+    facade = []
+    if gz0 > 0:
+        facade.append(_rect((D, 0, 0), (D, W, 0), (D, W, gz0), (D, 0, gz0)))
+    if gz1 < H:
+        facade.append(_rect((D, 0, gz1), (D, W, gz1), (D, W, H), (D, 0, H)))
+
+    glazing = []
+    if gz1 > gz0:
+        glazing.append(_rect((D, 0, gz0), (D, W, gz0), (D, W, gz1), (D, 0, gz1)))
+
+    return {
+        "glazing": glazing,
+        "facade_wall": facade,
+        "rear_wall": [_rect((0, 0, 0), (0, W, 0), (0, W, H), (0, 0, H))],
+        "north_wall": [_rect((0, W, 0), (D, W, 0), (D, W, H), (0, W, H))],
+        "south_wall": [_rect((0, 0, 0), (D, 0, 0), (D, 0, H), (0, 0, H))],
+        "floor": [_rect((0, 0, 0), (D, 0, 0), (D, W, 0), (0, W, 0))],
+        "ceiling": [_rect((0, 0, H), (D, 0, H), (D, W, H), (0, W, H))],
+    }
+
+
+def _triangle_solid_angle(points: np.ndarray, v1, v2, v3) -> np.ndarray:
+    """
+    Solid angle (sr) subtended by triangle (v1, v2, v3) at each point
+    (Van Oosterom & Strackee, 1983). points: (P, 3) -> (P,)
+    """
+    a = v1 - points
+    b = v2 - points
+    c = v3 - points
+    la = np.linalg.norm(a, axis=1)
+    lb = np.linalg.norm(b, axis=1)
+    lc = np.linalg.norm(c, axis=1)
+    num = np.abs(np.einsum("ij,ij->i", a, np.cross(b, c)))
+    den = (
+        la * lb * lc
+        + np.einsum("ij,ij->i", a, b) * lc
+        + np.einsum("ij,ij->i", a, c) * lb
+        + np.einsum("ij,ij->i", b, c) * la
+    )
+    return 2.0 * np.arctan2(num, den)
+
+
+def _quad_solid_angle(points: np.ndarray, quad: np.ndarray) -> np.ndarray:
+    return (
+        _triangle_solid_angle(points, quad[0], quad[1], quad[2])
+        + _triangle_solid_angle(points, quad[0], quad[2], quad[3])
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_factors(geom: Shoebox, points_key: bytes, n_points: int) -> np.ndarray:
+    points = np.frombuffer(points_key, dtype=float).reshape(n_points, 3)
+    rects = surface_rects(geom)
+
+    F = np.zeros((n_points, len(SURFACES)))
+    for j, name in enumerate(SURFACES):
+        for quad in rects[name]:
+            F[:, j] += _quad_solid_angle(points, quad)
+
+    # Para um ponto interno, a soma dos ângulos sólidos é 4π (esfera)
+    F /= 4.0 * np.pi
+    F.setflags(write=False)
+    return F
+
+
+def view_factors(points, geom: Shoebox = BASE_CASE) -> np.ndarray:
+    """
+    Angle factors from occupant points (small sphere) to each surface.
+    points: (P, 3) in metres -> F: (P, len(SURFACES)), rows sum to 1.
+    Cached per (geometry, points); the returned array is read-only.
+    """
+    pts = np.ascontiguousarray(points, dtype=float).reshape(-1, 3)
+    inside = (
+        (pts[:, 0] > 0) & (pts[:, 0] < geom.depth)
+        & (pts[:, 1] > 0) & (pts[:, 1] < geom.width)
+        & (pts[:, 2] > 0) & (pts[:, 2] < geom.height)
+    )
+    if not inside.all():
+        raise ValueError("All points must lie strictly inside the room.")
+    return _cached_factors(geom, pts.tobytes(), len(pts))
+
+
+def plan_grid(nx: int = 15, ny: int = 8, z: float = 0.6, geom: Shoebox = BASE_CASE) -> np.ndarray:
+    """
+    Regular grid of occupant points over the plan, cell-centred so no point
+    touches a wall. z = 0.6 m is the seated-occupant reference height.
+    Returns (ny * nx, 3), ordered row by row (y outer, x inner).
+    """
+    xs = (np.arange(nx) + 0.5) * geom.depth / nx
+    ys = (np.arange(ny) + 0.5) * geom.width / ny
+    X, Y = np.meshgrid(xs, ys)
+    return np.column_stack([X.ravel(), Y.ravel(), np.full(X.size, z)])
+
+
+def zone_points(geom: Shoebox = BASE_CASE, z: float = 0.6) -> dict[str, np.ndarray]:
+    """Geometric centre of subzones A/B/C (Zone Model 3), as in the plan figure."""
+    zW = geom.depth / 3
+    yc = geom.width / 2
+    return {
+        "C": np.array([0.5 * zW, yc, z]),
+        "B": np.array([1.5 * zW, yc, z]),
+        "A": np.array([2.5 * zW, yc, z]),
+    }
+
+
+def mean_radiant_temperature(factors: np.ndarray, surface_temps, linear: bool = False) -> np.ndarray:
+    """
+    Tr for all points x all timesteps in one matrix product.
+    factors: (P, S) from view_factors; surface_temps: (S, T) in °C
+    (or a dict {surface: series}). Returns (P, T) in °C.
+
+    linear=False uses the radiant balance on absolute temperatures
+    (Tr^4 = Σ F·Ts^4); linear=True uses the ISO 7726 linear approximation.
+    """
+    if isinstance(surface_temps, dict):
+        Ts = np.vstack([np.asarray(surface_temps[name], dtype=float) for name in SURFACES])
+    else:
+        Ts = np.asarray(surface_temps, dtype=float)
+        if Ts.ndim == 1:
+            Ts = Ts[:, None]
+
+    if linear:
+        return factors @ Ts
+
+    return (factors @ (Ts + KELVIN) ** 4) ** 0.25 - KELVIN
+
+
+def mean_radiant_grid(surface_temps, nx: int = 15, ny: int = 8, z: float = 0.6,
+                      geom: Shoebox = BASE_CASE, linear: bool = False) -> np.ndarray:
+    """Tr over a plan grid, shaped (ny, nx, T) for direct use as a heatmap."""
+    F = view_factors(plan_grid(nx, ny, z, geom), geom)
+    Tr = mean_radiant_temperature(F, surface_temps, linear=linear)
+    return Tr.reshape(ny, nx, -1)
@@ -0,0 +1,280 @@
+# report.py
+# Relatório PDF (uma página A4) do cenário aberto na Tab 3 ou Tab 4: planta,
+# gráfico de energia, tabela de metadados das fachadas e a variação relativa
+# à referência ("Relative change vs reference").
+#
+# Roda fora da thread do script, na fila de tarefas (jobs.py): pedidos
+# idênticos de sessões diferentes viram UM job (mesma chave), e o PDF pronto
+# fica em results/reports/<hash>.pdf — 50 alunos clicando ao mesmo tempo
+# geram um render só. As figuras PNG são reaproveitadas da exportação em lote
+# (export.py, results/figures/ + manifest) ou do cache compartilhado entre
+# workers (shared.py), ambos pela mesma chave de entradas (task_key). Render: Kaleido; montagem
+# da página: Pillow.
+import functools
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import textwrap
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFont
+
+import shared
+from content import AUTHOR, FOOTER, TITLE
+from dataset import ENERGY_TA, ENERGY_TO, ENERGY_FACADE_TA, ENERGY_FACADE_TO26, FACADE_ALTS
+from export import EXPORT_DIR, MANIFEST, PNG_SCALE, build_figure, code_fingerprint, scenarios, task_key
+from figures import PLAN_PLACEHOLDER_TO
+from store import RESULTS_DIR, canonical_json
+
+REPORT_DIR = RESULTS_DIR / "reports"
+REPORT_VERSION = "1"        # mude ao alterar o layout da página: invalida os PDFs
+
+# Página A4 a 150 dpi
+PAGE_DPI = 150
+PAGE_SIZE = (1240, 1754)
+PAGE_MARGIN = 70
+TEXT_COLOR = "#222222"
+MUTED_COLOR = "#777777"
+ACCENT_COLOR = "#d33333"    # alternativa ativa na tabela (mesmo vermelho dos dots)
+FONT_SIZES = {"title": 26, "heading": 22, "body": 18, "small": 14}
+
+CONTROL_LABELS = {"Ta": "Air-temperature thermostat (Ta)", "To": "Operative-temperature thermostat (To)"}
+TAB_TITLES = {3: "Thermal Environment Control", 4: "Facade Design Alternatives"}
+KALEIDO = importlib.util.find_spec("kaleido") is not None   # fora do requirements.txt (Community Cloud)
+
+
+# =========================
+# Cenário -> figuras e números (mesma lógica das Tabs 3/4)
+# =========================
+
+def facade_delta(control: str, setpoint: int, alt: str, ref: str) -> float | None:
+    """Tab 4 'Relative change vs reference' (%), None when either energy value is missing."""
+    table = ENERGY_FACADE_TA[setpoint] if control == "Ta" else ENERGY_FACADE_TO26
+    ea, er = table.get(alt), table.get(ref)
+    if ea is None or er in (None, 0):
+        return None
+    return (ea - er) / er * 100.0
+
+
+@functools.lru_cache(maxsize=1)
+def _specs() -> dict:
+    return {s["name"]: s for s in scenarios()}
+
+
+def figure_specs(spec: dict) -> tuple[dict, dict | None]:
+    """Report spec -> (plan figure spec, energy figure spec or None), named like export.scenarios()."""
+    specs = _specs()
+    c, sp, mode = spec["control"], spec["setpoint"], spec["mode"]
+    if spec["tab"] == 3:
+        return specs[f"tab3/plan_{c}{sp}_{mode}"], specs[f"tab3/energy_{c}{sp}_ref{spec['reference']}"]
+    if c == "To":
+        plan = {"name": "tab4/plan_placeholder", "builder": "make_plan_placeholder",
+                "kwargs": {"message": PLAN_PLACEHOLDER_TO}}
+        return plan, specs.get(f"tab4/energy_To26_{spec['alt']}")
+    return specs[f"tab4/plan_Ta{sp}_{spec['alt']}_{mode}"], specs.get(f"tab4/energy_Ta{sp}_{spec['alt']}")
+
+
+def delta(spec: dict) -> float | None:
+    if spec["tab"] == 4:
+        return facade_delta(spec["control"], spec["setpoint"], spec["alt"], spec["reference"])
+    energy = ENERGY_TA if spec["control"] == "Ta" else ENERGY_TO
+    ea, er = energy.get(spec["setpoint"]), energy.get(spec["reference"])
+    return None if ea is None or not er else (ea - er) / er * 100.0
+
+
+# =========================
+# Renders (cache por chave de entradas, compartilhado entre workers)
+# =========================
+
+def _atomic_write(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    finally:
+        Path(tmp).unlink(missing_ok=True)
+
+
+def _exported() -> dict:
+    path = EXPORT_DIR / MANIFEST
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _png_ready(spec: dict, code: str, exported: dict) -> bool:
+    key = task_key(spec, "png", None, None, PNG_SCALE, code)
+    rel = f"{spec['name']}.png"
+    if exported.get(rel) == key and (EXPORT_DIR / rel).exists():
+        return True
+    return shared.path("render", shared.key("render", key), "png").exists()
+
+
+def available(spec: dict) -> bool:
+    """True when the PDF can be made here: Kaleido installed, or every figure already rendered."""
+    if KALEIDO:
+        return True
+    code, exported = code_fingerprint(), _exported()
+    return all(_png_ready(s, code, exported) for s in figure_specs(spec) if s is not None)
+
+
+def figure_png(spec: dict, code: str, exported: dict) -> bytes:
+    """PNG of one scenario figure: batch export -> shared render cache -> Kaleido render (then cached)."""
+    key = task_key(spec, "png", None, None, PNG_SCALE, code)
+    rel = f"{spec['name']}.png"
+    if exported.get(rel) == key and (EXPORT_DIR / rel).exists():
+        return (EXPORT_DIR / rel).read_bytes()
+    return shared.cached_bytes("render", (key,), lambda: _kaleido_png(spec), ext="png")
+
+
+def _kaleido_png(spec: dict) -> bytes:
+    try:
+        import kaleido  # noqa: F401
+    except ImportError:
+        raise RuntimeError("PDF reports need Kaleido: pip install kaleido (and Chrome: plotly_get_chrome)")
+    return build_figure(spec).to_image(format="png", scale=PNG_SCALE)
+
+
+# =========================
+# Página (Pillow)
+# =========================
+
+def _font(kind: str):
+    return ImageFont.load_default(size=FONT_SIZES[kind])
+
+
+class _Page:
+    def __init__(self):
+        self.img = Image.new("RGB", PAGE_SIZE, "white")
+        self.draw = ImageDraw.Draw(self.img)
+        self.y = PAGE_MARGIN
+        self.width = PAGE_SIZE[0] - 2 * PAGE_MARGIN
+
+    def text(self, text: str, kind: str = "body", color: str = TEXT_COLOR, gap: int = 8, width: int = 95):
+        font = _font(kind)
+        chars = max(20, int(width * FONT_SIZES["body"] / FONT_SIZES[kind]))
+        for line in textwrap.wrap(text, chars) or [""]:
+            self.draw.text((PAGE_MARGIN, self.y), line, font=font, fill=color)
+            self.y += FONT_SIZES[kind] + gap
+        self.y += gap
+
+    def image(self, png: bytes, max_h: int):
+        im = Image.open(io.BytesIO(png)).convert("RGB")
+        scale = min(self.width / im.width, max_h / im.height)
+        im = im.resize((int(im.width * scale), int(im.height * scale)), Image.LANCZOS)
+        self.img.paste(im, (PAGE_MARGIN + (self.width - im.width) // 2, self.y))
+        self.y += im.height + 16
+
+    def rule(self):
+        self.draw.line((PAGE_MARGIN, self.y, PAGE_MARGIN + self.width, self.y), fill="#cccccc", width=2)
+        self.y += 16
+
+    def facade_table(self, active: str, reference: str):
+        """Facade metadata table (label column + one column per alternative), active one in red."""
+        font, bold = _font("small"), _font("body")
+        label_w = 130
+        col_w = (self.width - label_w) // len(FACADE_ALTS)
+        rows = [("", lambda a: a["id"] + (" (ref.)" if a["id"] == reference else "")),
+                *((k, lambda a, k=k: a["meta"][k]) for k in ("SHGC", "WWR", "Type", "Shading"))]
+        for label, value in rows:
+            self.draw.text((PAGE_MARGIN, self.y), label, font=bold, fill=TEXT_COLOR)
+            for i, alt in enumerate(FACADE_ALTS):
+                color = ACCENT_COLOR if alt["id"] == active else TEXT_COLOR
+                x = PAGE_MARGIN + label_w + i * col_w + col_w // 2
+                self.draw.text((x, self.y), value(alt), font=font, fill=color, anchor="ma")
+            self.y += FONT_SIZES["body"] + 10
+        for i, alt in enumerate(FACADE_ALTS):  # nome da alternativa (linhas do rótulo)
+            x = PAGE_MARGIN + label_w + i * col_w + col_w // 2
+            for j, line in enumerate(alt["label"].split("\n")):
+                self.draw.text((x, self.y + j * (FONT_SIZES["small"] + 4)), line, font=font, fill=MUTED_COLOR, anchor="ma")
+        self.y += 3 * (FONT_SIZES["small"] + 4) + 12
+
+    def pdf(self) -> bytes:
+        buf = io.BytesIO()
+        self.img.save(buf, "PDF", resolution=PAGE_DPI)
+        return buf.getvalue()
+
+
+def scenario_lines(spec: dict) -> list[str]:
+    lines = [f"Temperature control: {CONTROL_LABELS[spec['control']]}",
+             f"Setpoint: {spec['control']} {spec['setpoint']} °C",
+             f"Thermal comfort parameter: {spec['mode']}"]
+    if spec["tab"] == 3:
+        lines.append(f"Reference: {spec['control']} {spec['reference']} °C")
+    else:
+        labels = {a["id"]: a["label"].replace("\n", " ") for a in FACADE_ALTS}
+        lines += [f"Facade design: {labels[spec['alt']]}", f"Reference: {labels[spec['reference']]}"]
+    return lines
+
+
+def render(spec: dict, progress=None) -> bytes:
+    """One-page PDF for a Tab 3/4 scenario spec."""
+    plan, energy = figure_specs(spec)
+    code, exported = code_fingerprint(), _exported()
+    figs = [s for s in (plan, energy) if s is not None]
+    pngs = []
+    for i, s in enumerate(figs, start=1):
+        pngs.append(figure_png(s, code, exported))
+        if progress:
+            progress(i, len(figs) + 1)
+
+    page = _Page()
+    page.text(TITLE, "title", gap=6)
+    page.text(AUTHOR, "small", MUTED_COLOR)
+    page.rule()
+    page.text(TAB_TITLES[spec["tab"]], "heading")
+    for line in scenario_lines(spec):
+        page.text(line, gap=4)
+    page.image(pngs[0], 560)
+    if energy is not None:
+        page.text("Cooling energy use", "heading")
+        page.image(pngs[1], 360)
+    else:
+        page.text(f"Cooling energy chart for {spec['control']}={spec['setpoint']}°C is not available yet.",
+                  color=MUTED_COLOR)
+    d = delta(spec)
+    if d is not None:
+        page.text(f"Relative change vs reference: {d:+.2f}%", "heading")
+    if spec["tab"] == 4:
+        page.rule()
+        page.text("Facade design alternatives", "heading")
+        page.facade_table(spec["alt"], spec["reference"])
+    page.y = max(page.y, PAGE_SIZE[1] - PAGE_MARGIN - 3 * (FONT_SIZES["small"] + 8))
+    page.text(FOOTER[0], "small", MUTED_COLOR, gap=4, width=120)
+    out = page.pdf()
+    if progress:
+        progress(len(figs) + 1, len(figs) + 1)
+    return out
+
+
+# =========================
+# Fila (jobs.py) e cache de PDFs
+# =========================
+
+def report_key(spec: dict) -> str:
+    payload = canonical_json({"report": spec, "version": REPORT_VERSION, "code": code_fingerprint()})
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+
+def pdf_path(spec: dict) -> Path:
+    return REPORT_DIR / f"{report_key(spec)}.pdf"
+
+
+def file_name(spec: dict) -> str:
+    parts = [f"tab{spec['tab']}", f"{spec['control']}{spec['setpoint']}", spec["mode"],
+             *([spec["alt"]] if spec["tab"] == 4 else []), f"ref{spec['reference']}"]
+    return "thesis_sim_" + "_".join(str(p) for p in parts) + ".pdf"
+
+
+def report_job(job, spec: dict) -> str:
+    """Background job: render the PDF once (unless already on disk); returns its path."""
+    path = pdf_path(spec)
+    if not path.exists():
+        _atomic_write(path, render(spec, progress=job.report))
+    return str(path)
@@ -0,0 +1,306 @@
+# sensitivity.py
+# Análise de sensibilidade global (Morris / Sobol) sobre fachada e controle.
+#
+# As amostras são geradas em BLOCOS no hipercubo unitário (um gerador por
+# bloco -> reprodutível) e avaliadas em lote pelo modelo reduzido (vetorizado)
+# ou por um backend do sweep (pool de processos). Entradas e saídas ficam em
+# cache (results/sensitivity/*.npz): pedir mais amostras só avalia os blocos
+# novos e refina os índices já calculados.
+#
+#   python app/sensitivity.py --method sobol -n 1024
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+import model
+from optimizer import SETPOINT_RANGE, zone_discomfort
+from store import RESULTS_DIR, canonical_json
+from sweep import CHUNK_SIZE, ReducedModelBackend, _run_chunk, make_backend
+
+SENSITIVITY_DIR = RESULTS_DIR / "sensitivity"
+FORMAT_VERSION = 1
+
+# Fatores e faixas (hipercubo unitário -> valores físicos)
+FACTORS = {
+    "shgc": (0.16, 0.41),          # faixa das FACADE_ALTS
+    "wwr": (0.5, 1.0),
+    "shading": (0.0, 1.0),         # fração do sombreamento externo "100%"
+    "orientation": (0.0, 360.0),   # graus a partir do Norte
+    "setpoint": (0.0, 1.0),        # posição na faixa do termostato (SETPOINT_RANGE)
+    "control": (0.0, 1.0),         # < 0.5 -> Ta, senão To
+}
+OUTPUTS = ("energy",) + model.ZONES  # energia + desconforto de cada subzona
+
+BLOCK = 64            # linhas base (Sobol) ou trajetórias (Morris) por bloco
+SOBOL_N = 512         # amostras base padrão
+MORRIS_R = 64         # trajetórias padrão
+MORRIS_LEVELS = 4     # níveis da grade de Morris
+BOOTSTRAP = 200       # reamostragens para os intervalos
+CONFIDENCE = 0.95
+
+
+# =========================
+# Amostras
+# =========================
+
+def to_params(U: np.ndarray) -> dict:
+    """Unit-cube samples (n, len(FACTORS)) -> physical model inputs (arrays)."""
+    p = {name: lo + U[:, j] * (hi - lo) for j, (name, (lo, hi)) in enumerate(FACTORS.items())}
+    control = np.where(p.pop("control") < 0.5, "Ta", "To")
+    frac = p.pop("setpoint")
+    lo = np.where(control == "Ta", SETPOINT_RANGE["Ta"][0], SETPOINT_RANGE["To"][0])
+    hi = np.where(control == "Ta", SETPOINT_RANGE["Ta"][1], SETPOINT_RANGE["To"][1])
+    return dict(p, control=control, setpoint=lo + frac * (hi - lo))
+
+
+def _sobol_block(rng: np.random.Generator) -> np.ndarray:
+    """Saltelli block: rows [A; B; AB_1 .. AB_k] (AB_j = A with column j from B)."""
+    k = len(FACTORS)
+    A, B = rng.random((BLOCK, k)), rng.random((BLOCK, k))
+    AB = np.repeat(A[None], k, axis=0)
+    for j in range(k):
+        AB[j, :, j] = B[:, j]
+    return np.concatenate([A, B, AB.reshape(-1, k)])
+
+
+def _morris_block(rng: np.random.Generator) -> np.ndarray:
+    """BLOCK one-at-a-time trajectories of k+1 points on a MORRIS_LEVELS grid."""
+    k, p = len(FACTORS), MORRIS_LEVELS
+    delta = p / (2.0 * (p - 1))
+    start = rng.integers(0, p // 2, (BLOCK, k)) / (p - 1)   # x + delta fica em [0, 1]
+    up = rng.random((BLOCK, k)) < 0.5
+    start = np.where(up, start, start + delta)               # metade desce
+    step = np.where(up, delta, -delta)
+
+    traj = np.repeat(start[:, None, :], k + 1, axis=1)
+    order = np.argsort(rng.random((BLOCK, k)), axis=1)       # ordem aleatória dos fatores
+    rows = np.arange(BLOCK)
+    for s in range(k):
+        j = order[:, s]
+        traj[rows, s + 1:, j] += step[rows, j][:, None]
+    return traj.reshape(-1, k)
+
+
+BLOCK_MAKERS = {"sobol": _sobol_block, "morris": _morris_block}
+
+
+# =========================
+# Avaliação
+# =========================
+
+def evaluate_reduced(params: dict, mode: str = "To") -> np.ndarray:
+    """Reduced model, vectorized per thermostat -> (n, len(OUTPUTS))."""
+    Y = np.empty((len(params["setpoint"]), len(OUTPUTS)))
+    for control in ("Ta", "To"):
+        m = params["control"] == control
+        if not m.any():
+            continue
+        res = model.evaluate(control, params["setpoint"][m],
+                             **{k: params[k][m] for k in ("shgc", "wwr", "shading", "orientation")})
+        disc = zone_discomfort(res["comfort"], mode)
+        Y[m] = np.column_stack([np.broadcast_to(res["energy"], m.sum())] + [disc[z] for z in model.ZONES])
+    return Y
+
+
+def evaluate_backend(params: dict, backend, mode: str = "To", workers: int | None = None) -> np.ndarray:
+    """Any sweep backend (e.g. 'rc'): cases in CHUNK_SIZE chunks on a process pool."""
+    n = len(params["setpoint"])
+    cases = [(str(i), {k: (v[i].item() if hasattr(v[i], "item") else v[i]) for k, v in params.items()})
+             for i in range(n)]
+    chunks = [cases[i:i + CHUNK_SIZE] for i in range(0, n, CHUNK_SIZE)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = [r for chunk in pool.map(_run_chunk, [backend] * len(chunks), chunks) for r in chunk]
+
+    Y = np.empty((n, len(OUTPUTS)))
+    for i, (_, _, res) in enumerate(results):
+        comfort = {z: {m: np.asarray(v) for m, v in ms.items()} for z, ms in res["comfort"].items()}
+        disc = zone_discomfort(comfort, mode)
+        Y[i] = [res["energy"]] + [float(disc[z]) for z in model.ZONES]
+    return Y
+
+
+# =========================
+# Cache incremental
+# =========================
+
+def _cache_path(method: str, fingerprint: str, mode: str, seed: int) -> Path:
+    ident = canonical_json({"v": FORMAT_VERSION, "method": method, "backend": fingerprint, "mode": mode,
+                            "seed": seed, "factors": FACTORS, "block": BLOCK, "levels": MORRIS_LEVELS})
+    return SENSITIVITY_DIR / f"{method}-{hashlib.sha256(ident.encode('utf-8')).hexdigest()[:24]}.npz"
+
+
+def _load(path: Path) -> tuple[np.ndarray, np.ndarray]:
+    if path.exists():
+        with np.load(path) as f:
+            return f["U"], f["Y"]
+    k = len(FACTORS)
+    return np.empty((0, k)), np.empty((0, len(OUTPUTS)))
+
+
+def _save(path: Path, U: np.ndarray, Y: np.ndarray):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".npz")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, U=U, Y=Y)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def sample(method: str, n: int, backend=None, mode: str = "To", seed: int = 0,
+           workers: int | None = None, progress=None, cancelled=None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Cached (U, Y) for at least `n` base samples (Sobol) / trajectories (Morris),
+    rounded up to whole blocks. Only blocks not yet in the cache are evaluated;
+    each finished block is saved, then progress(done_blocks, total_blocks, U, Y).
+    """
+    backend = backend or ReducedModelBackend()
+    path = _cache_path(method, backend.fingerprint(), mode, seed)
+    U, Y = _load(path)
+
+    rows_per_block = len(BLOCK_MAKERS[method](np.random.default_rng(0)))
+    have, need = len(U) // rows_per_block, -(-n // BLOCK)
+    for b in range(have, need):
+        if cancelled and cancelled():
+            break
+        Ub = BLOCK_MAKERS[method](np.random.default_rng([seed, b]))
+        params = to_params(Ub)
+        if isinstance(backend, ReducedModelBackend):
+            Yb = evaluate_reduced(params, mode)
+        else:
+            Yb = evaluate_backend(params, backend, mode, workers)
+        U, Y = np.concatenate([U, Ub]), np.concatenate([Y, Yb])
+        _save(path, U, Y)
+        if progress:
+            progress(b + 1, need, U, Y)
+
+    rows = need * rows_per_block
+    return U[:rows], Y[:rows]
+
+
+# =========================
+# Índices
+# =========================
+
+def _percentile_ci(samples: np.ndarray) -> np.ndarray:
+    a = (1.0 - CONFIDENCE) / 2.0
+    return np.quantile(samples, [a, 1.0 - a], axis=0)
+
+
+def sobol_indices(Y: np.ndarray, n_boot: int = BOOTSTRAP, seed: int = 0) -> dict:
+    """
+    First-order (Saltelli 2010) and total (Jansen) indices from the block
+    layout of _sobol_block. Arrays are (factor, output); *_ci are (2, factor, output).
+    """
+    k = len(FACTORS)
+    Yb = Y.reshape(-1, k + 2, BLOCK, Y.shape[-1])            # (blocos, A|B|AB_j, linha, saída)
+    YA = Yb[:, 0].reshape(-1, Y.shape[-1])
+    YB = Yb[:, 1].reshape(-1, Y.shape[-1])
+    YAB = Yb[:, 2:].transpose(0, 2, 1, 3).reshape(-1, k, Y.shape[-1])
+
+    # centrar as saídas reduz muito a variância do estimador de S1
+    f0 = np.concatenate([YA, YB]).mean(axis=0)
+    YA, YB, YAB = YA - f0, YB - f0, YAB - f0
+
+    def estimate(idx):
+        ya, yb, yab = YA[idx], YB[idx], YAB[idx]
+        var = np.var(np.concatenate([ya, yb], axis=-2), axis=-2)[..., None, :]
+        safe = np.where(var > 0, var, 1.0)
+        s1 = np.mean(yb[..., None, :] * (yab - ya[..., None, :]), axis=-3) / safe
+        st_ = 0.5 * np.mean((ya[..., None, :] - yab) ** 2, axis=-3) / safe
+        return np.where(var > 0, s1, 0.0), np.where(var > 0, st_, 0.0)
+
+    n = len(YA)
+    S1, ST = estimate(np.arange(n))
+    boot = np.random.default_rng(seed).integers(0, n, (n_boot, n))
+    S1_b, ST_b = estimate(boot)
+    return {"method": "sobol", "n": n, "S1": S1, "ST": ST,
+            "S1_ci": _percentile_ci(S1_b), "ST_ci": _percentile_ci(ST_b)}
+
+
+def morris_indices(U: np.ndarray, Y: np.ndarray, n_boot: int = BOOTSTRAP, seed: int = 0) -> dict:
+    """
+    Elementary effects per trajectory -> mu* (mean |EE|) and sigma, per
+    (factor, output), in output units per full factor range.
+    """
+    k = len(FACTORS)
+    Ut = U.reshape(-1, k + 1, k)
+    Yt = Y.reshape(-1, k + 1, Y.shape[-1])
+    dU = np.diff(Ut, axis=1)                                  # (r, k, k): um fator muda por passo
+    j = np.argmax(np.abs(dU), axis=2)                         # (r, k)
+    step = np.take_along_axis(dU, j[..., None], axis=2)       # (r, k, 1)
+    ee_steps = np.diff(Yt, axis=1) / step                     # (r, k, saída)
+
+    r = len(Ut)
+    EE = np.empty_like(ee_steps)
+    EE[np.arange(r)[:, None], j] = ee_steps                   # reordena por fator
+
+    mu_star, sigma = np.abs(EE).mean(axis=0), EE.std(axis=0)
+    boot = np.random.default_rng(seed).integers(0, r, (n_boot, r))
+    mu_b = np.abs(EE[boot]).mean(axis=1)
+    return {"method": "morris", "n": r, "mu_star": mu_star, "sigma": sigma, "mu_star_ci": _percentile_ci(mu_b)}
+
+
+def indices(method: str, U: np.ndarray, Y: np.ndarray) -> dict:
+    return sobol_indices(Y) if method == "sobol" else morris_indices(U, Y)
+
+
+def ranking(result: dict, output: str) -> list[dict]:
+    """Factors sorted by importance for one output (ST for Sobol, mu* for Morris)."""
+    o = OUTPUTS.index(output)
+    key = "ST" if result["method"] == "sobol" else "mu_star"
+    rows = []
+    for j, name in enumerate(FACTORS):
+        row = {"factor": name, key: float(result[key][j, o]),
+               "ci": [float(result[f"{key}_ci"][0, j, o]), float(result[f"{key}_ci"][1, j, o])]}
+        if result["method"] == "sobol":
+            row["S1"] = float(result["S1"][j, o])
+            row["S1_ci"] = [float(result["S1_ci"][0, j, o]), float(result["S1_ci"][1, j, o])]
+        else:
+            row["sigma"] = float(result["sigma"][j, o])
+        rows.append(row)
+    return sorted(rows, key=lambda r: -r[key])
+
+
+def analyze(method: str = "sobol", n: int | None = None, backend=None, mode: str = "To",
+            seed: int = 0, workers: int | None = None, progress=None, cancelled=None) -> dict:
+    """Sample (incrementally, cached) and compute the indices."""
+    n = n or (SOBOL_N if method == "sobol" else MORRIS_R)
+    U, Y = sample(method, n, backend, mode, seed, workers, progress, cancelled)
+    return indices(method, U, Y)
+
+
+def sensitivity_job(job, method: str = "sobol", n: int | None = None, backend=None, mode: str = "To") -> dict:
+    """jobs.JobQueue entry point: streams refined indices after every block."""
+    def progress(done, total, U, Y):
+        job.report(done, total, indices(method, U, Y))
+    return analyze(method, n, backend, mode, workers=1, progress=progress, cancelled=job.cancelled)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Global sensitivity analysis (Morris / Sobol).")
+    ap.add_argument("--method", choices=tuple(BLOCK_MAKERS), default="sobol")
+    ap.add_argument("-n", type=int, help="base samples (sobol) or trajectories (morris)")
+    ap.add_argument("--mode", choices=("To", "PMV"), default="To", help="discomfort metric per zone")
+    ap.add_argument("--backend", default="reduced", help="reduced | rc")
+    ap.add_argument("--epw", help="rc: weather file")
+    ap.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    backend = make_backend("rc", epw=args.epw) if args.backend == "rc" else None
+    res = analyze(args.method, args.n, backend, args.mode, workers=args.workers,
+                  progress=lambda d, t, U, Y: print(f"\rblock {d}/{t}", end="", flush=True))
+    print()
+    print(json.dumps({o: ranking(res, o) for o in OUTPUTS}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
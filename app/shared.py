@@ -0,0 +1,231 @@
+# shared.py
+# Cache em disco compartilhado entre processos do mesmo nó.
+#
+# Atrás de um balanceador rodam vários processos do Streamlit, cada um com
+# seus lru_cache. O que é caro de montar (renders PNG das figuras, irradiância
+# do ano inteiro) fica também aqui, visível para todos os workers:
+#
+#   results/cache/<espaço>/<hh>/<chave>.<ext>
+#
+# ou em THESIS_CACHE_DIR (ex.: /dev/shm/thesis_sim = memória compartilhada).
+#
+# - chaves versionadas: sha256(CACHE_VERSION + espaço + partes). Mudar a
+#   versão (ou o que o chamador põe nas partes) invalida sem apagar nada;
+# - escrita atômica (temporário + os.replace): o leitor nunca vê arquivo pela
+#   metade, e dois workers gravando a mesma chave não brigam;
+# - tamanho limitado: a cada EVICT_EVERY_MB gravados pelo processo, os
+#   arquivos menos usados (mtime, renovado na leitura) são removidos até
+#   CACHE_MAX_MB * EVICT_TARGET — um worker por vez (flock);
+# - arrays NumPy são abertos com mmap, só leitura: as páginas ficam no page
+#   cache do SO, uma cópia por nó e não uma por worker.
+#
+#   python app/shared.py             # tamanho e estatísticas
+#   python app/shared.py --evict     # força a limpeza até o limite
+#   python app/shared.py --clear     # apaga tudo
+import argparse
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from store import RESULTS_DIR, canonical_json
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem lock (remoções concorrentes são toleradas)
+    fcntl = None
+
+CACHE_DIR = Path(os.environ.get("THESIS_CACHE_DIR") or RESULTS_DIR / "cache")
+CACHE_VERSION = "1"         # mude ao alterar o formato dos arquivos: invalida o cache
+CACHE_MAX_MB = int(os.environ.get("THESIS_CACHE_MAX_MB") or 512)   # limite do diretório (todos os workers)
+EVICT_EVERY_MB = 32         # gravados por este processo entre duas varreduras
+EVICT_TARGET = 0.9          # a limpeza desce até 90% do limite
+TOUCH_S = 60                # leitura renova o mtime (LRU) no máximo uma vez por minuto
+
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "writes": 0, "evicted": 0}
+_written = 0                # bytes gravados desde a última varredura
+
+
+# =========================
+# Chaves e caminhos
+# =========================
+
+def key(namespace: str, *parts) -> str:
+    """Versioned key: same namespace + JSON-able parts -> same file in every process."""
+    payload = canonical_json({"v": CACHE_VERSION, "ns": namespace, "parts": parts})
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def path(namespace: str, k: str, ext: str) -> Path:
+    return CACHE_DIR / namespace / k[:2] / f"{k}.{ext}"
+
+
+def _count(name: str, n: int = 1):
+    with _lock:
+        _stats[name] += n
+
+
+def _touch(p: Path):
+    try:
+        if time.time() - p.stat().st_mtime > TOUCH_S:
+            os.utime(p)
+    except OSError:
+        pass
+
+
+def _write(p: Path, write) -> Path:
+    global _written
+    p.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=p.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        size = os.path.getsize(tmp)
+        os.replace(tmp, p)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    _count("writes")
+    with _lock:
+        _written += size
+        due = _written >= EVICT_EVERY_MB * 2**20
+        if due:
+            _written = 0
+    if due:
+        evict()
+    return p
+
+
+# =========================
+# Bytes e arrays
+# =========================
+
+def get_bytes(namespace: str, k: str, ext: str = "bin") -> bytes | None:
+    p = path(namespace, k, ext)
+    try:
+        data = p.read_bytes()
+    except OSError:  # ausente ou removido por outro worker
+        _count("misses")
+        return None
+    _count("hits")
+    _touch(p)
+    return data
+
+
+def put_bytes(namespace: str, k: str, data: bytes, ext: str = "bin") -> Path:
+    return _write(path(namespace, k, ext), lambda f: f.write(data))
+
+
+def get_array(namespace: str, k: str) -> np.ndarray | None:
+    """Read-only, memory-mapped array (shared page cache), or None."""
+    p = path(namespace, k, "npy")
+    try:
+        arr = np.load(p, mmap_mode="r")
+    except (OSError, ValueError):
+        _count("misses")
+        return None
+    _count("hits")
+    _touch(p)
+    return arr.view(np.ndarray)
+
+
+def put_array(namespace: str, k: str, arr: np.ndarray) -> np.ndarray:
+    """Store `arr` and return the memory-mapped copy (so this worker shares the pages too)."""
+    p = _write(path(namespace, k, "npy"), lambda f: np.save(f, np.ascontiguousarray(arr)))
+    return np.load(p, mmap_mode="r").view(np.ndarray)
+
+
+def cached_bytes(namespace: str, parts, build, ext: str = "bin") -> bytes:
+    """bytes for `parts`: from any worker's earlier build, else build() and store."""
+    k = key(namespace, *parts)
+    data = get_bytes(namespace, k, ext)
+    if data is None:
+        data = build()
+        put_bytes(namespace, k, data, ext)
+    return data
+
+
+def cached_array(namespace: str, parts, build) -> np.ndarray:
+    """Read-only array for `parts`: memory-mapped from the shared cache, else build() and store."""
+    k = key(namespace, *parts)
+    arr = get_array(namespace, k)
+    return arr if arr is not None else put_array(namespace, k, build())
+
+
+# =========================
+# Tamanho e limpeza
+# =========================
+
+def _files() -> list[tuple[float, int, Path]]:
+    out = []
+    if not CACHE_DIR.exists():
+        return out
+    for p in CACHE_DIR.glob("*/*/*"):
+        if p.name.startswith(".tmp-"):
+            continue
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        out.append((st.st_mtime, st.st_size, p))
+    return out
+
+
+def usage() -> tuple[int, int]:
+    """(files, bytes) currently in the shared cache."""
+    files = _files()
+    return len(files), sum(size for _, size, _ in files)
+
+
+def evict(max_bytes: int | None = None) -> int:
+    """Remove least recently used files until below EVICT_TARGET of the limit; returns files removed."""
+    limit = CACHE_MAX_MB * 2**20 if max_bytes is None else max_bytes
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_DIR / ".lock", "wb") as lock:
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:  # outro worker já está limpando
+                return 0
+        files = sorted(_files())
+        total = sum(size for _, size, _ in files)
+        if total <= limit:
+            return 0
+        removed = 0
+        for _, size, p in files:
+            if total <= limit * EVICT_TARGET:
+                break
+            p.unlink(missing_ok=True)   # quem já abriu (mmap) continua lendo
+            total -= size
+            removed += 1
+    _count("evicted", removed)
+    return removed
+
+
+def stats() -> dict:
+    """Hits/misses/writes/evicted by this process (the directory is shared)."""
+    with _lock:
+        return dict(_stats)
+
+
+def clear():
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Shared on-disk cache of the app workers.")
+    ap.add_argument("--evict", action="store_true", help="remove least recently used files down to the limit")
+    ap.add_argument("--clear", action="store_true", help="delete the whole cache")
+    args = ap.parse_args()
+    if args.clear:
+        clear()
+    elif args.evict:
+        print(f"removed {evict()} files")
+    n, size = usage()
+    print(f"{CACHE_DIR}: {n} files, {size / 2**20:.1f} MB (limit {CACHE_MAX_MB} MB)")
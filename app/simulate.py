@@ -0,0 +1,291 @@
+# simulate.py
+# Simulação reduzida (RC) do shoebox com 3 subzonas (A/B/C) e termostato por
+# subzona, com DIMENSÃO DE LOTE (batch).
+#
+# Um lote = várias configurações de controle (setpoints por subzona, banda
+# morta, sensor Ta ou To) sobre o MESMO ano: clima (epw.py) e irradiância
+# (solar.py) são calculados uma vez e compartilhados. O laço é no tempo
+# (52.560 passos) e cada passo opera sobre arrays (lote x 3 subzonas).
+# A memória é limitada processando o lote em blocos de CHUNK_CASES.
+#
+# Não é o modelo EnergyPlus da tese: é um modelo de 2 nós por subzona
+# (ar + massa) para comparar estratégias de controle de forma relativa.
+import functools
+
+import numpy as np
+
+import model
+import occupancy
+import radiant
+import solar
+from epw import TIMESTEP_MIN, load_weather
+
+ZONES = model.ZONES  # ("A", "B", "C") — A junto à fachada
+
+# -------------------------------------------------
+# Geometria (Zone Model 3: 4.00 x 7.50 x 2.80 m, 3 faixas de 2.50 m)
+# -------------------------------------------------
+ROOM_WIDTH = 4.00
+ZONE_DEPTH = 2.50
+ROOM_HEIGHT = 2.80
+ZONE_AREA = ROOM_WIDTH * ZONE_DEPTH                 # m² de piso por subzona
+FLOOR_AREA = ZONE_AREA * len(ZONES)                 # 30 m²
+FACADE_AREA = ROOM_WIDTH * ROOM_HEIGHT              # 11.2 m²
+
+# -------------------------------------------------
+# Parâmetros térmicos (editáveis)
+# -------------------------------------------------
+AIR_CAPACITY = ZONE_AREA * ROOM_HEIGHT * 1.2 * 1005 * 5.0  # J/K (ar + mobiliário, x5)
+MASS_CAPACITY = 60e3 * 34.0          # J/K por subzona (piso/teto/paredes adiabáticas, ~34 m²)
+H_AIR_MASS = 3.0 * 34.0              # W/K convecção ar <-> massa
+H_INTERZONE = 150.0                  # W/K troca de ar pelas partições virtuais abertas
+H_INFILTRATION = 3.0                 # W/K infiltração (só na fachada)
+H_IN = 8.0                           # W/m²K coef. superficial interno do vidro
+U_GLAZING = {"Laminated": 5.6, "Double Low-E": 1.9}  # W/m²K por tipo (FACADE_ALTS meta)
+U_OPAQUE = 1.0                       # W/m²K parte opaca da fachada (WWR < 100%)
+GLASS_INWARD = 0.3                   # fração da radiação absorvida no vidro que entra
+
+# Radiação solar transmitida: fração que chega à massa de cada subzona
+SOLAR_SPLIT = np.array([0.60, 0.25, 0.15])
+
+INTERNAL_GAINS_W_M2 = 20.0           # pessoas + iluminação + equipamentos (ocupado)
+UNOCCUPIED_GAINS_FRACTION = 0.1
+COOLING_CAPACITY_W = 4000.0          # por subzona (split)
+COOLING_COP = 1.0                    # 1.0 = reporta carga térmica de resfriamento
+
+# PMV (ISO 7730)
+MET = 1.2
+CLO = 0.5
+AIR_SPEED = 0.1
+INDOOR_RH = 60.0
+
+WARMUP_DAYS = 7
+CHUNK_CASES = 64                     # casos por bloco (limita a memória)
+
+
+def pmv(ta, tr, vel=AIR_SPEED, rh=INDOOR_RH, met=MET, clo=CLO, wme=0.0, iterations: int = 30):
+    """Fanger PMV (ISO 7730), vectorized over any array shape."""
+    ta = np.asarray(ta, dtype=float)
+    tr = np.asarray(tr, dtype=float)
+    pa = rh * 10.0 * np.exp(16.6536 - 4030.183 / (ta + 235.0))
+    icl = 0.155 * clo
+    m = met * 58.15
+    mw = m - wme * 58.15
+    fcl = 1.0 + 1.29 * icl if icl <= 0.078 else 1.05 + 0.645 * icl
+    hcf = 12.1 * np.sqrt(vel)
+    taa = ta + 273.0
+    tra = tr + 273.0
+
+    p1 = icl * fcl
+    p2 = p1 * 3.96
+    p3 = p1 * 100.0
+    p4 = p1 * taa
+    p5 = 308.7 - 0.028 * mw + p2 * (tra / 100.0) ** 4
+    xn = (taa + (35.5 - ta) / (3.5 * icl + 0.1)) / 100.0
+    xf = xn
+    for _ in range(iterations):
+        xf = (xf + xn) / 2.0
+        hc = np.maximum(hcf, 2.38 * np.abs(100.0 * xf - taa) ** 0.25)
+        xn = (p5 + p4 * hc - p2 * xf ** 4) / (100.0 + p3 * hc)
+    tcl = 100.0 * xn - 273.0
+
+    hl1 = 3.05e-3 * (5733.0 - 6.99 * mw - pa)
+    hl2 = 0.42 * (mw - 58.15) if mw > 58.15 else 0.0
+    hl3 = 1.7e-5 * m * (5867.0 - pa)
+    hl4 = 0.0014 * m * (34.0 - ta)
+    hl5 = 3.96 * fcl * (xn ** 4 - (tra / 100.0) ** 4)
+    hl6 = fcl * hc * (tcl - ta)
+    ts = 0.303 * np.exp(-0.036 * m) + 0.028
+    return ts * (mw - hl1 - hl2 - hl3 - hl4 - hl5 - hl6)
+
+
+def _facade_inputs(epw_path, facade: dict, timestep_min: int) -> dict:
+    """Per-timestep exogenous series shared by every case of a batch."""
+    w = load_weather(epw_path)
+    shgc, wwr = facade.get("shgc", model.BC_SHGC), facade.get("wwr", model.BC_WWR)
+    shading = facade.get("shading", 0.0)
+    orientation = facade.get("orientation", model.BC_ORIENTATION)
+    u_glass = U_GLAZING.get(facade.get("type", "Laminated"), U_GLAZING["Laminated"])
+
+    irr = solar.load_irradiance(epw_path, orientation, timestep_min)
+    q_sol = solar.solar_gain(irr, shgc, wwr, shading) * FACADE_AREA            # W transmitidos
+    glass_abs = float(np.clip(0.85 - shgc, 0.05, 0.7))
+    i_glass = irr["total"] * (1.0 - shading * solar.SHADING_BEAM_CUT * 0.5)
+    q_abs_m2 = glass_abs * i_glass * GLASS_INWARD                              # W/m² de vidro
+    area_g = wwr * FACADE_AREA
+
+    geom = radiant.Shoebox(depth=ZONE_DEPTH * len(ZONES), width=ROOM_WIDTH, height=ROOM_HEIGHT,
+                           wwr=wwr, sill_m=0.0 if wwr >= 1.0 else 0.8)
+    pts = radiant.zone_points(geom)
+    F = radiant.view_factors(np.array([pts[z] for z in ZONES]), geom)
+    f_glass = F[:, radiant.SURFACES.index("glazing")]
+
+    return {
+        "tout": w.series("dry_bulb", timestep_min),
+        "q_sol": q_sol,
+        "q_abs_air": q_abs_m2 * area_g,
+        "q_abs_m2": q_abs_m2,
+        "ua_facade": u_glass * area_g + U_OPAQUE * (FACADE_AREA - area_g),
+        "u_glass": u_glass,
+        "f_glass": f_glass,
+    }
+
+
+def _simulate_chunk(inp: dict, occ: np.ndarray, sp: np.ndarray, sense_to: np.ndarray,
+                    deadband: np.ndarray, dt: float, keep_flags: bool = False, tick=None) -> dict:
+    B = sp.shape[0]
+    n_steps = len(inp["tout"])
+    day_steps = int(24 * 3600 / dt)
+
+    ca = np.full(3, AIR_CAPACITY / dt)
+    cm = MASS_CAPACITY / dt
+    hz = np.array([[0.0, H_INTERZONE, 0.0], [H_INTERZONE, 0.0, H_INTERZONE], [0.0, H_INTERZONE, 0.0]])
+    hext = np.array([inp["ua_facade"] + H_INFILTRATION, 0.0, 0.0])
+    g_air = ca + H_AIR_MASS + hz.sum(axis=1) + hext
+    f_glass = inp["f_glass"]
+    q_int_occ = INTERNAL_GAINS_W_M2 * ZONE_AREA
+    q_int_free = q_int_occ * UNOCCUPIED_GAINS_FRACTION
+
+    sense_to = sense_to[:, None]
+    lo = sp - deadband[:, None] / 2.0
+    hi = sp + deadband[:, None] / 2.0
+
+    ta = np.full((B, 3), 26.0)
+    tm = np.full((B, 3), 26.0)
+    on = np.zeros((B, 3), dtype=bool)
+    energy = np.zeros(B)
+
+    # passos gravados: só os ocupados, ou todos (flags para outras agendas)
+    rec = np.ones(n_steps, dtype=bool) if keep_flags else occ
+    rec_pos = np.cumsum(rec) - 1
+    buf_ta = np.empty((int(rec.sum()), B, 3), dtype=np.float32)
+    buf_tr = np.empty_like(buf_ta)
+
+    warmup = int(WARMUP_DAYS * 24 * 3600 / dt)
+    # aquecimento: os primeiros dias rodam duas vezes; só a segunda passada conta
+    for it, step in enumerate([*range(warmup), *range(n_steps)]):
+        recording = it >= warmup
+        tout = inp["tout"][step]
+        is_occ = occ[step]
+
+        tm = (cm * tm + H_AIR_MASS * ta + inp["q_sol"][step] * SOLAR_SPLIT) / (cm + H_AIR_MASS)
+
+        q_air = np.array([inp["q_abs_air"][step], 0.0, 0.0]) + (q_int_occ if is_occ else q_int_free)
+        ta_free = (ca * ta + H_AIR_MASS * tm + ta @ hz.T + hext * tout + q_air) / g_air
+
+        tg = ta_free[:, 0] + inp["u_glass"] / H_IN * (tout - ta_free[:, 0]) + inp["q_abs_m2"][step] / H_IN
+        tr = f_glass * tg[:, None] + (1.0 - f_glass) * tm
+
+        if is_occ:
+            sensed = np.where(sense_to, (ta_free + tr) / 2.0, ta_free)
+            on = np.where(on, sensed > lo, sensed > hi)
+            target = np.where(sense_to, 2.0 * lo - tr, lo)
+            q = np.where(on, np.clip(g_air * (ta_free - target), 0.0, COOLING_CAPACITY_W), 0.0)
+            ta = ta_free - q / g_air
+            if recording:
+                energy += q.sum(axis=1) * dt
+        else:
+            # ar-condicionado desligado fora do expediente
+            on[:] = False
+            ta = ta_free
+
+        if recording and rec[step]:
+            k = rec_pos[step]
+            buf_ta[k] = ta
+            buf_tr[k] = tr
+
+        # progresso por dia simulado (tick pode levantar JobCancelled)
+        if tick is not None and recording and (step + 1) % day_steps == 0:
+            tick((step + 1) // day_steps)
+
+    to = (buf_ta + buf_tr) / 2.0
+    pmv_v = pmv(buf_ta, buf_tr)
+    flags = np.stack([to > 26.0, to < 23.0, pmv_v > 0.5, pmv_v < -0.5], axis=-1)   # (passos, B, 3, 4)
+
+    occ_rec = occ[rec]
+    n = max(1, int(occ_rec.sum()))
+    out = {
+        "metrics": flags[occ_rec].sum(axis=0) * (100.0 / n),             # (B, 3, 4)
+        "energy": energy / 3.6e6 / FLOOR_AREA / COOLING_COP,             # kWh/m²·year
+    }
+    if keep_flags:
+        out["flags"] = occupancy.pack(np.moveaxis(flags, 0, -1))         # (B, 3, 4, bytes)
+    return out
+
+
+def _day_tick(progress, first: int, n: int, n_days: int, total: int, day: int):
+    """Progress in case-days: cases before the chunk are done, the chunk's n cases are `day` days in."""
+    progress(first * n_days + n * day, total * n_days)
+
+
+def simulate_batch(epw_path, setpoints, sensing="Ta", deadband=0.0, facade: dict | None = None,
+                   timestep_min: int = TIMESTEP_MIN, chunk: int = CHUNK_CASES,
+                   schedule: occupancy.Schedule | np.ndarray | None = None, flags: bool = False,
+                   progress=None) -> dict:
+    """
+    Run a batch of controller configurations over one year.
+
+    setpoints: (B, 3) per-zone setpoints (A, B, C) or (B,) uniform, °C
+    sensing:   'Ta' / 'To' or (B,) array of them — sensor of each thermostat
+    deadband:  scalar or (B,), °C (0 = ideal modulating control)
+    facade:    shgc / wwr / shading / orientation / type, shared by the batch
+    schedule:  occupancy.Schedule or boolean mask per timestep (default:
+               occupancy.office()) — drives internal gains and HVAC operation
+    flags:     also return per-step discomfort flags as packed bitsets, so
+               percentages over other schedules are occupancy.Schedule.percent(flags)
+
+    Returns {"metrics": (B, 3, 4) % of occupied steps in model.METRICS order,
+             "energy": (B,) kWh/m²·year[, "flags": (B, 3, 4, bytes) uint8]}.
+    progress(done, total) after each simulated day, in case-days.
+    """
+    sp = np.asarray(setpoints, dtype=float)
+    if sp.ndim == 1:
+        sp = np.repeat(sp[:, None], 3, axis=1)
+    B = sp.shape[0]
+    sense_to = np.broadcast_to(np.asarray(sensing) == "To", (B,))
+    db = np.broadcast_to(np.asarray(deadband, dtype=float), (B,))
+
+    inp = _facade_inputs(epw_path, facade or {}, timestep_min)
+    if schedule is None:
+        schedule = occupancy.office(timestep_min=timestep_min)
+    occ = schedule.mask() if isinstance(schedule, occupancy.Schedule) else np.asarray(schedule, dtype=bool)
+    dt = timestep_min * 60.0
+
+    out = {"metrics": np.empty((B, 3, len(model.METRICS))), "energy": np.empty(B)}
+    if flags:
+        out["flags"] = np.empty((B, 3, len(model.METRICS), -(-len(occ) // 8)), dtype=np.uint8)
+    n_days = -(-len(occ) * timestep_min // (24 * 60))
+    for i in range(0, B, chunk):
+        sl = slice(i, min(B, i + chunk))
+        tick = (functools.partial(_day_tick, progress, sl.start, sl.stop - sl.start, n_days, B)
+                if progress else None)
+        res = _simulate_chunk(inp, occ, sp[sl], sense_to[sl], db[sl], dt, keep_flags=flags, tick=tick)
+        for k, v in res.items():
+            out[k][sl] = v
+        if progress:
+            progress(sl.stop * n_days, B * n_days)
+
+    return out
+
+
+def flags_job(job, epw_path, setpoints, sensing="Ta") -> np.ndarray:
+    """Background job (jobs.py): per-step discomfort bitsets of a batch, progress per simulated day."""
+    def progress(done, total):
+        job.check_cancelled()
+        job.report(done, total)
+
+    return simulate_batch(epw_path, setpoints, sensing, flags=True, progress=progress)["flags"]
+
+
+def to_records(result: dict) -> list[dict]:
+    """simulate_batch output -> one record per case (same shape as model.to_record)."""
+    out = []
+    for b in range(len(result["energy"])):
+        out.append({
+            "comfort": {
+                z: {m: round(float(result["metrics"][b, zi, mi]), 1) for mi, m in enumerate(model.METRICS)}
+                for zi, z in enumerate(ZONES)
+            },
+            "energy": round(float(result["energy"][b]), 1),
+        })
+    return out
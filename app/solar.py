@@ -0,0 +1,141 @@
+# solar.py
+# Geometria solar + irradiância na fachada, vetorizada para o ano inteiro.
+#
+# Um único passo NumPy calcula a posição do sol e a irradiância direta/difusa
+# numa fachada vertical de orientação qualquer, para cada timestep de 10 min
+# (52.560 passos). Os resultados ficam em cache por (clima, orientação,
+# timestep) no processo e no cache compartilhado (shared.py, mmap) — é a
+# entrada comum de qualquer estimativa de conforto/energia e não deve ser
+# recalculada a cada requisição nem copiada em cada worker.
+import functools
+from pathlib import Path
+
+import numpy as np
+
+import model
+import shared
+from dataset import FACADE_ALTS
+from epw import Site, TIMESTEP_MIN, load_weather, steps_per_year, upsample
+
+APP_DIR = Path(__file__).resolve().parent          # .../app
+ROOT_DIR = APP_DIR.parent                          # .../thesis_sim
+WEATHER_DIR = ROOT_DIR / "assets" / "weather"
+# Arquivos EPW (ex.: Fortaleza, ASHRAE 0A). Não versionados no repositório.
+
+ALBEDO = 0.2            # refletância do solo
+IRRADIANCE_VERSION = 1  # mude ao alterar facade_irradiance: invalida o cache compartilhado
+IRRADIANCE_KEYS = ("beam", "diffuse", "ground", "total")
+
+# Sombreamento externo "100%": corta a componente direta e parte da difusa
+SHADING_BEAM_CUT = 1.0
+SHADING_DIFFUSE_CUT = 0.5
+
+
+def step_times(timestep_min: int = TIMESTEP_MIN) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (day_of_year 1..365, clock hour at the step midpoint) for every timestep.
+    EnergyPlus timesteps END at the stamp, so the midpoint is (k + 0.5) * dt.
+    """
+    t_h = (np.arange(steps_per_year(timestep_min)) + 0.5) * timestep_min / 60.0
+    doy = np.floor(t_h / 24.0).astype(int) + 1
+    return doy, t_h - 24.0 * (doy - 1)
+
+
+def sun_position(site: Site, doy, clock_h) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Solar zenith and azimuth (degrees; azimuth from North, clockwise) for
+    arrays of day-of-year and local standard clock time (Spencer, 1971).
+    """
+    doy = np.asarray(doy, dtype=float)
+    B = 2.0 * np.pi * (doy - 1.0) / 365.0
+    decl = (0.006918 - 0.399912 * np.cos(B) + 0.070257 * np.sin(B)
+            - 0.006758 * np.cos(2 * B) + 0.000907 * np.sin(2 * B)
+            - 0.002697 * np.cos(3 * B) + 0.00148 * np.sin(3 * B))
+    eot_min = 229.18 * (0.000075 + 0.001868 * np.cos(B) - 0.032077 * np.sin(B)
+                        - 0.014615 * np.cos(2 * B) - 0.04089 * np.sin(2 * B))
+
+    solar_h = np.asarray(clock_h, dtype=float) + (4.0 * (site.longitude - 15.0 * site.tz) + eot_min) / 60.0
+    omega = np.radians(15.0 * (solar_h - 12.0))
+    phi = np.radians(site.latitude)
+
+    cos_z = np.cos(phi) * np.cos(decl) * np.cos(omega) + np.sin(phi) * np.sin(decl)
+    zenith = np.degrees(np.arccos(np.clip(cos_z, -1.0, 1.0)))
+    azimuth = (np.degrees(np.arctan2(np.sin(omega), np.cos(omega) * np.sin(phi) - np.tan(decl) * np.cos(phi))) + 180.0) % 360.0
+    return zenith, azimuth
+
+
+def facade_irradiance(site: Site, dni, dhi, ghi, orientation,
+                      timestep_min: int = TIMESTEP_MIN, albedo: float = ALBEDO) -> dict:
+    """
+    Irradiance (W/m²) on vertical facades for every timestep of the year.
+    dni/dhi/ghi: hourly EPW series (8760) or already upsampled. orientation: outward normal azimuth
+    from North (90 = East); scalar or array -> outputs shaped (T,) or (n_orient, T).
+    Isotropic sky: beam·cosθ + DHI/2 + ρ·GHI/2.
+    """
+    doy, clock_h = step_times(timestep_min)
+    zenith, azimuth = sun_position(site, doy, clock_h)
+    dni, dhi, ghi = (x if len(x) == len(doy) else upsample(x, timestep_min) for x in (dni, dhi, ghi))
+
+    psi = np.radians(np.atleast_1d(np.asarray(orientation, dtype=float)))[:, None]
+    sun_up = zenith < 90.0
+    cos_inc = np.sin(np.radians(zenith)) * np.cos(np.radians(azimuth) - psi)
+
+    beam = np.where(sun_up, dni * np.clip(cos_inc, 0.0, None), 0.0)
+    diffuse = np.broadcast_to(0.5 * dhi, beam.shape)
+    ground = np.broadcast_to(0.5 * albedo * ghi, beam.shape)
+
+    out = {"beam": beam, "diffuse": diffuse, "ground": ground, "total": beam + diffuse + ground}
+    if np.ndim(orientation) == 0:
+        out = {k: v[0] for k, v in out.items()}
+    return out
+
+
+def solar_gain(irr: dict, shgc: float, wwr: float, shading: float = 0.0) -> np.ndarray:
+    """Transmitted solar gain per m² of facade (W/m²) for given glazing/shading."""
+    beam = irr["beam"] * (1.0 - shading * SHADING_BEAM_CUT)
+    diffuse = (irr["diffuse"] + irr["ground"]) * (1.0 - shading * SHADING_DIFFUSE_CUT)
+    return shgc * wwr * (beam + diffuse)
+
+
+# =========================
+# Clima (EPW) + cache
+# =========================
+
+def _weather_key(epw_path) -> tuple[str, int, int]:
+    p = Path(epw_path).resolve()
+    st = p.stat()
+    return str(p), st.st_mtime_ns, st.st_size
+
+
+@functools.lru_cache(maxsize=32)
+def _irradiance_cached(weather_key: tuple, orientation: float, timestep_min: int) -> dict:
+    def build():
+        w = load_weather(weather_key[0])
+        irr = facade_irradiance(w.site, *(w.series(c, timestep_min) for c in ("dni", "dhi", "ghi")),
+                                orientation, timestep_min, ALBEDO)
+        return np.stack([irr[k] for k in IRRADIANCE_KEYS])
+
+    # uma matriz (4 x passos) por caso, aberta com mmap: linhas contíguas e só leitura
+    stack = shared.cached_array("irradiance", (IRRADIANCE_VERSION, *weather_key, orientation, timestep_min, ALBEDO),
+                                build)
+    return dict(zip(IRRADIANCE_KEYS, stack))
+
+
+def load_irradiance(epw_path, orientation: float = model.BC_ORIENTATION,
+                    timestep_min: int = TIMESTEP_MIN) -> dict:
+    """Cached facade irradiance for (weather file, orientation, timestep); read-only arrays."""
+    return _irradiance_cached(_weather_key(epw_path), float(orientation) % 360.0, int(timestep_min))
+
+
+def facade_alt_gains(epw_path, orientation: float = model.BC_ORIENTATION,
+                     timestep_min: int = TIMESTEP_MIN) -> dict[str, np.ndarray]:
+    """Solar gain series for every FACADE_ALTS entry (SHGC/WWR/shading from its meta)."""
+    irr = load_irradiance(epw_path, orientation, timestep_min)
+    return {alt["id"]: solar_gain(irr, **model.facade_params(alt)) for alt in FACADE_ALTS}
+
+
+def orientation_factors(epw_path, orientations=tuple(model.ORIENTATION_FACTOR)) -> dict:
+    """Annual facade irradiation relative to East — same shape as model.ORIENTATION_FACTOR."""
+    annual = {o: float(load_irradiance(epw_path, o)["total"].sum()) for o in orientations}
+    east = float(load_irradiance(epw_path, 90.0)["total"].sum())
+    return {o: round(v / east, 3) for o, v in annual.items()}
@@ -0,0 +1,482 @@
+# static_site.py
+# Exporta o app inteiro (5 abas) como um site estático HTML/JS, servível de
+# qualquer hospedagem de arquivos (GitHub Pages, S3, Netlify...) sem Python.
+#
+#   python app/static_site.py                  # gera site/
+#   python -m http.server -d site 8000         # pré-visualização local
+#
+# Os resultados são somente leitura: todas as figuras que o app mostra a
+# partir das tabelas da tese (export.scenarios()) são construídas aqui pelos
+# mesmos construtores de figures.py e embutidas no index.html como JSON
+# compacto — uma figura base por construtor + só as diferenças de cada
+# cenário (cores das zonas, textos, cores das barras). No navegador, os
+# widgets (rádios, slider, seletor, dots da Tab 4) montam o nome do cenário
+# e o Plotly.js redesenha (Plotly.react). O estilo vem do bloco STYLE do
+# thesis.py (lido sem executar o app) e do theme.py.
+#
+# Fica de fora o que precisa de Python no servidor: simulação em lote,
+# estudos de orientação, sensibilidade, otimizador e agenda de ocupação.
+import argparse
+import ast
+import hashlib
+import html
+import json
+import shutil
+from pathlib import Path
+
+import plotly
+import plotly.graph_objects as go
+
+import theme
+from content import (
+    AI_NOTE, AUTHOR, BASE_CASE_LINES, FOOTER, TAB_LABELS, TITLE, ZONE_MODELS, ZONING_LINES, fragment,
+)
+from dataset import ASSETS_DIR, ENERGY_FACADE_TA, ENERGY_FACADE_TO26, ENERGY_TA, ENERGY_TO, FACADE_ALTS
+from export import build_figure, scenarios
+from figures import PLAN_PLACEHOLDER_TO
+
+APP_DIR = Path(__file__).resolve().parent          # .../app
+ROOT_DIR = APP_DIR.parent                          # .../thesis_sim
+SITE_DIR = ROOT_DIR / "site"
+THESIS = APP_DIR / "thesis.py"
+
+PLOTLY_JS = Path(plotly.__file__).parent / "package_data" / "plotly.min.js"
+PLOT_CONFIG = {"displaylogo": False, "responsive": True}
+
+# Estado inicial dos widgets (= padrões do thesis.py)
+DEFAULTS = {
+    "t2_model": next(iter(ZONE_MODELS)),
+    "t3_mode": "To", "t3_kind": "Ta", "t3_sp_Ta": 21, "t3_sp_To": 26, "t3_ref_Ta": 23, "t3_ref_To": 23,
+    "t4_mode": "To", "t4_ctrl": "Ta", "t4_sp": 21, "t4_ref": "ALT3", "t4_alt": "ALT3",
+}
+
+# Layout da página (o theme.py cobre subtítulos, textos longos e tabelas)
+SITE_CSS = """
+body { margin: 0; font-family: "Source Sans Pro", "Segoe UI", Helvetica, Arial, sans-serif; color: #31333f; }
+main { max-width: 1500px; margin: 0 auto; padding: 2rem 3rem 1rem; }
+h2 { font-size: 1.75rem; font-weight: 700; }
+h4 { font-size: 1.05rem; margin: 0.9rem 0 0.2rem; }
+.tabs { display: flex; gap: 1.6rem; border-bottom: 1px solid #e6e6ea; margin: 0.6rem 0 1rem; }
+.tabs button { all: unset; cursor: pointer; padding: 0.5rem 0; font-size: 0.95rem; border-bottom: 2px solid transparent; }
+.tabs button.active { color: #ff4b4b; border-bottom-color: #ff4b4b; }
+.panel { display: none; }
+.panel.active { display: block; }
+.row { display: grid; gap: 1rem; align-items: start; }
+.row.large { gap: 3rem; }
+.radio { display: flex; flex-direction: column; gap: 0.25rem; font-size: 0.95rem; }
+.radio.horizontal { flex-direction: row; flex-wrap: wrap; gap: 0.9rem; }
+.radio label, .slider label { cursor: pointer; }
+.radio input { accent-color: #ff4b4b; }
+.widget-label { font-size: 0.9rem; margin: 0.4rem 0 0.25rem; }
+.slider input { width: 100%; accent-color: #ff4b4b; }
+.slider output { font-weight: 600; color: #ff4b4b; }
+select { font: inherit; padding: 0.35rem 0.5rem; border-radius: 0.4rem; border: 1px solid #d6d6d9; width: 100%; }
+.info, .warning { padding: 0.75rem 1rem; border-radius: 0.5rem; font-size: 0.95rem; margin: 0.4rem 0; }
+.info { background: #e8f2fc; color: #0c4a8a; }
+.warning { background: #fffce7; color: #926c05; }
+.caption { font-size: 0.85rem; color: #808495; margin: 0.25rem 0; }
+hr.divider { border: 0; border-top: 1px solid #e6e6ea; margin: 1.2rem 0; }
+.dot { all: unset; cursor: pointer; display: flex; justify-content: center; align-items: center; width: 100%; height: {FACADE_DOT_SIZE}px; }
+.dot::before { content: ""; width: {dot_px}px; height: {dot_px}px; border-radius: 1px; border: 1px solid rgba(0,0,0,0.35); }
+.dot:hover::before { background: #ccc; border-color: #666; }
+.dot.active::before { background: #d33; border-color: #d33; }
+[hidden] { display: none !important; }
+"""
+
+# Comportamento no navegador: estado dos widgets -> nome do cenário -> Plotly.react
+SCRIPT = r"""
+(function () {
+  const D = JSON.parse(document.getElementById("site-data").textContent);
+  const state = Object.assign({}, D.defaults);
+  let tab = 0;
+
+  function figure(name) {
+    const spec = D.figures[name];
+    if (!spec) return null;
+    const fig = structuredClone(D.base[spec[0]]);
+    for (const [path, value] of spec[1]) {
+      let node = fig;
+      for (const k of path.slice(0, -1)) node = node[k];
+      node[path[path.length - 1]] = value;
+    }
+    fig.layout.template = D.template;
+    return fig;
+  }
+
+  function draw(id, fig) {
+    const el = document.getElementById(id);
+    el.hidden = !fig;
+    if (fig) Plotly.react(el, fig.data, fig.layout, D.config);
+  }
+
+  function pct(a, r) {
+    if (a == null || !r) return null;
+    const d = (a - r) / r * 100;
+    return (d >= 0 ? "+" : "") + d.toFixed(2) + "%";
+  }
+
+  function info(id, delta) {
+    const el = document.getElementById(id);
+    el.hidden = delta == null;
+    if (delta != null) el.innerHTML = "Relative change vs reference: <b>" + delta + "</b>";
+  }
+
+  const renderers = {
+    2: function () {
+      const kind = state.t3_kind, sp = state["t3_sp_" + kind], ref = state["t3_ref_" + kind];
+      draw("t3-plan", figure("tab3/plan_" + kind + sp + "_" + state.t3_mode));
+      draw("t3-energy", figure("tab3/energy_" + kind + sp + "_ref" + ref));
+      info("t3-delta", pct(D.energy[kind][sp], D.energy[kind][ref]));
+    },
+    3: function () {
+      const ta = state.t4_ctrl === "Ta", alt = state.t4_alt;
+      const table = ta ? D.energy.facade["Ta" + state.t4_sp] : D.energy.facade.To26;
+      const energy = figure(ta ? "tab4/energy_Ta" + state.t4_sp + "_" + alt : "tab4/energy_To26_" + alt);
+      draw("t4-plan", ta ? figure("tab4/plan_Ta" + state.t4_sp + "_" + alt + "_" + state.t4_mode)
+                         : figure("tab4/plan_placeholder"));
+      draw("t4-energy", energy);
+      document.getElementById("t4-missing").hidden = !!energy;
+      info("t4-delta", energy ? pct(table[alt], table[state.t4_ref]) : null);
+      document.querySelectorAll(".dot").forEach(function (b) {
+        b.classList.toggle("active", b.dataset.alt === alt);
+      });
+    },
+  };
+
+  function sync() {
+    document.querySelectorAll("[data-show]").forEach(function (el) {
+      const [key, value] = el.dataset.show.split("=");
+      el.hidden = String(state[key]) !== value;
+    });
+    document.querySelectorAll(".slider output").forEach(function (o) {
+      o.textContent = state[o.dataset.for];
+    });
+    if (renderers[tab]) renderers[tab]();
+  }
+
+  document.querySelectorAll("[data-state]").forEach(function (el) {
+    el.addEventListener(el.type === "range" ? "input" : "change", function () {
+      const v = el.value;
+      state[el.dataset.state] = el.dataset.number ? Number(v) : v;
+      sync();
+    });
+  });
+  document.querySelectorAll(".dot").forEach(function (b) {
+    b.addEventListener("click", function () { state.t4_alt = b.dataset.alt; sync(); });
+  });
+  document.querySelectorAll(".tabs button").forEach(function (b, i) {
+    b.addEventListener("click", function () {
+      tab = i;
+      document.querySelectorAll(".tabs button").forEach(function (x, j) { x.classList.toggle("active", j === i); });
+      document.querySelectorAll(".panel").forEach(function (p, j) { p.classList.toggle("active", j === i); });
+      sync();
+    });
+  });
+  sync();
+})();
+"""
+
+
+# =========================
+# Dados (figuras base + diferenças por cenário)
+# =========================
+
+def style_constants() -> dict:
+    """UPPERCASE literal constants of thesis.py (the STYLE block), read without running the app."""
+    out = {}
+    for node in ast.parse(THESIS.read_text(encoding="utf-8")).body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            name = node.targets[0].id
+            if name.isupper():
+                try:
+                    out[name] = ast.literal_eval(node.value)
+                except ValueError:  # expressões (caminhos etc.)
+                    pass
+    return out
+
+
+def _plain(fig: go.Figure) -> dict:
+    return json.loads(fig.to_json())
+
+
+def diff(base, other, path=()) -> list:
+    """[[path, value], ...] turning `base` into `other` (whole subtree where the shapes differ)."""
+    if isinstance(base, dict) and isinstance(other, dict) and base.keys() == other.keys():
+        return [op for k in base for op in diff(base[k], other[k], (*path, k))]
+    if isinstance(base, list) and isinstance(other, list) and len(base) == len(other):
+        return [op for i, (a, b) in enumerate(zip(base, other)) for op in diff(a, b, (*path, i))]
+    return [] if base == other else [[list(path), other]]
+
+
+def site_data() -> dict:
+    """Everything the page needs: base figures, per-scenario patches, energy tables and defaults."""
+    base, figures, template = {}, {}, None
+    specs = [*scenarios(), {"name": "tab4/plan_placeholder", "builder": "make_plan_placeholder",
+                            "kwargs": {"message": PLAN_PLACEHOLDER_TO}}]
+    for spec in specs:
+        fig = _plain(build_figure(spec))
+        template = fig["layout"].pop("template", template)
+        builder = spec["builder"]
+        base.setdefault(builder, fig)
+        figures[spec["name"]] = [builder, diff(base[builder], fig)]
+
+    return {
+        "base": base,
+        "figures": figures,
+        "template": template,
+        "config": PLOT_CONFIG,
+        "defaults": DEFAULTS,
+        "energy": {
+            "Ta": ENERGY_TA,
+            "To": ENERGY_TO,
+            "facade": {**{f"Ta{sp}": v for sp, v in ENERGY_FACADE_TA.items()}, "To26": ENERGY_FACADE_TO26},
+        },
+    }
+
+
+# =========================
+# HTML (mesmo layout das abas do thesis.py)
+# =========================
+
+def _e(text) -> str:
+    return html.escape(str(text), quote=True)
+
+
+def _row(weights, *cols, large=False) -> str:
+    grid = " ".join(f"{w}fr" for w in weights)
+    cls = "row large" if large else "row"
+    return f'<div class="{cls}" style="grid-template-columns:{grid};">' + "".join(f"<div>{c}</div>" for c in cols) + "</div>"
+
+
+def _radio(key: str, options, labels=None, horizontal=False, label="", number=False) -> str:
+    labels = labels or [str(o) for o in options]
+    num = ' data-number="1"' if number else ""
+    items = "".join(
+        f'<label><input type="radio" name="{key}" value="{_e(o)}" data-state="{key}"{num}'
+        f'{" checked" if o == DEFAULTS[key] else ""}> {_e(lab)}</label>'
+        for o, lab in zip(options, labels)
+    )
+    head = f'<div class="widget-label">{_e(label)}</div>' if label else ""
+    return f'{head}<div class="radio{" horizontal" if horizontal else ""}">{items}</div>'
+
+
+def _slider(key: str, label: str, lo: int, hi: int) -> str:
+    return (f'<div class="slider"><div class="widget-label">{_e(label)} <output data-for="{key}"></output></div>'
+            f'<input type="range" min="{lo}" max="{hi}" step="1" value="{DEFAULTS[key]}" '
+            f'data-state="{key}" data-number="1"></div>')
+
+
+def _img(name: str, style: str = "") -> str:
+    return f'<img src="img/{_e(name)}" alt="" style="{style}">'
+
+
+def _plan_caption(s: dict) -> str:
+    return (f'<div style="text-align:center; font-size:{s["PLAN_CAPTION_SIZE"]}px; '
+            f'margin-top:{s["PLAN_CAPTION_MARGIN_TOP"]}px; color:{s["PLAN_CAPTION_COLOR"]}; line-height:1.1;">'
+            f'{_e(s["PLAN_CAPTION_TEXT"])}</div>')
+
+
+def _heading(title: str, subtitle: str = "") -> str:
+    sub = f'<div class="subtitle">{_e(subtitle)}</div>' if subtitle else ""
+    return f"<h4>{_e(title)}</h4>{sub}"
+
+
+def tab_summary() -> str:
+    return (f'<div class="sum-wrap">{fragment("summary")}'
+            f'<div class="sum-note">{_e(AI_NOTE)}</div>'
+            '<div class="sum-note">References: See original paper (link will be available soon).</div></div>')
+
+
+def tab_zoning(s: dict) -> str:
+    blocks = []
+    for name, cfg in ZONE_MODELS.items():
+        num = name.replace("Zone Model ", "").strip()
+        stage_h = max(s["TZ_PLAN_STAGE_MIN_H_PX"], s["TZ_PLAN_STAGE_H_PX"] + min(0, s["TZ_PLAN_OFFSET_Y_PX"]))
+        pad = s["TZ_PLAN_PAD_PX"]
+        left = (
+            _img(cfg["iso"], f'width:{s["TZ_ISO_WIDTH_PX"]}px; max-width:100%;')
+            + f'<div style="height:{s["TZ_ISO_PLAN_GAP_PX"]}px"></div>'
+            + f'<div style="width:{s["TZ_LEFT_MAX_WIDTH_PX"]}px; max-width:100%; position:relative; '
+              f'overflow:{"hidden" if s["TZ_PLAN_CLIP"] else "visible"}; height:{stage_h}px; padding:{pad}px; box-sizing:border-box;">'
+            + _img(cfg["plan"], f'width:{s["TZ_PLAN_WIDTH_PX"]}px; height:auto; position:absolute; left:{pad}px; top:{pad}px; '
+                                f'transform:translate({s["TZ_PLAN_OFFSET_X_PX"]}px, {s["TZ_PLAN_OFFSET_Y_PX"]}px); '
+                                f'transform-origin:top left; z-index:{s["TZ_PLAN_ZINDEX"]}; pointer-events:none;')
+            + "</div>"
+        )
+        right = (
+            _row([1, 1], _img(cfg["to"], f'width:{s["TZ_PLOT_TO_WIDTH_PX"]}px; max-width:100%;'),
+                 _img(cfg["pmv"], f'width:{s["TZ_PLOT_PMV_WIDTH_PX"]}px; max-width:100%;'), large=True)
+            + f'<div style="margin-top:6px; font-size:{s["TZ_LEGEND_FONT_PX"]}px; color:#333; white-space:nowrap;">'
+              f'Zone Model {_e(num)} performance for To and PMV: annual hourly frequency during occupied periods above and below thresholds</div>'
+            + f'<div style="font-size:{s["TZ_THRESH_FONT_PX"]}px; color:#666; line-height:1.35; margin-top:4px;">'
+              "* To &lt; 23°C | To &gt; 23°C<br>* PMV &lt; −0.5 | PMV &gt; +0.5</div>"
+        )
+
+        def section(title, lines):
+            return (f'<div style="font-weight:700; color:{s["TZ_SECTION_TITLE_COLOR"]};">{_e(title)}</div>'
+                    f'<hr style="margin:{s["TZ_DIVIDER_MARGIN_PX"]}px 0;">'
+                    f'<div style="font-size:{s["TZ_TEXT_FONT_PX"]}px; color:#222; line-height:1.5;">'
+                    + "<br>".join(_e(t) for t in lines) + "</div>")
+
+        ratios = [s["TZ_LEFT_COL_RATIO"], s["TZ_RIGHT_COL_RATIO"]]
+        blocks.append(
+            f'<div data-show="t2_model={_e(name)}">'
+            + _row(ratios, left, right, large=True)
+            + '<div style="height:18px"></div>'
+            + _row(ratios, section("Model: main characteristics", ZONING_LINES),
+                   _row([1, 1], section(f"Zone Model {num}", [f"- {t}" for t in cfg["desc"]]),
+                        section("Outcomes", [f"- {t}" for t in cfg["outcomes"]]), large=True), large=True)
+            + "</div>"
+        )
+    options = "".join(f'<option value="{_e(n)}">{_e(n)}</option>' for n in ZONE_MODELS)
+    select = f'<div style="max-width:{s["TZ_DROPDOWN_WIDTH_PX"]}px;"><select data-state="t2_model">{options}</select></div>'
+    return select + f'<div style="height:{s["TZ_TOP_SPACER_PX"]}px"></div>' + "".join(blocks)
+
+
+def tab_control(s: dict) -> str:
+    right = (
+        _heading("THERMAL COMFORT PARAMETER", "*Percentage of occupied hours in a year above and below thermal comfort thresholds")
+        + _radio("t3_mode", ["To", "PMV"])
+        + _heading("TEMPERATURE CONTROL", "*Choose thermostat control type")
+        + _radio("t3_kind", ["Ta", "To"], ["Air-temperature thermostat (Ta)", "Operative-temperature thermostat (To)"])
+        + _heading("SETPOINT")
+        + f'<div data-show="t3_kind=Ta">{_slider("t3_sp_Ta", "Ta setpoint (°C)", 19, 24)}</div>'
+        + f'<div data-show="t3_kind=To">{_slider("t3_sp_To", "To setpoint (°C)", 22, 27)}</div>'
+        + _heading("COOLING ENERGY USE")
+        + f'<div data-show="t3_kind=Ta">{_radio("t3_ref_Ta", sorted(ENERGY_TA), horizontal=True, label="Reference (Ta)", number=True)}</div>'
+        + f'<div data-show="t3_kind=To">{_radio("t3_ref_To", sorted(ENERGY_TO), horizontal=True, label="Reference (To)", number=True)}</div>'
+        + '<div class="info" id="t3-delta"></div><div id="t3-energy"></div>'
+    )
+    img = (
+        f'<div style="width:100%; max-width:{s["BC_IMG_MAX_COL_W_PX"]}px; display:flex; flex-direction:column; '
+        f'align-items:center; margin-top:{s["BC_IMG_MARGIN_TOP_PX"]}px;">'
+        f'<div style="width:100%; display:flex; justify-content:'
+        f'{ {"left": "flex-start", "right": "flex-end"}.get(s["BC_IMG_ALIGN"], s["BC_IMG_ALIGN"]) };">'
+        + _img("shoeboxmodel.png", f'width:{s["BC_IMG_WIDTH_PX"]}px; height:auto; transform:translateX({s["BC_IMG_OFFSET_X_PX"]}px);')
+        + f'</div><div style="font-size:{s["BC_IMG_CAPTION_SIZE"]}px; color:{s["BC_IMG_CAPTION_COLOR"]}; text-align:center; '
+          f'margin-top:4px; max-width:{s["BC_IMG_WIDTH_PX"]}px;">Representation of an office workspace modelled as a “shoe-box”</div></div>'
+    )
+    left = (
+        '<div id="t3-plan"></div>' + _plan_caption(s)
+        + f'<div style="font-weight:700; color:{s["BC_TITLE_COLOR"]}; margin-bottom:4px;">Base case model (BC): main characteristics</div>'
+        + f'<div style="max-width:{s["BC_BLOCK_MAX_WIDTH_PX"]}px;"><hr style="margin:{s["BC_DIVIDER_MARGIN_PX"]}px 0;"></div>'
+        + _row([2.2, 1.0], f'<div style="font-size:{s["BC_TEXT_FONT_PX"]}px; color:#222; line-height:1.5;">'
+                           + "<br>".join(_e(t) for t in BASE_CASE_LINES) + "</div>", img)
+    )
+    return _row([2.2, 1.0], left, right, large=True)
+
+
+def tab_facade(s: dict) -> str:
+    labels = [a["label"].replace("\n", " ") for a in FACADE_ALTS]
+    ids = [a["id"] for a in FACADE_ALTS]
+    right = (
+        _heading("THERMAL COMFORT PARAMETER", "*Percentage of occupied hours in a year above and below thermal comfort thresholds")
+        + _radio("t4_mode", ["To", "PMV"])
+        + _heading("TEMPERATURE CONTROL", "*Choose thermostat control type")
+        + _radio("t4_ctrl", ["Ta", "To"], ["Air-temperature thermostat (Ta)", "Operative-temperature thermostat (Cooling energy use only)"])
+        + _heading("SETPOINT")
+        + f'<div data-show="t4_ctrl=Ta">{_radio("t4_sp", sorted(ENERGY_FACADE_TA), horizontal=True, label="Ta setpoint (°C)", number=True)}</div>'
+        + '<div data-show="t4_ctrl=To"><div class="widget-label">To setpoint (°C)</div>'
+          '<div class="radio horizontal"><label><input type="radio" checked> 26</label></div></div>'
+        + _heading("COOLING ENERGY USE")
+        + _radio("t4_ref", ids, labels, label="Reference (Facade Design)")
+        + '<div class="warning" id="t4-missing">Cooling energy chart for Ta=23°C is not available yet.</div>'
+        + '<div class="info" id="t4-delta"></div><div id="t4-energy"></div>'
+        + '<div class="caption" data-show="t4_ctrl=To">*Thermal comfort (false-color plan) is available for Ta only. '
+          'To mode shows cooling energy use only.</div>'
+    )
+    img_w = max(80, int(520 * s["FACADE_IMG_SCALE"]))
+    grid = [0.55, 1, 1, 1, 1, 1]
+    meta_style = f'text-align:center; font-size:{s["FACADE_META_SIZE"]}px; line-height:1.55;'
+    left = (
+        '<div id="t4-plan"></div>' + _plan_caption(s) + '<hr class="divider">'
+        + _heading("FACADE DESIGN ALTERNATIVES")
+        + _row(grid, "", *(f'<button class="dot" data-alt="{_e(a)}" aria-label="{_e(a)}"></button>' for a in ids))
+        + _row(grid, "", *(f'<div style="text-align:center">{_img(Path(a["img"]).name, f"width:{img_w}px; max-width:100%;")}</div>'
+                           for a in FACADE_ALTS))
+        + _row(grid, "", *(f'<div style="text-align:center; font-size:{s["FACADE_TITLE_SIZE"]}px; line-height:1.15;">'
+                           + "<br>".join(_e(t) for t in a["label"].split("\n")) + "</div>" for a in FACADE_ALTS))
+        + '<div style="height:8px"></div>'
+        + _row(grid, f'<div style="font-size:{s["FACADE_TABLE_LABEL_SIZE"]}px; line-height:1.55;">'
+                     "<b>SHGC</b><br><b>WWR</b><br><b>Type</b><br><b>Shading</b></div>",
+               *(f'<div style="{meta_style}">' + "<br>".join(_e(a["meta"][k]) for k in ("SHGC", "WWR", "Type", "Shading"))
+                 + "</div>" for a in FACADE_ALTS))
+    )
+    return _row([2.2, 1.0], left, right, large=True)
+
+
+def tab_conclusions() -> str:
+    return (f'<div class="conc-wrap"><h3>Conclusions &amp; Contribution</h3>{fragment("conclusions")}'
+            f'<div class="conc-note">{_e(AI_NOTE)}</div></div>')
+
+
+def page(s: dict, data: dict, css_href: str, js_href: str, plotly_href: str) -> str:
+    tabs = "".join(f'<button class="{"active" if i == 0 else ""}">{_e(t)}</button>' for i, t in enumerate(TAB_LABELS))
+    panels = [tab_summary(), tab_zoning(s), tab_control(s), tab_facade(s), tab_conclusions()]
+    body = "".join(f'<section class="panel{" active" if i == 0 else ""}">{p}</section>' for i, p in enumerate(panels))
+    payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False).replace("</", "<\\/")
+    footer = "".join(f'<div class="caption">{_e(t)}</div>' for t in FOOTER)
+    return (
+        '<!DOCTYPE html>\n<html lang="en"><head><meta charset="utf-8">'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        f'<title>THESIS_SIM</title><link rel="stylesheet" href="{css_href}"></head><body><main>'
+        f"<h2>{_e(TITLE)}</h2><p><b>{_e(AUTHOR)}</b></p>"
+        f'<nav class="tabs">{tabs}</nav>{body}<hr class="divider">{footer}</main>'
+        f'<script type="application/json" id="site-data">{payload}</script>'
+        f'<script src="{plotly_href}"></script><script src="{js_href}"></script></body></html>\n'
+    )
+
+
+# =========================
+# Build
+# =========================
+
+def _publish(out: Path, stem: str, suffix: str, content: bytes) -> str:
+    """assets/<stem>.<hash><suffix>: cacheable forever by the host/browser."""
+    name = f"assets/{stem}.{hashlib.sha256(content).hexdigest()[:12]}{suffix}"
+    (out / name).write_bytes(content)
+    return name
+
+
+def build(out: Path = SITE_DIR) -> dict:
+    """Write the static site into `out` (replacing it). Returns {file: bytes}."""
+    out = Path(out)
+    if out.exists():
+        shutil.rmtree(out)
+    (out / "assets").mkdir(parents=True)
+    (out / "img").mkdir()
+
+    s = style_constants()
+    style = {k: s[k] for k in ("FACADE_DOT_SIZE", "SUBTITLE_SIZE", "SUBTITLE_COLOR",
+                               "SUBTITLE_MARGIN_BOTTOM", "TZ_DROPDOWN_WIDTH_PX")}
+    css = theme.stylesheet(**style) + SITE_CSS.replace("{FACADE_DOT_SIZE}", str(s["FACADE_DOT_SIZE"])) \
+                                              .replace("{dot_px}", str(s["FACADE_DOT_SIZE"] - 3))
+    css_href = _publish(out, "site", ".css", css.encode("utf-8"))
+    js_href = _publish(out, "site", ".js", SCRIPT.encode("utf-8"))
+    plotly_href = _publish(out, f"plotly-{plotly.__version__}", ".min.js", PLOTLY_JS.read_bytes())
+
+    images = {"shoeboxmodel.png", *(Path(a["img"]).name for a in FACADE_ALTS),
+              *(cfg[k] for cfg in ZONE_MODELS.values() for k in ("iso", "plan", "to", "pmv"))}
+    for name in sorted(images):
+        src = ASSETS_DIR / name
+        if src.exists():
+            shutil.copy2(src, out / "img" / name)
+        else:
+            print(f"warning: missing {src.relative_to(ROOT_DIR)}")
+
+    (out / "index.html").write_text(page(s, site_data(), css_href, js_href, plotly_href), encoding="utf-8")
+    return {str(p.relative_to(out)): p.stat().st_size for p in sorted(out.rglob("*")) if p.is_file()}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Export the app as a static HTML/JS site.")
+    ap.add_argument("--out", default=str(SITE_DIR))
+    args = ap.parse_args(argv)
+    files = build(Path(args.out))
+    total = sum(files.values())
+    print(f"{len(files)} files, {total / 1e6:.1f} MB in {args.out} "
+          f"(index.html {files['index.html'] / 1e3:.0f} kB)")
+
+
+if __name__ == "__main__":
+    main()
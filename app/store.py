@@ -0,0 +1,91 @@
+# store.py
+# Armazenamento de resultados por conteúdo (content-addressed).
+#
+# Cada caso é gravado em results/cases/<hh>/<hash>.json, onde <hash> é o
+# sha256 das entradas (backend + parâmetros). Reexecuções pulam o que já
+# existe. Os jobs do app (sweep, simulação em lote) gravam aqui; quem lê
+# são download.py (export do cubo de resultados) e api.py (API local).
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent          # .../app
+ROOT_DIR = APP_DIR.parent                          # .../thesis_sim
+RESULTS_DIR = ROOT_DIR / "results"
+
+
+def canonical_json(obj) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def case_key(backend: str, params: dict) -> str:
+    """Hash of the inputs: same backend fingerprint + same params -> same key."""
+    payload = canonical_json({"backend": backend, "params": params})
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultStore:
+    def __init__(self, root: Path | str = RESULTS_DIR):
+        self.root = Path(root)
+        self.cases_dir = self.root / "cases"
+
+    def path(self, key: str) -> Path:
+        return self.cases_dir / key[:2] / f"{key}.json"
+
+    def has(self, key: str) -> bool:
+        return self.path(key).exists()
+
+    def get(self, key: str) -> dict | None:
+        try:
+            return json.loads(self.path(key).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, backend: str, params: dict, result: dict) -> dict:
+        record = {
+            "key": key,
+            "backend": backend,
+            "params": params,
+            "result": result,
+            "created": time.time(),
+        }
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # escrita atômica: nunca deixa um JSON pela metade para o leitor
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(canonical_json(record))
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return record
+
+    def state(self) -> tuple[int, int]:
+        """(cases, newest mtime_ns): cheap change detector for caches built from the store."""
+        n, newest = 0, 0
+        if self.cases_dir.exists():
+            for sub in os.scandir(self.cases_dir):
+                if sub.is_dir():
+                    for entry in os.scandir(sub.path):
+                        if entry.name.endswith(".json") and not entry.name.startswith("."):
+                            n += 1
+                            newest = max(newest, entry.stat().st_mtime_ns)
+        return n, newest
+
+    def records(self, backend: str | None = None):
+        """Iterate over stored records (optionally only one backend)."""
+        if not self.cases_dir.exists():
+            return
+        for path in sorted(self.cases_dir.glob("*/*.json")):
+            try:
+                record = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if backend is None or record.get("backend") == backend:
+                yield record
@@ -0,0 +1,375 @@
+# sweep.py
+# Sweep paramétrico: setpoint x SHGC x WWR x sombreamento x orientação.
+#
+# Uso (linha de comando):
+#   python app/sweep.py grid.json --backend reduced --workers 8
+#
+# grid.json é uma grade declarativa (ou lista de grades). Listas são
+# combinadas (produto cartesiano); escalares ficam fixos. "facade" aceita
+# ids de FACADE_ALTS e expande para shgc/wwr/shading:
+#   {"control": "Ta", "setpoint": [21, 22, 23],
+#    "facade": ["ALT1", "ALT2"], "orientation": [0, 90, 180, 270]}
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+import model
+import simulate
+import solar
+from dataset import FACADE_ALTS
+from store import ResultStore, case_key, RESULTS_DIR
+
+# Valores do caso base (BC) para chaves omitidas na grade
+DEFAULT_CASE = {
+    "control": "Ta",
+    "setpoint": 23,
+    "shgc": model.BC_SHGC,
+    "wwr": model.BC_WWR,
+    "shading": 0.0,
+    "orientation": model.BC_ORIENTATION,
+}
+
+# Chaves opcionais (só entram no caso — e no hash — quando aparecem na grade):
+# setpoint por subzona (controle independente), banda morta e tipo de vidro
+OPTIONAL_KEYS = ("setpoint_A", "setpoint_B", "setpoint_C", "deadband", "type")
+
+# Casos por tarefa enviada ao pool (o modelo reduzido é rápido demais
+# para valer um round-trip de processo por caso)
+CHUNK_SIZE = 64
+
+
+# =========================
+# Grade
+# =========================
+
+def expand_grid(spec) -> list[dict]:
+    """Declarative grid (dict or list of dicts) -> list of concrete cases."""
+    if isinstance(spec, list):
+        cases = []
+        for s in spec:
+            cases.extend(expand_grid(s))
+        return _unique(cases)
+
+    alt_by_id = {a["id"]: a for a in FACADE_ALTS}
+    axes = {k: (v if isinstance(v, list) else [v]) for k, v in spec.items()}
+
+    cases = []
+    keys = list(axes)
+    for combo in itertools.product(*(axes[k] for k in keys)):
+        case = dict(DEFAULT_CASE)
+        for k, v in zip(keys, combo):
+            if k == "facade":
+                if v not in alt_by_id:
+                    raise ValueError(f"Unknown facade id: {v!r}")
+                case.update(model.facade_params(alt_by_id[v]))
+                case["type"] = alt_by_id[v]["meta"]["Type"]
+                case["facade"] = v
+            elif k in ("shgc", "wwr", "shading"):
+                case[k] = model.parse_fraction(v)
+            elif k in DEFAULT_CASE or k in OPTIONAL_KEYS:
+                case[k] = v
+            else:
+                raise ValueError(f"Unknown grid key: {k!r}")
+        cases.append(case)
+    return _unique(cases)
+
+
+def _unique(cases: list[dict]) -> list[dict]:
+    seen, out = set(), []
+    for c in cases:
+        k = json.dumps(c, sort_keys=True)
+        if k not in seen:
+            seen.add(k)
+            out.append(c)
+    return out
+
+
+# =========================
+# Backends
+# =========================
+
+def case_setpoints(case: dict):
+    """Uniform setpoint, or {zone: sp} when the case has setpoint_A/B/C."""
+    if any(f"setpoint_{z}" in case for z in model.ZONES):
+        return {z: case.get(f"setpoint_{z}", case["setpoint"]) for z in model.ZONES}
+    return case["setpoint"]
+
+
+class ReducedModelBackend:
+    """
+    Built-in reduced model (model.py), calibrated on the thesis tables.
+    With `epw`, orientation factors come from that weather file
+    (solar.orientation_factors) instead of the assumed model.ORIENTATION_FACTOR.
+    """
+    name = "reduced"
+
+    def __init__(self, epw: str | None = None):
+        self.epw = str(epw) if epw else None
+        self._factors = None
+
+    def fingerprint(self) -> str:
+        if self.epw is None:
+            return f"{self.name}:{model.MODEL_VERSION}"
+        h = hashlib.sha256(Path(self.epw).read_bytes()).hexdigest()[:16]
+        return f"{self.name}:{model.MODEL_VERSION}:{h}"
+
+    def factors(self) -> dict | None:
+        if self.epw is not None and self._factors is None:
+            self._factors = solar.orientation_factors(self.epw)
+        return self._factors
+
+    def run(self, case: dict) -> dict:
+        params = {k: case[k] for k in ("shgc", "wwr", "shading", "orientation")}
+        return model.to_record(model.evaluate(case["control"], case_setpoints(case), factors=self.factors(),
+                                              **params))
+
+
+class SimulationBackend:
+    """
+    Batched RC simulation (simulate.py) driven by a weather file.
+    run_batch() groups cases that share the facade and runs each group as one
+    array computation (weather + solar computed once per group).
+    """
+    name = "rc"
+    SIM_VERSION = "rc-1"
+
+    def __init__(self, epw: str):
+        self.epw = str(epw)
+
+    def fingerprint(self) -> str:
+        h = hashlib.sha256(Path(self.epw).read_bytes()).hexdigest()[:16]
+        return f"{self.name}:{self.SIM_VERSION}:{h}"
+
+    def run(self, case: dict) -> dict:
+        return self.run_batch([case])[0]
+
+    def run_batch(self, cases: list[dict]) -> list[dict]:
+        groups = {}
+        for i, c in enumerate(cases):
+            fkey = tuple(c.get(k) for k in ("shgc", "wwr", "shading", "orientation", "type"))
+            groups.setdefault(fkey, []).append(i)
+
+        out = [None] * len(cases)
+        for (shgc, wwr, shading, orientation, gtype), idx in groups.items():
+            sps = []
+            for i in idx:
+                sp = case_setpoints(cases[i])
+                sps.append([sp[z] for z in model.ZONES] if isinstance(sp, dict) else [sp] * 3)
+            res = simulate.simulate_batch(
+                self.epw,
+                np.array(sps, dtype=float),
+                sensing=np.array([cases[i]["control"] for i in idx]),
+                deadband=np.array([cases[i].get("deadband", 0.0) for i in idx], dtype=float),
+                facade={"shgc": shgc, "wwr": wwr, "shading": shading,
+                        "orientation": orientation, "type": gtype or "Laminated"},
+            )
+            for i, rec in zip(idx, simulate.to_records(res)):
+                out[i] = rec
+        return out
+
+
+class EnergyPlusBackend:
+    """
+    Runs an EnergyPlus-compatible executable per case:
+        <executable> -w <epw> -d <outdir> <case.idf>
+    The IDF is the template formatted with the case ({shgc}, {setpoint}, ...).
+    Any executable with the same CLI that writes <outdir>/eplusout.csv works,
+    so a local fake script can stand in for EnergyPlus.
+    """
+    name = "energyplus"
+
+    # Área do piso do shoebox (4.00 x 7.50 m) para kWh/m²·year
+    FLOOR_AREA_M2 = 30.0
+
+    def __init__(self, executable: str, idf_template: str, epw: str, workdir: str | None = None):
+        self.executable = executable
+        self.idf_template = str(idf_template)
+        self.epw = str(epw)
+        self.workdir = workdir
+
+    def fingerprint(self) -> str:
+        # o executável entra na chave: resultados de um fake local nunca se
+        # passam pelos do EnergyPlus real (e vice-versa)
+        exe = Path(shutil.which(self.executable) or self.executable).resolve()
+        h = hashlib.sha256(str(exe).encode("utf-8"))
+        for p in (exe, self.idf_template, self.epw):
+            h.update(Path(p).read_bytes())
+        return f"{self.name}:{h.hexdigest()[:16]}"
+
+    def run(self, case: dict) -> dict:
+        template = Path(self.idf_template).read_text(encoding="utf-8")
+        with tempfile.TemporaryDirectory(dir=self.workdir, prefix="eplus-") as tmp:
+            idf = Path(tmp) / "case.idf"
+            idf.write_text(template.format_map(case), encoding="utf-8")
+            out = Path(tmp) / "out"
+            subprocess.run(
+                [self.executable, "-w", self.epw, "-d", str(out), str(idf)],
+                check=True, capture_output=True,
+            )
+            return self.parse_output(out / "eplusout.csv")
+
+    def parse_output(self, csv_path: Path) -> dict:
+        """eplusout.csv -> record (same shape as ReducedModelBackend.run)."""
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        header, rows = rows[0], rows[1:]
+
+        def column(zone: str | None, variable: str) -> list[float] | None:
+            for j, name in enumerate(header):
+                if variable in name and (zone is None or name.upper().startswith(f"ZONE {zone}:")):
+                    return [float(r[j]) for r in rows]
+            return None
+
+        comfort = {}
+        for z in model.ZONES:
+            to = column(z, "Zone Operative Temperature")
+            pmv = column(z, "Zone Thermal Comfort Fanger Model PMV")
+            occ = column(z, "Zone People Occupant Count")
+            if occ is None:
+                # fallback: expediente 08:00–18:00 a partir do Date/Time
+                occ = [1.0 if 8 <= int(r[0].split()[-1][:2]) < 18 else 0.0 for r in rows]
+            idx = [i for i, o in enumerate(occ) if o > 0]
+            n = max(1, len(idx))
+
+            def pct(values, test):
+                if values is None:
+                    return 0.0
+                return round(100.0 * sum(1 for i in idx if test(values[i])) / n, 1)
+
+            comfort[z] = {
+                "To_gt_26": pct(to, lambda v: v > 26.0),
+                "To_lt_23": pct(to, lambda v: v < 23.0),
+                "PMV_gt_p05": pct(pmv, lambda v: v > 0.5),
+                "PMV_lt_m05": pct(pmv, lambda v: v < -0.5),
+            }
+
+        cooling = column(None, "Cooling:Electricity") or column(None, "DistrictCooling:Facility") or []
+        energy = sum(cooling) / 3.6e6 / self.FLOOR_AREA_M2
+
+        return {"comfort": comfort, "energy": round(energy, 1)}
+
+
+BACKENDS = {
+    "reduced": ReducedModelBackend,
+    "rc": SimulationBackend,
+    "energyplus": EnergyPlusBackend,
+}
+
+
+def make_backend(name: str, **options):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend: {name!r} (available: {', '.join(BACKENDS)})")
+    return BACKENDS[name](**options)
+
+
+# =========================
+# Execução
+# =========================
+
+def _run_chunk(backend, chunk: list[tuple[str, dict]]) -> list[tuple[str, dict, dict]]:
+    if hasattr(backend, "run_batch"):
+        results = backend.run_batch([case for _, case in chunk])
+        return [(key, case, res) for (key, case), res in zip(chunk, results)]
+    return [(key, case, backend.run(case)) for key, case in chunk]
+
+
+def run_sweep(spec, backend=None, store: ResultStore | None = None,
+              workers: int | None = None, progress=None, cancelled=None) -> list[dict]:
+    """
+    Expand `spec`, skip cases already in `store`, run the rest on a process
+    pool and write each result to the store as it completes.
+    progress(done, total, record) is called for cached and new records.
+    cancelled() -> True stops dispatching new chunks (pending ones are dropped).
+    Returns the records finished so far (cached + new) in grid order.
+    """
+    backend = backend or ReducedModelBackend()
+    store = store or ResultStore()
+    fp = backend.fingerprint()
+
+    cases = expand_grid(spec)
+    keys = [case_key(fp, c) for c in cases]
+    total = len(cases)
+
+    records = {}
+    todo = []
+    for key, case in zip(keys, cases):
+        rec = store.get(key)
+        if rec is not None:
+            records[key] = rec
+            if progress:
+                progress(len(records), total, rec)
+        else:
+            todo.append((key, case))
+
+    if todo:
+        chunks = [todo[i:i + CHUNK_SIZE] for i in range(0, len(todo), CHUNK_SIZE)]
+        if workers == 1:
+            for ch in chunks:
+                if cancelled and cancelled():
+                    break
+                _collect(_run_chunk(backend, ch), fp, store, records, total, progress)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_run_chunk, backend, ch) for ch in chunks]
+                for fut in as_completed(futures):
+                    if cancelled and cancelled():
+                        for f in futures:
+                            f.cancel()
+                        break
+                    _collect(fut.result(), fp, store, records, total, progress)
+
+    return [records[k] for k in keys if k in records]
+
+
+def _collect(results, fp, store, records, total, progress):
+    for key, case, result in results:
+        rec = store.put(key, fp, case, result)
+        records[key] = rec
+        if progress:
+            progress(len(records), total, rec)
+
+
+def sweep_job(job, spec, backend=None, workers: int = 1) -> list[dict]:
+    """jobs.JobQueue entry point: streams each record to the job as it lands."""
+    return run_sweep(spec, backend, workers=workers, progress=job.report, cancelled=job.cancelled)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Parametric sweep runner (content-addressed cache).")
+    ap.add_argument("grid", help="JSON file with the parameter grid (dict or list of dicts)")
+    ap.add_argument("--backend", default="reduced", choices=list(BACKENDS))
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    ap.add_argument("--store", default=str(RESULTS_DIR))
+    ap.add_argument("--executable", help="energyplus: executable (or a local fake)")
+    ap.add_argument("--idf", help="energyplus: IDF template with {placeholders}")
+    ap.add_argument("--epw", help="energyplus / rc: weather file; reduced: orientation factors from it")
+    args = ap.parse_args(argv)
+
+    spec = json.loads(Path(args.grid).read_text(encoding="utf-8"))
+    if args.backend == "energyplus":
+        backend = make_backend("energyplus", executable=args.executable, idf_template=args.idf, epw=args.epw)
+    elif args.backend == "rc":
+        backend = make_backend("rc", epw=args.epw)
+    else:
+        backend = make_backend(args.backend, epw=args.epw)
+
+    def report(done, total, _rec):
+        if done == total or done % 100 == 0:
+            print(f"{done}/{total}", flush=True)
+
+    records = run_sweep(spec, backend, ResultStore(args.store), workers=args.workers, progress=report)
+    print(f"{len(records)} cases in {args.store}")
+
+
+if __name__ == "__main__":
+    main()
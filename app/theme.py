@@ -0,0 +1,268 @@
+# theme.py
+# Folha de estilos única do app, gerada a partir das constantes de STYLE
+# (thesis.py) e servida como arquivo estático com impressão digital.
+#
+# stylesheet(**vars) junta todo o CSS (layout global, dots da Tab 4,
+# subtítulos, textos da Summary/Conclusions, dropdown e seletor de Zone
+# Models da Tab 2).
+# tag(**vars) grava app/static/theme.<hash>.css uma vez por processo e
+# devolve só o <link> — o navegador guarda o arquivo em cache e o rerun
+# manda ~100 bytes. Sem static serving (server.enableStaticServing), sem
+# permissão de escrita ou com Streamlit < 1.53, cai para um <style> inline:
+# antes da 1.53 o servidor estático manda .css como text/plain + nosniff e
+# o navegador recusa a folha (sumiriam o layout, os dots da Tab 4 e o
+# seletor de Zone Models da Tab 2).
+import functools
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent          # .../app
+STATIC_DIR = APP_DIR / "static"
+STATIC_URL = "app/static"                          # rota do Streamlit para app/static/
+PREFIX = "theme"
+STATIC_CSS_VERSION = (1, 53)                       # primeira versão que serve .css como text/css
+
+CSS = """
+/* ===== Global compact layout ===== */
+.block-container {{ padding-top: 2.0rem; padding-bottom: 0.6rem; }}
+div[data-testid="stVerticalBlock"] > div {{ gap: 0.6rem; }}
+h2 {{ margin-top: 0.2rem; margin-bottom: 0.2rem; }}
+h3 {{ margin-top: 0.2rem; margin-bottom: 0.2rem; font-size: 1.05rem; }}
+div[role="radiogroup"] label {{ font-size: 0.95rem; }}
+div[data-testid="stSlider"] label {{ font-size: 0.95rem; }}
+
+/* Subtítulo cinza abaixo dos headings (Tab 3 e Tab 4) */
+.subtitle {{
+  font-size: {SUBTITLE_SIZE}px;
+  color: {SUBTITLE_COLOR};
+  margin-top: -6px;
+  margin-bottom: {SUBTITLE_MARGIN_BOTTOM};
+}}
+
+/* Dropdown menor (não estica) — Tab 2 */
+div[data-testid="stSelectbox"] {{
+  max-width: {TZ_DROPDOWN_WIDTH_PX}px;
+}}
+
+/* =========================================================
+   TAB2 — Zone Models trocados no navegador (sem rerun)
+   - rádios escondidos + rótulos como botões
+   - cada .tz-model vem logo após o seu rádio/rótulo
+   - nenhum marcado ainda: mostra o primeiro (.tz-first)
+   ========================================================= */
+.tz-switch {{ display: flex; flex-wrap: wrap; align-items: center; gap: 10px 6px; }}
+.tz-switch > input {{ position: absolute; opacity: 0; width: 0; height: 0; }}
+.tz-switch > label {{
+  order: 0;
+  padding: 3px 12px;
+  border: 1px solid rgba(0,0,0,0.25);
+  border-radius: 6px;
+  font-size: 0.92rem;
+  color: #333;
+  cursor: pointer;
+}}
+.tz-switch > label:hover {{ background: #f0f0f0; }}
+.tz-switch > input:focus-visible + label {{ outline: 2px solid #888; }}
+.tz-switch > .tz-model {{ order: 1; width: 100%; display: none; }}
+
+.tz-switch > label.tz-first,
+.tz-switch > input:checked + label {{ border-color: #d33; color: #d33; }}
+.tz-switch > .tz-model.tz-first,
+.tz-switch > input:checked + label + .tz-model {{ display: block; }}
+.tz-switch:has(> input:checked) > label.tz-first {{ border-color: rgba(0,0,0,0.25); color: #333; }}
+.tz-switch:has(> input:checked) > .tz-model.tz-first {{ display: none; }}
+.tz-switch > input:checked + label.tz-first {{ border-color: #d33; color: #d33; }}
+.tz-switch > input:checked + label.tz-first + .tz-model.tz-first {{ display: block; }}
+
+.tz-row {{ display: grid; gap: 4rem; align-items: start; }}     /* = st.columns(gap="large") */
+.tz-missing {{ color: #a60; font-size: 0.9rem; }}
+
+/* =========================================================
+   TAB4 — DOTS por KEY (st-key-dot_ALT1..ALT5)
+   - remove o retângulo padrão do Streamlit
+   - desenha um quadradinho
+   - hover cinza
+   - ativo (kind="primary") vermelho
+   ========================================================= */
+
+/* 0) Centraliza o botão dentro da coluna */
+div[data-testid="stElementContainer"][class*="st-key-dot_"] div[data-testid="stButton"]{{
+  display:flex !important;
+  justify-content:center !important;
+  align-items:center !important;
+}}
+
+/* 1) Mata COMPLETAMENTE o estilo do retângulo do Streamlit */
+div[data-testid="stElementContainer"][class*="st-key-dot_"] div[data-testid="stButton"] > button{{
+  all: unset !important;
+  box-sizing: border-box !important;
+  cursor: pointer !important;
+
+  /* mantém uma “linha” clicável, mas sem retângulo visível */
+  width: 100% !important;
+  height: {FACADE_DOT_SIZE}px !important;
+
+  display:flex !important;
+  justify-content:center !important;
+  align-items:center !important;
+
+  background: transparent !important;
+  border: 0 !important;
+  box-shadow: none !important;
+  outline: none !important;
+}}
+
+/* 2) Remove qualquer conteúdo interno (se aparecer algo) */
+div[data-testid="stElementContainer"][class*="st-key-dot_"] div[data-testid="stButton"] > button *{{
+  display:none !important;
+}}
+
+/* 3) Desenha o quadradinho */
+div[data-testid="stElementContainer"][class*="st-key-dot_"] div[data-testid="stButton"] > button::before{{
+  content:"";
+  width: {dot_px}px !important;
+  height: {dot_px}px !important;
+  border-radius: 1px !important;
+  border: 1px solid rgba(0,0,0,0.35) !important;
+  background: transparent !important;
+  display:block !important;
+}}
+
+/* 4) Hover */
+div[data-testid="stElementContainer"][class*="st-key-dot_"] div[data-testid="stButton"] > button:hover::before{{
+  background:#ccc !important;
+  border-color:#666 !important;
+}}
+
+/* 5) Ativo = kind="primary" => vermelho sólido */
+div[data-testid="stElementContainer"][class*="st-key-dot_"] div[data-testid="stButton"] > button[kind="primary"]::before{{
+  background:#d33 !important;
+  border-color:#d33 !important;
+}}
+
+/* 6) Mata focus ring */
+div[data-testid="stElementContainer"][class*="st-key-dot_"] div[data-testid="stButton"] > button:focus,
+div[data-testid="stElementContainer"][class*="st-key-dot_"] div[data-testid="stButton"] > button:focus-visible{{
+  outline:none !important;
+  box-shadow:none !important;
+}}
+
+/* TAB4 meta: evita margens internas do markdown “empurrarem” linhas */
+.tab4-meta-left p, .tab4-meta-mid p {{
+  margin: 0 !important;
+}}
+
+/* ===== Textos longos: Summary (Tab 1) e Conclusions (Tab 5) ===== */
+.sum-wrap, .conc-wrap {{
+  width: 1000px;
+  max-width: 100%;
+  margin-left: 0;
+  margin-right: auto;
+  font-size: 15px;
+  line-height: 1.55;
+  text-align: justify;
+  color: #222;
+}}
+
+/* títulos de tópico (###) */
+.sum-wrap h3, .conc-wrap h3 {{
+  font-size: 22px;
+  font-weight: 800;
+  margin-top: 18px;
+  margin-bottom: 10px;
+  color: #111;
+}}
+
+/* subtítulos (####) */
+.sum-wrap h4 {{
+  font-size: 16px;
+  font-weight: 800;
+  margin-top: 12px;
+  margin-bottom: 8px;
+  color: #111;
+}}
+
+.sum-wrap p, .conc-wrap p {{
+  margin-top: 0;
+  margin-bottom: 10px;
+}}
+
+.sum-wrap .cite a {{
+  color: inherit;
+  text-decoration: none;
+}}
+
+.sum-note, .conc-note {{
+  margin-top: 14px;
+  font-size: 12px;
+  color: #777;
+  font-style: italic;
+}}
+"""
+
+
+def stylesheet(**style) -> str:
+    """Full app CSS from the STYLE constants (FACADE_DOT_SIZE, SUBTITLE_*, TZ_DROPDOWN_WIDTH_PX)."""
+    return CSS.format(dot_px=style["FACADE_DOT_SIZE"] - 3, **style).strip() + "\n"
+
+
+def fingerprint(css: str) -> str:
+    return hashlib.sha256(css.encode("utf-8")).hexdigest()[:12]
+
+
+def static_serving() -> bool:
+    """True when server.enableStaticServing is on (app/static/ served by Streamlit)."""
+    try:
+        import streamlit as st
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+def static_css() -> bool:
+    """True when app/static/*.css reaches the browser as text/css (static serving on, Streamlit >= 1.53)."""
+    if not static_serving():
+        return False
+    try:
+        import streamlit as st
+        version = tuple(int(x) for x in re.findall(r"\d+", st.__version__)[:2])
+    except Exception:
+        return False
+    return version >= STATIC_CSS_VERSION
+
+
+def publish(css: str) -> str | None:
+    """
+    Write theme.<hash>.css into app/static; URL or None if not possible.
+    Older versions are kept: the files are immutable, and during a rolling
+    deploy pages served by workers still on the old code link to them.
+    """
+    name = f"{PREFIX}.{fingerprint(css)}.css"
+    target = STATIC_DIR / name
+    try:
+        if not target.exists():
+            STATIC_DIR.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=STATIC_DIR, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(css)
+            os.replace(tmp, target)
+    except OSError:
+        return None
+    return f"{STATIC_URL}/{name}"
+
+
+@functools.lru_cache(maxsize=8)
+def _tag(items: tuple) -> str:
+    css = stylesheet(**dict(items))
+    url = publish(css) if static_css() else None
+    if url is None:
+        return f"<style>\n{css}</style>"
+    return f'<link rel="stylesheet" href="{url}">'
+
+
+def tag(**style) -> str:
+    """HTML to put the stylesheet on the page: <link> to the static file, or inline <style> as fallback."""
+    return _tag(tuple(sorted(style.items())))
@@ -0,0 +1,146 @@
+# bench/api.py
+# Vazão da API local (app/api.py): consultas por segundo com o servidor
+# preso a um núcleo.
+#
+#   python bench/api.py                         # 4 clientes, 5 s por modo
+#   python bench/api.py --clients 8 --seconds 10 --json api.json
+#
+# Sobe `python app/api.py` num processo com afinidade para a CPU 0 (Linux) e
+# roda clientes em outros processos (http.client, conexão keep-alive). Modos:
+#   get    GET /v1/scenarios com consultas variadas (gzip aceito)
+#   etag   o mesmo GET com If-None-Match da versão atual (304 sem corpo)
+#   batch  POST /v1/query com BATCH consultas por requisição
+# Relata requisições/s, consultas/s e latência p50/p99 por modo.
+import argparse
+import http.client
+import json
+import multiprocessing as mp
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from urllib.parse import urlencode
+
+import numpy as np
+
+BENCH_DIR = Path(__file__).resolve().parent         # .../bench
+ROOT_DIR = BENCH_DIR.parent                         # .../thesis_sim
+API_FILE = ROOT_DIR / "app" / "api.py"
+
+CLIENTS = 4                 # processos clientes
+SECONDS = 5.0               # duração de cada modo
+BATCH = 100                 # consultas por POST no modo batch
+SERVER_CPU = 0              # núcleo do servidor (os clientes ficam nos demais)
+STARTUP_TIMEOUT_S = 30
+
+QUERIES = [
+    {"control": c, "setpoint": sp, **extra}
+    for c, sps in (("Ta", range(19, 25)), ("To", range(22, 28)))
+    for sp in sps
+    for extra in ({}, {"zone": "A"}, {"facade": "ALT2"}, {"source": "thesis"})
+] + [{"facade": f"ALT{i}", "control": c} for i in range(1, 6) for c in ("Ta", "To")] + [{}]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _pin():
+    os.sched_setaffinity(0, {SERVER_CPU})
+
+
+def start_server(port: int) -> tuple[subprocess.Popen, str]:
+    can_pin = hasattr(os, "sched_setaffinity") and os.cpu_count() and os.cpu_count() > 1
+    proc = subprocess.Popen([sys.executable, str(API_FILE), "--port", str(port)], cwd=ROOT_DIR,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            preexec_fn=_pin if can_pin else None)
+    deadline = time.time() + STARTUP_TIMEOUT_S
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"api.py exited with code {proc.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/v1/version", timeout=1) as r:
+                return proc, json.loads(r.read())["version"]
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise TimeoutError("api.py did not start")
+
+
+def _client(port: int, mode: str, seconds: float, version: str, index: int, out):
+    if hasattr(os, "sched_setaffinity") and os.cpu_count() and os.cpu_count() > 1:
+        others = set(range(os.cpu_count())) - {SERVER_CPU}
+        os.sched_setaffinity(0, others)
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    headers = {"Accept-Encoding": "gzip"}
+    if mode == "etag":
+        headers["If-None-Match"] = f'W/"{version}"'
+    gets = [f"/v1/scenarios?{urlencode(q)}" for q in QUERIES]
+    batch = json.dumps({"queries": [QUERIES[(index + i) % len(QUERIES)] for i in range(BATCH)]})
+    lat, errors, i = [], 0, index
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        t0 = time.perf_counter()
+        if mode == "batch":
+            conn.request("POST", "/v1/query", batch, {**headers, "Content-Type": "application/json"})
+        else:
+            conn.request("GET", gets[i % len(gets)], headers=headers)
+        r = conn.getresponse()
+        r.read()
+        lat.append(time.perf_counter() - t0)
+        errors += r.status not in (200, 304)
+        i += 1
+    conn.close()
+    out.put((lat, errors))
+
+
+def run_mode(port: int, mode: str, clients: int, seconds: float, version: str) -> dict:
+    out = mp.Queue()
+    procs = [mp.Process(target=_client, args=(port, mode, seconds, version, i, out)) for i in range(clients)]
+    for p in procs:
+        p.start()
+    results = [out.get() for _ in procs]
+    for p in procs:
+        p.join()
+    lat = np.concatenate([np.array(r[0]) for r in results]) * 1e3
+    requests = len(lat)
+    per_request = BATCH if mode == "batch" else 1
+    return {"requests": requests, "errors": sum(r[1] for r in results),
+            "requests_per_s": round(requests / seconds, 1),
+            "queries_per_s": round(requests * per_request / seconds, 1),
+            "p50_ms": round(float(np.percentile(lat, 50)), 3), "p99_ms": round(float(np.percentile(lat, 99)), 3)}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Throughput of the local JSON API (server on one core).")
+    ap.add_argument("--clients", type=int, default=CLIENTS)
+    ap.add_argument("--seconds", type=float, default=SECONDS)
+    ap.add_argument("--mode", nargs="+", choices=["get", "etag", "batch"], default=["get", "etag", "batch"])
+    ap.add_argument("--json", type=Path, help="write the report here")
+    args = ap.parse_args(argv)
+
+    port = _free_port()
+    proc, version = start_server(port)
+    try:
+        report = {"version": version, "clients": args.clients, "seconds": args.seconds, "modes": {}}
+        print(f"{'mode':<8}{'req/s':>10}{'queries/s':>12}{'p50 ms':>9}{'p99 ms':>9}{'err':>6}")
+        for mode in args.mode:
+            r = run_mode(port, mode, args.clients, args.seconds, version)
+            report["modes"][mode] = r
+            print(f"{mode:<8}{r['requests_per_s']:>10}{r['queries_per_s']:>12}{r['p50_ms']:>9}{r['p99_ms']:>9}"
+                  f"{r['errors']:>6}")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 1 if any(r["errors"] for r in report["modes"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,403 @@
+# bench/load.py
+# Teste de carga: N sessões simultâneas contra o app rodando localmente.
+#
+#   python bench/load.py -n 20                  # sobe o servidor, roda "browse" em 20 sessões
+#   python bench/load.py -n 50 --ramp 10 --script slider --json load.json
+#   python bench/load.py --url ws://host:8501 --pid 1234 -n 10   # servidor já rodando
+#
+# Cada sessão abre o websocket do Streamlit (/_stcore/stream), pede o
+# primeiro run e segue um roteiro de interações (ver SCRIPTS), mandando o
+# mesmo BackMsg que o navegador mandaria. Latência de rerun = envio do
+# BackMsg -> script_finished. O servidor é amostrado via /proc (CPU, RSS),
+# por isso CPU/RSS só saem em Linux e quando o PID é conhecido.
+#
+# As abas (st.tabs) trocam no navegador, sem rerun: no roteiro, "tab" é só
+# tempo de leitura. Requer o cliente `websockets` (pip install websockets).
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+
+BENCH_DIR = Path(__file__).resolve().parent         # .../bench
+ROOT_DIR = BENCH_DIR.parent                         # .../thesis_sim
+APP_FILE = ROOT_DIR / "app" / "thesis.py"
+
+SESSIONS = 10               # sessões simultâneas (padrão)
+RAMP_S = 5.0                # as sessões entram espaçadas ao longo desse tempo
+THINK_S = 1.0               # pausa média entre interações (±50%)
+RERUN_TIMEOUT_S = 180
+SAMPLE_S = 0.5              # intervalo de amostragem de CPU/RSS do servidor
+STARTUP_TIMEOUT_S = 60
+
+# Roteiros: ("tab", nome) = só leitura | ("set", chave ou rótulo, valor) | ("click", chave)
+SCRIPTS = {
+    "browse": [
+        ("tab", "Thermal Environment Control"),
+        ("set", "ta_sp_tab3", 22), ("set", "ta_sp_tab3", 23), ("set", "ta_sp_tab3", 24),
+        ("set", "Select parameter", "PMV"),
+        ("tab", "Facade Design Alternatives"),
+        ("click", "dot_ALT1"), ("click", "dot_ALT3"), ("click", "dot_ALT5"),
+        ("tab", "Thermal Zoning"),      # troca de Zone Model: no navegador, sem rerun
+    ],
+    "slider": [("set", "ta_sp_tab3", v) for v in (20, 21, 22, 23, 24, 23, 22, 21, 20, 19)],
+    "facade": [("click", f"dot_ALT{i}") for i in (1, 2, 3, 4, 5, 4, 3, 2, 1)],
+}
+
+
+# =========================
+# Protocolo (BackMsg / ForwardMsg)
+# =========================
+
+def _protos():
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    return BackMsg, ForwardMsg
+
+
+class Widgets:
+    """Widgets seen in the last run (id, type, label, options) and the values this client set."""
+
+    def __init__(self):
+        self.seen = {}          # id -> (tipo, rótulo, opções)
+        self.values = {}        # id -> (tipo, valor) enviados em todo rerun
+
+    def add(self, element):
+        kind = element.WhichOneof("type")
+        proto = getattr(element, kind, None)
+        wid = getattr(proto, "id", "")
+        if wid:
+            self.seen[wid] = (kind, getattr(proto, "label", ""), list(getattr(proto, "options", [])))
+
+    def find(self, name: str) -> str:
+        """Widget id by user key (suffix of the generated id) or by label."""
+        for wid in self.seen:
+            if wid.endswith(f"-{name}"):
+                return wid
+        for wid, (_, label, _) in self.seen.items():
+            if label == name:
+                return wid
+        raise KeyError(f"widget {name!r} not on the page")
+
+    def states(self, trigger: str | None = None):
+        from streamlit.proto.WidgetStates_pb2 import WidgetStates
+
+        out = WidgetStates()
+        for wid, (kind, value) in self.values.items():
+            ws = out.widgets.add()
+            ws.id = wid
+            if kind == "slider":
+                ws.double_array_value.data[:] = [float(value)]
+            elif kind in ("checkbox", "toggle"):
+                ws.bool_value = bool(value)
+            else:                                       # radio, selectbox (valor formatado)
+                ws.string_value = str(value)
+        if trigger is not None:
+            ws = out.widgets.add()
+            ws.id = trigger
+            ws.trigger_value = True
+        return out
+
+
+class Client:
+    """One simulated browser session."""
+
+    def __init__(self, url: str, index: int, think_s: float, seed: int):
+        self.url = url
+        self.index = index
+        self.think_s = think_s
+        self.rng = random.Random(seed + index)
+        self.widgets = Widgets()
+        self.ws = None
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.records = []       # {"session", "step", "ms", "bytes_in", "ok"}
+        self.errors = []
+
+    async def connect(self):
+        from websockets.asyncio.client import connect
+
+        self.ws = await connect(f"{self.url}/_stcore/stream", subprotocols=["streamlit"],
+                                max_size=None, open_timeout=STARTUP_TIMEOUT_S)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def rerun(self, step: str, trigger: str | None = None):
+        BackMsg, ForwardMsg = _protos()
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.widget_states.CopyFrom(self.widgets.states(trigger))
+        data = msg.SerializeToString()
+
+        received, ok = 0, True
+        t0 = time.perf_counter()
+        await self.ws.send(data)
+        self.bytes_out += len(data)
+        seen = {}
+        while True:
+            raw = await asyncio.wait_for(self.ws.recv(), RERUN_TIMEOUT_S)
+            received += len(raw)
+            fwd = ForwardMsg.FromString(raw)
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                if element.WhichOneof("type") == "exception":
+                    ok = False
+                    self.errors.append(f"{step}: {element.exception.message}")
+                proto = getattr(element, element.WhichOneof("type"), None)
+                if getattr(proto, "id", ""):
+                    seen[proto.id] = element
+            elif kind == "script_finished":
+                status = fwd.script_finished
+                if status in (ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_WITH_COMPILE_ERROR):
+                    ok = ok and status == ForwardMsg.FINISHED_SUCCESSFULLY
+                    break
+        ms = (time.perf_counter() - t0) * 1e3
+        self.bytes_in += received
+
+        self.widgets.seen.clear()
+        for element in seen.values():
+            self.widgets.add(element)
+        self.records.append({"session": self.index, "step": step, "ms": ms, "bytes_in": received, "ok": ok})
+
+    async def think(self):
+        await asyncio.sleep(self.think_s * self.rng.uniform(0.5, 1.5))
+
+    async def play(self, script):
+        await self.rerun("first_run")
+        for action, target, *value in script:
+            await self.think()
+            if action == "tab":
+                continue
+            try:
+                wid = self.widgets.find(target)
+            except KeyError as e:
+                self.errors.append(f"{action} {target}: {e}")
+                continue
+            if action == "click":
+                await self.rerun(f"click {target}", trigger=wid)
+            else:
+                kind = self.widgets.seen[wid][0]
+                self.widgets.values[wid] = (kind, value[0])
+                await self.rerun(f"set {target}")
+
+
+# =========================
+# Servidor (processo local e amostras de /proc)
+# =========================
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "streamlit", "run", str(APP_FILE),
+           "--server.headless", "true", "--server.port", str(port), "--server.address", "127.0.0.1",
+           "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"]
+    proc = subprocess.Popen(cmd, cwd=ROOT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + STARTUP_TIMEOUT_S
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"streamlit exited with code {proc.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as r:
+                if r.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise TimeoutError("streamlit did not become healthy")
+
+
+class ProcSampler(threading.Thread):
+    """Samples CPU time and RSS of one process from /proc every SAMPLE_S seconds."""
+
+    def __init__(self, pid: int):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.samples = []       # (t, cpu_s, rss_mib)
+        self._halt = threading.Event()
+        self._tick = os.sysconf("SC_CLK_TCK")
+
+    def read(self):
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        cpu_s = (int(fields[11]) + int(fields[12])) / self._tick     # utime + stime
+        with open(f"/proc/{self.pid}/status") as f:
+            rss_kib = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+        return time.perf_counter(), cpu_s, rss_kib / 1024
+
+    def run(self):
+        while not self._halt.is_set():
+            try:
+                self.samples.append(self.read())
+            except (OSError, StopIteration):
+                return
+            self._halt.wait(SAMPLE_S)
+
+    def stop(self):
+        self._halt.set()
+        self.join()
+
+
+# =========================
+# Execução e relatório
+# =========================
+
+async def run_load(url: str, script, n: int, ramp_s: float, think_s: float, seed: int, on_loaded=None):
+    clients = [Client(url, i, think_s, seed) for i in range(n)]
+
+    async def one(client: Client):
+        await asyncio.sleep(ramp_s * client.index / max(n, 1))
+        try:
+            await client.connect()
+            await client.play(script)
+        except Exception as e:
+            client.errors.append(f"session {client.index}: {type(e).__name__}: {e}")
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(c) for c in clients))
+    wall = time.perf_counter() - t0
+    if on_loaded is not None:
+        on_loaded()             # todas as sessões ainda conectadas
+    await asyncio.gather(*(c.close() for c in clients), return_exceptions=True)
+    return clients, wall
+
+
+def _pct(values, qs=(50, 95, 99)) -> dict:
+    if not values:
+        return {f"p{q}_ms": None for q in qs} | {"max_ms": None}
+    p = np.percentile(values, qs)
+    return {f"p{q}_ms": round(float(v), 1) for q, v in zip(qs, p)} | {"max_ms": round(max(values), 1)}
+
+
+def report(clients, wall: float, sampler: ProcSampler | None, rss_base: float | None,
+           rss_loaded: float | None) -> dict:
+    records = [r for c in clients for r in c.records]
+    by_step = {}
+    for r in records:
+        by_step.setdefault(r["step"], []).append(r)
+    steps = {step: {"count": len(rs), "errors": sum(not r["ok"] for r in rs), **_pct([r["ms"] for r in rs]),
+                    "kib_per_rerun": round(np.mean([r["bytes_in"] for r in rs]) / 1024, 1)}
+             for step, rs in by_step.items()}
+
+    out = {
+        "sessions": len(clients),
+        "wall_s": round(wall, 2),
+        "reruns": len(records),
+        "reruns_per_s": round(len(records) / wall, 2) if wall else None,
+        "latency": _pct([r["ms"] for r in records]),
+        "steps": steps,
+        "ws_bytes": {"in_mib": round(sum(c.bytes_in for c in clients) / 2 ** 20, 2),
+                     "out_kib": round(sum(c.bytes_out for c in clients) / 1024, 1),
+                     "in_kib_per_rerun": round(sum(c.bytes_in for c in clients) / max(len(records), 1) / 1024, 1)},
+        "errors": [e for c in clients for e in c.errors],
+    }
+    if sampler is not None and len(sampler.samples) >= 2:
+        t, cpu, rss = (np.array(col) for col in zip(*sampler.samples))
+        usage = np.diff(cpu) / np.diff(t) * 100
+        out["server"] = {
+            "cpu_mean_pct": round(float((cpu[-1] - cpu[0]) / (t[-1] - t[0]) * 100), 1),
+            "cpu_peak_pct": round(float(usage.max()), 1),
+            "rss_base_mib": round(rss_base, 1),
+            "rss_loaded_mib": round(rss_loaded, 1),
+            "rss_peak_mib": round(float(rss.max()), 1),
+            "rss_per_session_mib": round((rss_loaded - rss_base) / max(len(clients), 1), 2),
+        }
+    return out
+
+
+def print_report(r: dict):
+    lat = r["latency"]
+    print(f"\n{r['sessions']} sessions, {r['reruns']} reruns in {r['wall_s']} s ({r['reruns_per_s']} reruns/s)")
+    print(f"rerun latency  p50 {lat['p50_ms']} ms  p95 {lat['p95_ms']} ms  p99 {lat['p99_ms']} ms  max {lat['max_ms']} ms")
+    print(f"\n{'step':<34}{'n':>5}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'KiB/rerun':>11}")
+    for step, s in r["steps"].items():
+        print(f"{step:<34}{s['count']:>5}{s['errors']:>5}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['max_ms']:>10}"
+              f"{s['kib_per_rerun']:>11}")
+    ws = r["ws_bytes"]
+    print(f"\nwebsocket  in {ws['in_mib']} MiB ({ws['in_kib_per_rerun']} KiB/rerun)  out {ws['out_kib']} KiB")
+    if "server" in r:
+        s = r["server"]
+        print(f"server     CPU mean {s['cpu_mean_pct']}%  peak {s['cpu_peak_pct']}%")
+        print(f"           RSS {s['rss_base_mib']} -> {s['rss_loaded_mib']} MiB "
+              f"({s['rss_per_session_mib']} MiB/session, peak {s['rss_peak_mib']} MiB)")
+    if r["errors"]:
+        print(f"\n{len(r['errors'])} errors:")
+        for e in r["errors"][:20]:
+            print("  " + e)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Load-test the app with concurrent simulated sessions.")
+    ap.add_argument("-n", "--sessions", type=int, default=SESSIONS)
+    ap.add_argument("--script", choices=sorted(SCRIPTS), default="browse")
+    ap.add_argument("--ramp", type=float, default=RAMP_S, help="seconds over which sessions join")
+    ap.add_argument("--think", type=float, default=THINK_S, help="mean pause between interactions (s)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--port", type=int, help="port for the local server (default: a free one)")
+    ap.add_argument("--url", help="use a running server (ws://host:port) instead of starting one")
+    ap.add_argument("--pid", type=int, help="server PID to sample with --url (CPU/RSS)")
+    ap.add_argument("--json", type=Path, help="write the report here")
+    args = ap.parse_args(argv)
+
+    try:
+        import websockets  # noqa: F401
+    except ImportError:
+        print("bench/load.py needs the websocket client: pip install websockets", file=sys.stderr)
+        return 2
+
+    proc = None
+    if args.url:
+        url, pid = args.url.rstrip("/"), args.pid
+    else:
+        port = args.port or _free_port()
+        print(f"starting streamlit on port {port} ...")
+        proc = start_server(port)
+        url, pid = f"ws://127.0.0.1:{port}", proc.pid
+
+    sampler = None
+    if pid and Path(f"/proc/{pid}").exists():
+        sampler = ProcSampler(pid)
+    script = SCRIPTS[args.script]
+    try:
+        # aquecimento: 1 sessão (imports, caches) antes de medir a RSS de base
+        asyncio.run(run_load(url, [], 1, 0, 0, args.seed))
+        rss_base = sampler.read()[2] if sampler else None
+        loaded = {}
+
+        if sampler:
+            sampler.start()
+        clients, wall = asyncio.run(run_load(
+            url, script, args.sessions, args.ramp, args.think, args.seed,
+            on_loaded=lambda: loaded.setdefault("rss", sampler.read()[2] if sampler else None)))
+        if sampler:
+            sampler.stop()
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    result = report(clients, wall, sampler, rss_base, loaded.get("rss"))
+    result["script"] = args.script
+    print_report(result)
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+# bench/memory.py
+# Memória por sessão: a RSS do servidor deve ficar plana quando o número de
+# sessões cresce (os dados da tese são carregados uma vez por processo e
+# entregues por referência — dataset.py, vistas somente leitura).
+#
+#   python bench/memory.py                      # 5 -> 20 -> 40 sessões abertas
+#   python bench/memory.py --steps 10 50 100 --max-mib 1.5
+#
+# Sobe o app localmente (como bench/load.py), aquece com uma sessão e abre
+# sessões em degraus, todas conectadas até o fim; cada uma roda o roteiro
+# "browse" uma vez. Em cada degrau lê a RSS do servidor (/proc, Linux) e
+# ajusta uma reta RSS x sessões: sai com 1 se a inclinação passar de
+# --max-mib MiB por sessão. Requer o cliente `websockets`.
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from load import SCRIPTS, Client, ProcSampler, _free_port, start_server
+
+STEPS = (5, 20, 40)         # sessões abertas em cada medição
+MAX_MIB_PER_SESSION = 2.0   # limite da inclinação RSS x sessões (Streamlit sozinho: ~1 MiB)
+SETTLE_S = 2.0              # espera antes de ler a RSS (threads do servidor terminando)
+
+
+async def _open(url: str, first: int, n: int, script) -> list[Client]:
+    clients = [Client(url, first + i, 0.0, 0) for i in range(n)]
+
+    async def one(client: Client):
+        try:
+            await client.connect()
+            await client.play(script)
+        except Exception as e:
+            client.errors.append(f"session {client.index}: {type(e).__name__}: {e}")
+
+    await asyncio.gather(*(one(c) for c in clients))
+    return clients
+
+
+async def measure(url: str, sampler: ProcSampler, steps, script) -> tuple[list[dict], list[str]]:
+    warm = await _open(url, 0, 1, script)
+    await asyncio.gather(*(c.close() for c in warm), return_exceptions=True)
+    await asyncio.sleep(SETTLE_S)
+    rows = [{"sessions": 0, "rss_mib": round(sampler.read()[2], 1)}]
+
+    clients = []
+    for n in steps:
+        clients += await _open(url, len(clients) + 1, n - len(clients), script)
+        await asyncio.sleep(SETTLE_S)
+        rows.append({"sessions": len(clients), "rss_mib": round(sampler.read()[2], 1)})
+        print(f"{len(clients):>5} sessions  RSS {rows[-1]['rss_mib']} MiB")
+    errors = [e for c in clients for e in c.errors]
+    await asyncio.gather(*(c.close() for c in clients), return_exceptions=True)
+    return rows, errors
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Check that server RSS stays flat as sessions are added.")
+    ap.add_argument("--steps", type=int, nargs="+", default=list(STEPS), help="open sessions at each reading")
+    ap.add_argument("--max-mib", type=float, default=MAX_MIB_PER_SESSION, help="allowed MiB per extra session")
+    ap.add_argument("--script", choices=sorted(SCRIPTS), default="browse")
+    ap.add_argument("--json", type=Path, help="write the readings here")
+    args = ap.parse_args(argv)
+
+    try:
+        import websockets  # noqa: F401
+    except ImportError:
+        print("bench/memory.py needs the websocket client: pip install websockets", file=sys.stderr)
+        return 2
+    if not Path("/proc/self/status").exists():
+        print("bench/memory.py reads the server RSS from /proc (Linux only)", file=sys.stderr)
+        return 2
+
+    port = _free_port()
+    print(f"starting streamlit on port {port} ...")
+    proc = start_server(port)
+    try:
+        t0 = time.perf_counter()
+        rows, errors = asyncio.run(measure(f"ws://127.0.0.1:{port}", ProcSampler(proc.pid),
+                                           sorted(args.steps), SCRIPTS[args.script]))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+    x = np.array([r["sessions"] for r in rows[1:]], dtype=float)
+    y = np.array([r["rss_mib"] for r in rows[1:]])
+    slope = float(np.polyfit(x, y, 1)[0]) if len(x) >= 2 else float("nan")
+    ok = not errors and slope <= args.max_mib
+    print(f"\nbase {rows[0]['rss_mib']} MiB; slope {slope:.3f} MiB/session (limit {args.max_mib}) "
+          f"in {time.perf_counter() - t0:.1f} s -> {'OK' if ok else 'FAIL'}")
+    for e in errors[:20]:
+        print("  " + e)
+    if args.json:
+        args.json.write_text(json.dumps({"readings": rows, "slope_mib_per_session": round(slope, 4),
+                                         "limit": args.max_mib, "errors": errors}, indent=2), encoding="utf-8")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+# bench/payload.py
+# Relatório de payload do websocket: bytes por elemento emitido pelo script,
+# atribuídos à aba (trecho do perf) e à linha do app, por rerun.
+#
+#   python bench/payload.py                          # ranking dos maiores contribuintes
+#   python bench/payload.py --json payload.json      # grava o relatório (acompanhar no tempo)
+#   python bench/payload.py --baseline payload.json  # compara com um relatório anterior
+#
+# Roda as mesmas interações de bench/run.py em AppTest com a instrumentação
+# do perf.py ligada (THESIS_PERF=1) e lê o registro de payload da sessão.
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent         # .../bench
+APP_DIR = BENCH_DIR.parent / "app"
+sys.path.insert(0, str(APP_DIR))
+os.environ["THESIS_PERF"] = "1"
+
+TOP = 25                    # linhas no ranking impresso
+MIN_DELTA_KIB = 1.0         # variações menores não aparecem na comparação
+
+
+def collect(interactions) -> list[dict]:
+    """Runs each interaction on a fresh app; returns payload records tagged with the interaction."""
+    from streamlit.testing.v1 import AppTest
+    from run import APP_INTERACTIONS, APP_TIMEOUT_S
+
+    records = []
+    for name in interactions:
+        at = AppTest.from_file(str(APP_DIR / "thesis.py"), default_timeout=APP_TIMEOUT_S)
+        if name != "app/first_run":
+            at.run()
+        before = len(at.session_state["perf_session"].payload_log) if name != "app/first_run" else 0
+        APP_INTERACTIONS[name](at)
+        if at.exception:
+            raise RuntimeError(f"{name}: app raised {at.exception[0].value}")
+        log = list(at.session_state["perf_session"].payload_log)[before:]
+        records += [dict(r, interaction=name) for r in log]
+    return records
+
+
+def summarize(records: list[dict]) -> dict:
+    """Average bytes per rerun by (section, where, element), by section, by element and by interaction."""
+    runs = {r["run"] for r in records}
+    n = max(len(runs), 1)
+    rows = {}
+    for r in records:
+        key = (r["section"], r["where"], r["element"])
+        row = rows.setdefault(key, {"section": r["section"], "where": r["where"], "function": r["function"],
+                                    "element": r["element"], "elements": 0, "bytes": 0})
+        row["elements"] += 1
+        row["bytes"] += r["bytes"]
+    for row in rows.values():
+        row["kib_per_rerun"] = round(row.pop("bytes") / n / 1024, 2)
+        row["elements"] = round(row["elements"] / n, 2)
+    ranked = sorted(rows.values(), key=lambda row: -row["kib_per_rerun"])
+
+    def group(field):
+        out = {}
+        for row in ranked:
+            out[row[field]] = out.get(row[field], 0.0) + row["kib_per_rerun"]
+        return {k: round(v, 2) for k, v in sorted(out.items(), key=lambda kv: -kv[1])}
+
+    per_interaction = {}
+    for r in records:
+        per_interaction.setdefault(r["interaction"], 0)
+        per_interaction[r["interaction"]] += r["bytes"]
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "reruns": len(runs),
+        "kib_per_rerun": round(sum(r["bytes"] for r in records) / n / 1024, 2),
+        "by_section": group("section"),
+        "by_element": group("element"),
+        "by_interaction_kib": {k: round(v / 1024, 2) for k, v in per_interaction.items()},
+        "rows": ranked,
+    }
+
+
+def print_report(rep: dict, top: int = TOP):
+    print(f"{rep['reruns']} reruns, {rep['kib_per_rerun']:,.1f} KiB per rerun\n")
+    print(f"{'KiB/rerun':>10}  {'n/rerun':>7}  {'section':<18}{'element':<16}where")
+    for row in rep["rows"][:top]:
+        print(f"{row['kib_per_rerun']:>10,.1f}  {row['elements']:>7}  {row['section']:<18}{row['element']:<16}"
+              f"{row['where']} ({row['function']})")
+    for title, field in (("section", "by_section"), ("element", "by_element"), ("interaction", "by_interaction_kib")):
+        print(f"\nby {title}:")
+        for k, v in rep[field].items():
+            print(f"  {k:<34}{v:>10,.1f} KiB")
+
+
+def print_delta(rep: dict, base: dict):
+    """Per-section / per-element change against an earlier report (lines move, so no per-row diff)."""
+    print(f"\nvs baseline ({base.get('created', '?')}): "
+          f"{base['kib_per_rerun']:,.1f} -> {rep['kib_per_rerun']:,.1f} KiB per rerun")
+    for field in ("by_section", "by_element"):
+        keys = dict.fromkeys([*rep[field], *base[field]])
+        for k in keys:
+            new, old = rep[field].get(k, 0.0), base[field].get(k, 0.0)
+            if abs(new - old) >= MIN_DELTA_KIB:
+                print(f"  {field[3:]:<8}{k:<28}{old:>10,.1f} -> {new:>10,.1f} KiB ({new - old:+,.1f})")
+
+
+def main(argv=None) -> int:
+    from run import APP_INTERACTIONS
+
+    ap = argparse.ArgumentParser(description="Rank the elements that weigh most on the websocket.")
+    ap.add_argument("-k", dest="pattern", default="", help="only interactions whose name contains this text")
+    ap.add_argument("--top", type=int, default=TOP)
+    ap.add_argument("--json", type=Path, help="write the report here")
+    ap.add_argument("--baseline", type=Path, help="compare with an earlier --json report")
+    args = ap.parse_args(argv)
+
+    interactions = [name for name in APP_INTERACTIONS if args.pattern in name]
+    rep = summarize(collect(interactions))
+    print_report(rep, args.top)
+    if args.baseline:
+        print_delta(rep, json.loads(args.baseline.read_text(encoding="utf-8")))
+    if args.json:
+        args.json.write_text(json.dumps(rep, indent=2, ensure_ascii=False), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+# bench/run.py
+# Benchmarks de desempenho do app: figuras, helpers, textos, imagens e
+# reruns completos do script (Streamlit AppTest, sem navegador).
+#
+#   python bench/run.py                     # compara com bench/baseline.json
+#   python bench/run.py --update            # grava uma nova baseline
+#   python bench/run.py -k plan --no-app    # só casos com "plan", sem AppTest
+#
+# Cada caso mede o tempo (ms; mediana e melhor amostra) e o pico de memória
+# alocada (KiB, tracemalloc, numa execução separada). A comparação usa a
+# melhor amostra, menos sensível a ruído da máquina. Sai com código 1 quando
+# algum caso fica mais lento / aloca mais que a baseline além da tolerância.
+import argparse
+import base64
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent         # .../bench
+ROOT_DIR = BENCH_DIR.parent                         # .../thesis_sim
+APP_DIR = ROOT_DIR / "app"
+ASSETS_DIR = ROOT_DIR / "assets" / "img"
+BASELINE = BENCH_DIR / "baseline.json"
+sys.path.insert(0, str(APP_DIR))
+
+# Tolerâncias (regressão = pior que baseline x fator E acima do mínimo absoluto)
+TIME_TOLERANCE = 1.30       # +30% no tempo (melhor amostra)
+ALLOC_TOLERANCE = 1.20      # +20% no pico de alocação
+MIN_DELTA_MS = 2.0          # diferenças menores que isso são ruído
+MIN_DELTA_KIB = 64
+
+TARGET_S = 0.5              # tempo alvo de medição por caso (micro-benchmarks)
+APP_REPEATS = 5             # reruns medidos por interação (AppTest)
+APP_TIMEOUT_S = 120
+
+
+# =========================
+# Entradas
+# =========================
+
+def summary_text() -> str:
+    """Summary source text (assets/text/summary.md)."""
+    return (ROOT_DIR / "assets" / "text" / "summary.md").read_text(encoding="utf-8")
+
+
+def micro_cases() -> dict:
+    """name -> zero-argument callable."""
+    import content
+    import figures
+    from dataset import COMFORT_TA
+
+    hot = {z: COMFORT_TA[z][21]["To_gt_26"] for z in "ABC"}
+    cold = {z: COMFORT_TA[z][21]["To_lt_23"] for z in "ABC"}
+    labels = {"A": "Ta 21°C", "B": "Ta 22°C", "C": "Ta 23°C"}
+    values = [i * 0.1 for i in range(1001)]
+    text = summary_text()
+
+    cases = {
+        "make_plan_figure": lambda: figures.make_plan_figure(hot, cold),
+        "make_plan_figure/labels": lambda: figures.make_plan_figure(hot, cold, labels),
+        "make_energy_chart/Ta": lambda: figures.make_energy_chart("Ta", 21, 23),
+        "make_energy_chart/To": lambda: figures.make_energy_chart("To", 26, 23),
+        "make_energy_chart_facade/Ta": lambda: figures.make_energy_chart_facade("Ta", 21, "ALT3"),
+        "make_energy_chart_facade/To": lambda: figures.make_energy_chart_facade("To", 21, "ALT3"),
+        "make_plan_placeholder": lambda: figures.make_plan_placeholder("No results"),
+        "hot_color+cold_color/x1001": lambda: [(figures.hot_color(v), figures.cold_color(v)) for v in values],
+        "md_to_html/summary": lambda: content.md_to_html(text),
+        "fragment/summary": lambda: content.fragment("summary"),
+        "plan_figure_to_json": (lambda fig=figures.make_plan_figure(hot, cold): fig.to_json()),
+    }
+    for name in ("plan_3zone.png", "iso_9zone.png", "shoeboxmodel.png"):
+        path = ASSETS_DIR / name
+        if path.exists():
+            cases[f"asset_b64/{name}"] = (lambda p=path: base64.b64encode(p.read_bytes()).decode("utf-8"))
+    return cases
+
+
+# =========================
+# Reruns completos (AppTest)
+# =========================
+
+def _widget(at, kind: str, label: str):
+    return next(w for w in getattr(at, kind) if w.label == label)
+
+
+def _zone_model(at):
+    # com static serving a troca de Zone Model é feita no navegador (sem rerun):
+    # o dropdown só existe no modo sem static serving
+    boxes = [w for w in at.selectbox if w.key == "tz_model_select"]
+    return (boxes[0].set_value("Zone Model 9") if boxes else at).run()
+
+
+APP_INTERACTIONS = {
+    # nome -> interação medida (sobre um app já carregado, exceto first_run)
+    "app/first_run": lambda at: at.run(),
+    "app/rerun": lambda at: at.run(),
+    "app/tab3_ta_slider": lambda at: at.slider(key="ta_sp_tab3").set_value(23).run(),
+    "app/tab3_control_To": lambda at: _widget(at, "radio", "Select control")
+                                      .set_value("Operative-temperature thermostat (To)").run(),
+    "app/tab3_comfort_PMV": lambda at: _widget(at, "radio", "Select parameter").set_value("PMV").run(),
+    "app/tab4_facade_dot": lambda at: at.button(key="dot_ALT1").click().run(),
+    "app/tab2_zone_model": _zone_model,
+}
+
+
+def app_case(name: str):
+    """Returns a callable that runs one measured interaction on a fresh, warmed-up app."""
+    from streamlit.testing.v1 import AppTest
+
+    action = APP_INTERACTIONS[name]
+
+    def fresh():
+        at = AppTest.from_file(str(APP_DIR / "thesis.py"), default_timeout=APP_TIMEOUT_S)
+        if name != "app/first_run":
+            at.run()
+        return at
+
+    return fresh, action
+
+
+# =========================
+# Medição
+# =========================
+
+def _measure_micro(fn) -> dict:
+    fn()  # aquecimento
+    n, elapsed = 1, 0.0
+    while True:  # calibra o nº de chamadas por amostra
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= TARGET_S / 10 or n >= 1 << 16:
+            break
+        n *= 2
+    samples = []
+    for _ in range(7):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        samples.append((time.perf_counter() - t0) / n * 1e3)
+
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples), "peak_kib": peak / 1024}
+
+
+def _measure_app(fresh, action) -> dict:
+    samples = []
+    for _ in range(APP_REPEATS):
+        at = fresh()
+        t0 = time.perf_counter()
+        action(at)
+        samples.append((time.perf_counter() - t0) * 1e3)
+        if at.exception:
+            raise RuntimeError(f"app raised: {at.exception[0].value}")
+
+    at = fresh()
+    gc.collect()
+    tracemalloc.start()
+    action(at)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples), "peak_kib": peak / 1024}
+
+
+def compare(name: str, result: dict, base: dict | None) -> list[str]:
+    """Regression messages for one case (empty = ok)."""
+    if base is None:
+        return []
+    problems = []
+    t, tb = result["min_ms"], base["min_ms"]
+    if t > tb * TIME_TOLERANCE and t - tb > MIN_DELTA_MS:
+        problems.append(f"{name}: time {tb:.2f} -> {t:.2f} ms ({t / tb - 1:+.0%})")
+    m, mb = result["peak_kib"], base["peak_kib"]
+    if m > mb * ALLOC_TOLERANCE and m - mb > MIN_DELTA_KIB:
+        problems.append(f"{name}: alloc {mb:.0f} -> {m:.0f} KiB ({m / mb - 1:+.0%})")
+    return problems
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark figures, helpers and full app reruns.")
+    ap.add_argument("-k", dest="pattern", default="", help="only cases whose name contains this text")
+    ap.add_argument("--no-app", action="store_true", help="skip full-script reruns (AppTest)")
+    ap.add_argument("--update", action="store_true", help="write the results as the new baseline")
+    ap.add_argument("--baseline", type=Path, default=BASELINE)
+    ap.add_argument("--json", type=Path, help="also write this run's results here")
+    args = ap.parse_args(argv)
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["cases"] if args.baseline.exists() else {}
+
+    cases = {name: ("micro", fn) for name, fn in micro_cases().items()}
+    if not args.no_app:
+        cases.update({name: ("app", app_case(name)) for name in APP_INTERACTIONS})
+    cases = {k: v for k, v in cases.items() if args.pattern in k}
+
+    results, problems = {}, []
+    print(f"{'case':<36}{'median ms':>12}{'min ms':>10}{'peak KiB':>11}{'vs base':>10}")
+    for name, (kind, case) in cases.items():
+        res = _measure_micro(case) if kind == "micro" else _measure_app(*case)
+        results[name] = {k: round(v, 4) for k, v in res.items()}
+        base = baseline.get(name)
+        rel = f"{res['min_ms'] / base['min_ms'] - 1:+.0%}" if base else "new"
+        print(f"{name:<36}{res['median_ms']:>12.3f}{res['min_ms']:>10.3f}{res['peak_kib']:>11.0f}{rel:>10}")
+        problems += compare(name, res, base)
+
+    doc = {"python": platform.python_version(), "machine": platform.machine(),
+           "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "cases": results}
+    if args.json:
+        args.json.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    if args.update:
+        merged = dict(baseline, **results)
+        args.baseline.write_text(json.dumps(dict(doc, cases=merged), indent=2) + "\n", encoding="utf-8")
+        print(f"baseline written: {args.baseline}")
+        return 0
+
+    if problems:
+        print("\nREGRESSIONS:")
+        for p in problems:
+            print("  " + p)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())